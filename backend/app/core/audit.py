@@ -1,7 +1,252 @@
+"""
+Fire-and-forget audit trail for gateway actions.
+
+`send_audit_event` only stamps and enqueues the event; `AuditSink` ships
+batches to the audit service's `/audit/bulk` in the background, so patient,
+task and simulation writes never wait on the audit hop. Batches the service
+cannot take are appended to a local NDJSON spool and replayed once it
+accepts writes again; batches it refuses outright go to a dead-letter file.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Literal
+from uuid import uuid4
+
 import httpx
 from loguru import logger
 
 from .config import get_settings
+from .downstream import get_client
+
+# Outcome of one /audit/bulk request: accepted, worth retrying, or refused.
+Delivery = Literal["sent", "retry", "rejected"]
+# 4xx statuses that say "later", not "never".
+RETRYABLE_STATUSES = {408, 429}
+
+
+class AuditSink:
+    """
+    Bounded queue of audit events drained by one background flusher.
+
+    The flusher sends up to `batch_size` events per request, waiting at most
+    `flush_ms` to fill a batch. Events carry their own id, so replaying the
+    spool after a partial failure cannot store an event twice. When the queue
+    is full new events are dropped and counted rather than blocking callers.
+    The batch being filled or sent lives on the sink, so `stop()` can still
+    ship it when the flusher is cancelled mid-batch.
+    """
+
+    def __init__(
+        self,
+        queue_size: int,
+        batch_size: int,
+        flush_ms: int,
+        spool_path: Path,
+        dead_letter_path: Path | None = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.spool_path = spool_path
+        self.dead_letter_path = dead_letter_path or spool_path.with_name(
+            f"{spool_path.stem}-dead-letter.ndjson"
+        )
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=queue_size)
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.dead_lettered = 0
+        self.errors = 0
+        self._batch: list[dict] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher, then ship (or spool) whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        batch, self._batch = self._batch, []
+        await self.flush(batch)
+        while not self.queue.empty():
+            await self.flush(self._take_nowait())
+
+    def emit(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Audit queue full; dropped {event['action']} event")
+
+    async def flush(self, batch: list[dict]) -> bool:
+        """
+        Send one batch, spooling it on failure or dead-lettering it if refused.
+        Returns True if the audit service answered.
+        """
+        if not batch:
+            return True
+        delivery = await self._send(batch)
+        if delivery == "sent":
+            self.sent += len(batch)
+            return True
+        if delivery == "rejected":
+            await self._dead_letter(batch)
+            return True
+        try:
+            await asyncio.to_thread(self._append, self.spool_path, batch)
+            self.spooled += len(batch)
+        except OSError as exc:
+            self.dropped += len(batch)
+            logger.error(f"Audit spool write failed; dropped {len(batch)}: {exc}")
+        return False
+
+    async def replay_spool(self) -> None:
+        """Resend spooled events in batches; stops at the first failed batch."""
+        if not self.spool_path.exists():
+            return
+        try:
+            events = await asyncio.to_thread(self._read_spool)
+            for start in range(0, len(events), self.batch_size):
+                batch = events[start : start + self.batch_size]
+                delivery = await self._send(batch)
+                if delivery == "retry":
+                    await asyncio.to_thread(self._write_spool, events[start:])
+                    return
+                if delivery == "rejected":
+                    await self._dead_letter(batch)
+                else:
+                    self.replayed += len(batch)
+            await asyncio.to_thread(self.spool_path.unlink, missing_ok=True)
+        except OSError as exc:
+            self.errors += 1
+            logger.error(f"Audit spool replay failed: {exc}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "pending": len(self._batch),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "dead_lettered": self.dead_lettered,
+            "errors": self.errors,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._take()
+                answered = await self.flush(self._batch)
+                self._batch = []
+                if answered:
+                    await self.replay_spool()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep the batch for the next round; never let the flusher die.
+                self.errors += 1
+                logger.exception("Audit flusher failed; retrying")
+                await asyncio.sleep(self.flush_interval)
+
+    async def _take(self) -> None:
+        """Top `self._batch` up to `batch_size`, lingering up to `flush_ms`."""
+        if not self._batch:
+            self._batch.append(await self.queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            if not self.queue.empty():
+                self._batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            self._batch.append(event)
+
+    def _take_nowait(self) -> list[dict]:
+        batch: list[dict] = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _send(self, batch: list[dict]) -> Delivery:
+        try:
+            resp = await get_client("audit").post("/audit/bulk", json=batch)
+        except httpx.HTTPError as exc:
+            logger.debug(f"Audit batch send failed: {exc}")
+            return "retry"
+        if resp.status_code < 400:
+            return "sent"
+        if resp.status_code < 500 and resp.status_code not in RETRYABLE_STATUSES:
+            logger.error(f"Audit batch refused: {resp.status_code} {resp.text[:200]}")
+            return "rejected"
+        logger.warning(f"Audit batch rejected: {resp.status_code}")
+        return "retry"
+
+    async def _dead_letter(self, batch: list[dict]) -> None:
+        try:
+            await asyncio.to_thread(self._append, self.dead_letter_path, batch)
+        except OSError as exc:
+            self.dropped += len(batch)
+            logger.error(f"Audit dead-letter write failed; dropped {len(batch)}: {exc}")
+            return
+        self.dead_lettered += len(batch)
+
+    @staticmethod
+    def _append(path: Path, batch: list[dict]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as fh:
+            fh.writelines(json.dumps(event) + "\n" for event in batch)
+
+    def _read_spool(self) -> list[dict]:
+        events = []
+        with self.spool_path.open(encoding="utf-8") as fh:
+            for number, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a torn last line.
+                    logger.warning(f"Skipping unreadable audit spool line {number}")
+        return events
+
+    def _write_spool(self, events: list[dict]) -> None:
+        tmp = self.spool_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.writelines(json.dumps(event) + "\n" for event in events)
+        tmp.replace(self.spool_path)
+
+
+_sink: AuditSink | None = None
+
+
+def get_audit_sink() -> AuditSink:
+    global _sink
+    if _sink is None:
+        settings = get_settings()
+        _sink = AuditSink(
+            queue_size=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_ms=settings.audit_flush_ms,
+            spool_path=settings.audit_spool_path,
+            dead_letter_path=settings.audit_dead_letter_path,
+        )
+    return _sink
 
 
 async def send_audit_event(
@@ -13,17 +258,13 @@ async def send_audit_event(
     settings = get_settings()
     if not settings.audit_service_url:
         return
-    try:
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                f"{settings.audit_service_url}/audit",
-                json={
-                    "action": action,
-                    "subject": subject,
-                    "actor_role": actor_role,
-                    "detail": detail,
-                },
-                timeout=5,
-            )
-    except Exception as exc:  # best-effort; don't break main flow
-        logger.debug(f"Audit send failed: {exc}")
+    get_audit_sink().emit(
+        {
+            "id": str(uuid4()),
+            "action": action,
+            "subject": subject,
+            "actor_role": actor_role,
+            "detail": detail,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+    )
@@ -1,13 +1,37 @@
+import hashlib
+import time
+from typing import Any, Mapping
+
 from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
 
+from ..core.cache import TTLCache
 from ..core.config import get_settings
 
+_claims_cache: TTLCache[str, dict] | None = None
+
+
+def get_claims_cache() -> TTLCache[str, dict]:
+    global _claims_cache
+    if _claims_cache is None:
+        settings = get_settings()
+        _claims_cache = TTLCache(
+            maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl_seconds
+        )
+    return _claims_cache
+
 
 def _decode_token(token: str) -> dict:
+    # Tokens are keyed by digest so the cache never holds raw credentials.
+    cache = get_claims_cache()
+    key = hashlib.sha256(token.encode()).hexdigest()
+    claims = cache.get(key)
+    if claims is not None:
+        return claims
+
     settings = get_settings()
     try:
-        return jwt.decode(
+        claims = jwt.decode(
             token,
             settings.auth_secret,
             algorithms=["HS256"],
@@ -20,10 +44,15 @@ def _decode_token(token: str) -> dict:
             detail=f"Invalid token: {exc}",
         ) from exc
 
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        cache.set(key, claims, ttl=exp - time.time())
+    return claims
 
-async def get_current_subject(
+
+async def get_current_claims(
     authorization: str | None = Header(default=None),
-) -> str:
+) -> dict:
     if not authorization or not authorization.lower().startswith("bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,21 +64,19 @@ async def get_current_subject(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Empty bearer token",
         )
-    payload = _decode_token(token)
-    return payload.get("sub", "unknown")
+    return _decode_token(token)
+
+
+async def get_current_subject(
+    claims: Mapping[str, Any] = Depends(get_current_claims),
+) -> str:
+    return claims.get("sub", "unknown")
 
 
 async def get_current_role(
-    authorization: str | None = Header(default=None),
+    claims: Mapping[str, Any] = Depends(get_current_claims),
 ) -> str:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid Authorization header",
-        )
-    token = authorization.split(" ", 1)[1].strip()
-    payload = _decode_token(token)
-    return payload.get("role", "unknown")
+    return claims.get("role", "unknown")
 
 
 def require_roles(*roles: str):
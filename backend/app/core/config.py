@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseSettings, Field
 
@@ -42,6 +43,98 @@ class Settings(BaseSettings):
     auth_service_url: str = Field(
         "http://auth:8100", description="Auth service base URL"
     )
+    auth_cache_size: int = Field(
+        1024, description="Max verified tokens kept in the local claims cache"
+    )
+    auth_cache_ttl_seconds: float = Field(
+        300.0, description="Upper bound on how long verified claims are cached"
+    )
+    patient_directory_refresh_seconds: float = Field(
+        10.0, description="How often the gateway syncs changed patients"
+    )
+    patient_directory_sync_seconds: float = Field(
+        1.0, description="Max age of the directory before an alerts list syncs it"
+    )
+    patient_directory_miss_ttl_seconds: float = Field(
+        30.0, description="How long an id unknown to the patients service is cached"
+    )
+    patient_directory_miss_cache_size: int = Field(
+        10000, description="Max unknown patient ids cached"
+    )
+    scoring_mode: Literal["local", "remote", "shadow"] = Field(
+        "remote",
+        description="Score in-process, via the scoring service, or locally with "
+        "a background cross-check against the service",
+    )
+    scoring_shadow_max_inflight: int = Field(
+        8, description="Concurrent shadow cross-checks before new ones are skipped"
+    )
+    scoring_shadow_tolerance: float = Field(
+        1e-6, description="Score difference above which a shadow check disagrees"
+    )
+    scoring_version_check_seconds: float = Field(
+        60.0, description="How often local scoring compares model versions"
+    )
+    alert_rules_path: Path | None = Field(
+        None, description="JSON file with default and per-ward alert thresholds"
+    )
+    pipeline_enabled: bool = Field(
+        True, description="Score and alert ingested vitals in the background"
+    )
+    pipeline_workers: int = Field(4, description="Concurrent pipeline workers")
+    pipeline_batch_size: int = Field(
+        64, description="Max readings scored per pipeline micro-batch"
+    )
+    pipeline_linger_ms: int = Field(
+        20, description="How long a worker waits to fill a micro-batch"
+    )
+    pipeline_max_queue: int = Field(
+        10000, description="Readings queued for scoring before ingest drops them"
+    )
+    alert_stream_buffer: int = Field(
+        1000, description="Recent alerts kept to resume streams by last event id"
+    )
+    alert_stream_queue_size: int = Field(
+        256, description="Events a stream subscriber may fall behind before it is cut"
+    )
+    alert_stream_heartbeat_seconds: float = Field(
+        15.0, description="Idle interval after which SSE streams send a keep-alive"
+    )
+    audit_queue_size: int = Field(
+        10000, description="Audit events buffered before new ones are dropped"
+    )
+    audit_batch_size: int = Field(
+        200, description="Max audit events sent per /audit/bulk request"
+    )
+    audit_flush_ms: int = Field(
+        250, description="How long the audit sink waits to fill a batch"
+    )
+    audit_spool_path: Path = Field(
+        Path("var/audit-spool.ndjson"),
+        description="Local file holding audit batches the audit service could not take",
+    )
+    audit_dead_letter_path: Path = Field(
+        Path("var/audit-dead-letter.ndjson"),
+        description="Audit batches the audit service refused outright (4xx)",
+    )
+    downstream_max_connections: int = Field(
+        100, description="Max open connections per downstream service pool"
+    )
+    downstream_max_keepalive: int = Field(
+        20, description="Max idle keep-alive connections per downstream pool"
+    )
+    downstream_keepalive_expiry: float = Field(
+        30.0, description="Seconds an idle downstream connection is kept open"
+    )
+    downstream_timeout: float = Field(
+        5.0, description="Default read/write/pool timeout for downstream calls"
+    )
+    downstream_connect_timeout: float = Field(
+        2.0, description="Connect timeout for downstream calls"
+    )
+    downstream_http2: bool = Field(
+        True, description="Use HTTP/2 to downstreams when the h2 package is installed"
+    )
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,118 @@
+"""App-lifetime HTTP clients for the downstream microservices."""
+
+import importlib.util
+
+import httpx
+from loguru import logger
+
+from .config import Settings, get_settings
+from .metrics import InstrumentedTransport
+
+# Logical service name -> Settings attribute holding its base URL.
+SERVICE_URL_FIELDS: dict[str, str] = {
+    "auth": "auth_service_url",
+    "patients": "patients_service_url",
+    "vitals": "vitals_service_url",
+    "alerts": "alerts_service_url",
+    "scoring": "scoring_service_url",
+    "tasks": "tasks_service_url",
+    "audit": "audit_service_url",
+    "notifications": "notify_service_url",
+}
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class DownstreamClients:
+    """
+    Registry holding one keep-alive connection pool per downstream service.
+
+    `start()` is called from the gateway's startup hook and `aclose()` from its
+    shutdown hook; `get()` lazily builds a client if the registry has not been
+    started (e.g. when a router is exercised outside the app lifecycle).
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._requests: dict[str, int] = {}
+
+    def start(self, settings: Settings | None = None) -> None:
+        settings = settings or get_settings()
+        for name in SERVICE_URL_FIELDS:
+            if name not in self._clients:
+                self._clients[name] = self._build(name, settings)
+        logger.info(f"Downstream clients ready: {', '.join(sorted(self._clients))}")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build(name, get_settings())
+            self._clients[name] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict[str, dict]:
+        settings = get_settings()
+        return {
+            name: {
+                "base_url": str(client.base_url),
+                "requests": self._requests.get(name, 0),
+                "max_connections": settings.downstream_max_connections,
+                **_pool_usage(client),
+            }
+            for name, client in self._clients.items()
+        }
+
+    def _build(self, name: str, settings: Settings) -> httpx.AsyncClient:
+        base_url = getattr(settings, SERVICE_URL_FIELDS[name])
+
+        async def count_request(request: httpx.Request) -> None:
+            self._requests[name] = self._requests.get(name, 0) + 1
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=settings.downstream_http2 and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.downstream_max_connections,
+                max_keepalive_connections=settings.downstream_max_keepalive,
+                keepalive_expiry=settings.downstream_keepalive_expiry,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            transport=InstrumentedTransport(transport, "gateway", target=name),
+            timeout=httpx.Timeout(
+                settings.downstream_timeout,
+                connect=settings.downstream_connect_timeout,
+            ),
+            event_hooks={"request": [count_request]},
+        )
+
+
+def _pool_usage(client: httpx.AsyncClient) -> dict[str, int]:
+    # httpcore does not expose pool metrics publicly; read them defensively so a
+    # transport change degrades to zeros rather than breaking the endpoint.
+    transport = getattr(client._transport, "transport", client._transport)
+    pool = getattr(transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    return {
+        "connections": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "queued": sum(
+            1 for req in getattr(pool, "_requests", []) or [] if req.is_queued()
+        ),
+    }
+
+
+downstream = DownstreamClients()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    return downstream.get(name)
@@ -0,0 +1,233 @@
+"""
+Prometheus metrics shared by the gateway and every service.
+
+The gateway imports this module as `app.core.metrics`. Each service image
+copies this file to the same path, so it must import only third-party
+packages from backend/requirements.txt. Every series carries a `service`
+label, which keeps the stack apart when several apps share one process
+(e.g. the in-process load test).
+
+Under gunicorn with several workers, set PROMETHEUS_MULTIPROC_DIR so that
+`/metrics` aggregates every worker, not just the one that answered.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+LOOP_LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, by route template.",
+    ["service", "method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["service"],
+    multiprocess_mode="livesum",
+)
+DOWNSTREAM_SECONDS = Histogram(
+    "downstream_request_duration_seconds",
+    "Time until response headers for outgoing HTTP calls, by target service.",
+    ["service", "target", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_SECONDS = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command round trips as reported by the driver.",
+    ["service", "command", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a sleeping task.",
+    ["service"],
+    buckets=LOOP_LAG_BUCKETS,
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing each request under its route template.
+
+    Labels use the matched route's path (`/vitals/{patient_id}`), never the
+    raw URL, so series stay bounded. Streaming responses are timed until
+    their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp, service: str) -> None:
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(self.service)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_SECONDS.labels(
+                self.service, scope["method"], route, str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps an httpx transport and times each call until response headers.
+
+    Failed calls are recorded with the exception name as their status, so
+    timeouts show up next to the successful calls they slow down. With no
+    fixed `target`, the request's host is used.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        service: str,
+        target: str | None = None,
+    ) -> None:
+        self.transport = transport
+        self.service = service
+        self.target = target
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = self.target or request.url.host
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as exc:
+            status = type(exc).__name__
+            raise
+        else:
+            status = str(response.status_code)
+            return response
+        finally:
+            DOWNSTREAM_SECONDS.labels(
+                self.service, target, request.method, status
+            ).observe(time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Driver command listener; pass it in `event_listeners` of the client."""
+
+    def __init__(self, service: str) -> None:
+        self.service = service
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_SECONDS.labels(self.service, event.command_name, "ok").observe(
+            event.duration_micros / 1e6
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_SECONDS.labels(self.service, event.command_name, "error").observe(
+            event.duration_micros / 1e6
+        )
+
+
+class LoopLagMonitor:
+    """
+    Samples event-loop lag by sleeping `interval` seconds and measuring the
+    overshoot. Lag is CPU-bound work or blocking calls on the loop delaying
+    every other request in the process.
+    """
+
+    def __init__(self, service: str, interval: float = 0.5) -> None:
+        self.service = service
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        lag = LOOP_LAG_SECONDS.labels(self.service)
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag.observe(max(loop.time() - start - self.interval, 0.0))
+
+
+def metrics_response() -> Response:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def instrument(app: FastAPI, service: str) -> None:
+    """Add request timing, event-loop lag sampling and `GET /metrics` to `app`."""
+    app.add_middleware(RequestMetricsMiddleware, service=service)
+    app.add_api_route(
+        "/metrics", metrics_response, methods=["GET"], include_in_schema=False
+    )
+    monitor = LoopLagMonitor(service)
+
+    @app.on_event("startup")
+    async def start_loop_lag_monitor():
+        monitor.start()
+
+    @app.on_event("shutdown")
+    async def stop_loop_lag_monitor():
+        await monitor.stop()
@@ -0,0 +1,27 @@
+"""Pass-through helpers for paginated list endpoints on downstream services."""
+
+import httpx
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_params(
+    limit: int | None, cursor: str | None, fields: str | None
+) -> dict[str, int | str]:
+    params = {"limit": limit, "cursor": cursor, "fields": fields}
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def forward_next_cursor(upstream: httpx.Response, response: Response) -> None:
+    next_cursor = upstream.headers.get(NEXT_CURSOR_HEADER)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def projected_response(upstream: httpx.Response, items: list[dict]) -> JSONResponse:
+    """Return projected rows as-is; they cannot satisfy the full response model."""
+    response = JSONResponse(items)
+    forward_next_cursor(upstream, response)
+    return response
@@ -0,0 +1,24 @@
+"""Proxy streamed downstream responses without buffering them in the gateway."""
+
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+
+async def proxy_stream(
+    client: httpx.AsyncClient, path: str, params: dict
+) -> StreamingResponse:
+    upstream = await client.send(
+        client.build_request("GET", path, params=params), stream=True
+    )
+    if upstream.status_code >= 400:
+        detail = (await upstream.aread()).decode(errors="replace")
+        await upstream.aclose()
+        raise HTTPException(status_code=upstream.status_code, detail=detail)
+    return StreamingResponse(
+        upstream.aiter_bytes(),
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type"),
+        background=BackgroundTask(upstream.aclose),
+    )
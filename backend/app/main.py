@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .core.audit import get_audit_sink
 from .core.config import get_settings
+from .core.downstream import downstream
+from .core.metrics import instrument
+from .core.pagination import NEXT_CURSOR_HEADER
 from .routers import (
     alerts,
     audit,
@@ -14,6 +18,10 @@ from .routers import (
     tasks,
     vitals,
 )
+from .services.alert_stream import get_alert_relay
+from .services.patient_directory import get_patient_directory
+from .services.pipeline import get_pipeline
+from .services.scorer import get_scorer
 
 settings = get_settings()
 
@@ -29,7 +37,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+instrument(app, "gateway")
 
 
 @app.on_event("startup")
@@ -37,6 +47,69 @@ async def ensure_model():
     settings.ensure_model_exists()
 
 
+@app.on_event("startup")
+async def start_audit_sink():
+    get_audit_sink().start()
+
+
+# Registered before the downstream clients so its final flush runs before
+# they are closed (shutdown hooks run in registration order).
+@app.on_event("shutdown")
+async def stop_audit_sink():
+    await get_audit_sink().stop()
+
+
+@app.on_event("startup")
+async def open_downstream_clients():
+    downstream.start(settings)
+
+
+@app.on_event("shutdown")
+async def close_downstream_clients():
+    await downstream.aclose()
+
+
+@app.on_event("startup")
+async def start_patient_directory():
+    get_patient_directory().start()
+
+
+@app.on_event("shutdown")
+async def stop_patient_directory():
+    await get_patient_directory().stop()
+
+
+@app.on_event("startup")
+async def start_scorer():
+    get_scorer().start()
+
+
+@app.on_event("shutdown")
+async def stop_scorer():
+    await get_scorer().stop()
+
+
+@app.on_event("startup")
+async def start_pipeline():
+    if settings.pipeline_enabled:
+        get_pipeline().start()
+
+
+@app.on_event("shutdown")
+async def stop_pipeline():
+    await get_pipeline().stop()
+
+
+@app.on_event("startup")
+async def start_alert_relay():
+    get_alert_relay().start()
+
+
+@app.on_event("shutdown")
+async def stop_alert_relay():
+    await get_alert_relay().stop()
+
+
 app.include_router(health.router)
 app.include_router(auth_proxy.router)
 app.include_router(audit.router)
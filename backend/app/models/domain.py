@@ -55,6 +55,7 @@ class RiskScoreResult(BaseModel):
     risk_score: float
     risk_label: str
     model_version: str
+    trend_signals: list[str] = Field(default_factory=list)
     generated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -75,7 +76,7 @@ class AlertAck(BaseModel):
 
 class SimulationResult(BaseModel):
     vitals: VitalsPayload
-    score: RiskScoreResult
+    score: Optional[RiskScoreResult] = None
     alert: Optional[Alert] = None
 
 
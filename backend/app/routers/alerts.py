@@ -1,46 +1,192 @@
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Mapping
 
-from ..core.auth import get_current_subject
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from ..core.auth import get_current_claims, get_current_subject
 from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.pagination import forward_next_cursor, page_params, projected_response
 from ..models.domain import Alert, AlertAck
+from ..services.alert_stream import AlertFilter, Subscription, get_alert_hub
+from ..services.patient_directory import PatientDirectory, get_patient_directory
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
+# WebSocket subprotocol browsers use to carry the bearer token.
+BEARER_PROTOCOL = "bearer"
 
 
 @router.get("", response_model=list[Alert])
-async def list_alerts(subject: str = Depends(get_current_subject)) -> list[Alert]:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        alerts_resp = await client.get(f"{settings.alerts_service_url}/alerts")
-        patients_resp = await client.get(f"{settings.patients_service_url}/patients")
-
+async def list_alerts(
+    response: Response,
+    limit: int | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
+    subject: str = Depends(get_current_subject),
+) -> list[Alert] | Response:
+    directory = get_patient_directory()
+    # Syncing the directory overlaps the alerts hop, so patients created since
+    # the last background sync are named without a second, sequential lookup.
+    alerts_resp, _ = await asyncio.gather(
+        get_client("alerts").get("/alerts", params=page_params(limit, cursor, fields)),
+        _sync_directory(directory),
+    )
     if alerts_resp.status_code >= 400:
         raise HTTPException(
             status_code=alerts_resp.status_code, detail=alerts_resp.text
         )
+    if fields:
+        return projected_response(alerts_resp, alerts_resp.json())
 
-    patient_map: dict[str, str] = {}
-    if patients_resp.status_code < 400:
-        patient_map = {p["id"]: p["name"] for p in patients_resp.json()}
-
-    alerts = []
-    for item in alerts_resp.json():
-        patient_name = patient_map.get(item.get("patient_id"))
-        alerts.append(Alert(**{**item, "patient_name": patient_name}))
+    items = alerts_resp.json()
+    patient_map = await directory.resolve_names(item["patient_id"] for item in items)
+    alerts = [
+        Alert(**{**item, "patient_name": patient_map.get(item["patient_id"])})
+        for item in items
+    ]
 
+    forward_next_cursor(alerts_resp, response)
     return alerts
 
 
+async def _sync_directory(directory: PatientDirectory) -> None:
+    try:
+        await directory.sync(max_age=get_settings().patient_directory_sync_seconds)
+    except Exception as exc:
+        # Names are best effort; unknown ids fall back to a batched lookup.
+        logger.debug(f"Patient directory sync failed: {exc}")
+
+
+def _alert_filter(
+    patient_id: str | None, severity: str | None, claims: Mapping[str, Any]
+) -> AlertFilter:
+    patients = set(patient_id.split(",")) if patient_id else None
+    severities = set(severity.split(",")) if severity else None
+    doctor = claims.get("sub") if claims.get("role") == "doctor" else None
+    directory = get_patient_directory()
+
+    def accepts(alert: dict) -> bool:
+        if patients is not None and alert["patient_id"] not in patients:
+            return False
+        if severities is not None and alert["severity"] not in severities:
+            return False
+        # Same scope as GET /patients: a doctor's own and unassigned patients.
+        return doctor is None or directory.assignee(alert["patient_id"]) in (
+            doctor,
+            None,
+        )
+
+    return accepts
+
+
+async def _sse_events(sub: Subscription) -> AsyncIterator[str]:
+    yield "retry: 3000\n\n"
+    async for event in sub.events(get_settings().alert_stream_heartbeat_seconds):
+        if event is None:
+            yield ": keep-alive\n\n"
+        else:
+            yield f"id: {event[0]}\nevent: alert\ndata: {event[2]}\n\n"
+
+
+@router.get("/stream")
+async def stream_alerts(
+    patient_id: str | None = Query(default=None),
+    severity: str | None = Query(default=None),
+    last_event_id: int | None = Query(default=None),
+    last_event_id_header: int | None = Header(default=None, alias="Last-Event-ID"),
+    claims: Mapping[str, Any] = Depends(get_current_claims),
+) -> StreamingResponse:
+    """Server-sent events for new alerts; reconnects resume via Last-Event-ID."""
+    sub = get_alert_hub().subscribe(
+        _alert_filter(patient_id, severity, claims),
+        last_event_id if last_event_id is not None else last_event_id_header,
+    )
+    return StreamingResponse(
+        _sse_events(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_events(websocket: WebSocket, sub: Subscription) -> None:
+    async for event in sub.events(get_settings().alert_stream_heartbeat_seconds):
+        if event is not None:
+            await websocket.send_text(f'{{"id":{event[0]},"alert":{event[2]}}}')
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+async def _websocket_claims(websocket: WebSocket) -> Mapping[str, Any]:
+    """
+    Bearer token from the Authorization header or, since browsers cannot set
+    headers on a WebSocket, from the `bearer, <token>` subprotocol pair.
+    Never from the query string, which ends up in access logs.
+    """
+    authorization = websocket.headers.get("authorization")
+    protocols = websocket.scope.get("subprotocols") or []
+    if not authorization and len(protocols) == 2 and protocols[0] == BEARER_PROTOCOL:
+        authorization = f"Bearer {protocols[1]}"
+    try:
+        return await get_current_claims(authorization)
+    except HTTPException as exc:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail)
+        ) from exc
+
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    patient_id: str | None = Query(default=None),
+    severity: str | None = Query(default=None),
+    last_event_id: int | None = Query(default=None),
+    claims: Mapping[str, Any] = Depends(_websocket_claims),
+) -> None:
+    """WebSocket variant of `/alerts/stream`; each frame is {"id", "alert"}."""
+    offered = websocket.scope.get("subprotocols") or []
+    await websocket.accept(
+        subprotocol=BEARER_PROTOCOL if BEARER_PROTOCOL in offered else None
+    )
+    sub = get_alert_hub().subscribe(
+        _alert_filter(patient_id, severity, claims), last_event_id
+    )
+    sender = asyncio.create_task(_send_events(websocket, sub))
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+    done, pending = await asyncio.wait(
+        {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+    )
+    for task in pending:
+        task.cancel()
+    if sender in done:
+        # The subscriber lagged too far behind; it should reconnect and resume.
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
 @router.post("/ack", status_code=status.HTTP_202_ACCEPTED, response_model=AlertAck)
 async def acknowledge_alert(
     ack: AlertAck, subject: str = Depends(get_current_subject)
 ) -> AlertAck:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.alerts_service_url}/alerts/ack", json=ack.dict()
-        )
+    resp = await get_client("alerts").post("/alerts/ack", json=ack.dict())
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return AlertAck(**resp.json())
@@ -1,21 +1,33 @@
-import httpx
+from datetime import datetime
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..core.auth import get_current_subject
-from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.streaming import proxy_stream
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
 
 @router.get("", response_model=list[dict])
 async def list_events(
-    limit: int = Query(default=100), subject: str = Depends(get_current_subject)
+    limit: int | None = Query(default=None),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    format: Literal["json", "ndjson", "json-stream"] = Query(default="json"),
+    subject: str = Depends(get_current_subject),
 ):
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{settings.audit_service_url}/audit", params={"limit": limit}
-        )
+    params: dict[str, str | int] = {"format": format}
+    if limit is not None:
+        params["limit"] = limit
+    if since is not None:
+        params["since"] = since.isoformat()
+    if until is not None:
+        params["until"] = until.isoformat()
+    if format != "json":
+        return await proxy_stream(get_client("audit"), "/audit", params)
+    resp = await get_client("audit").get("/audit", params=params)
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return resp.json()
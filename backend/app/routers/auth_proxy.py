@@ -1,8 +1,7 @@
-import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from ..core.config import get_settings
+from ..core.downstream import get_client
 
 
 class LoginRequest(BaseModel):
@@ -15,10 +14,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/login")
 async def login(req: LoginRequest):
-    settings = get_settings()
     data = {"username": req.username, "password": req.password}
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(f"{settings.auth_service_url}/token", data=data)
+    resp = await get_client("auth").post("/token", data=data)
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return resp.json()
@@ -1,6 +1,11 @@
 from fastapi import APIRouter
 
+from ..core.audit import get_audit_sink
+from ..core.downstream import downstream
 from ..models.domain import HealthResponse
+from ..services.alert_stream import get_alert_hub
+from ..services.pipeline import get_pipeline
+from ..services.scorer import get_scorer
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -8,3 +13,28 @@ router = APIRouter(prefix="/health", tags=["health"])
 @router.get("", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse()
+
+
+@router.get("/pools")
+async def downstream_pools() -> dict[str, dict]:
+    return downstream.stats()
+
+
+@router.get("/alert-stream")
+async def alert_stream() -> dict[str, int]:
+    return get_alert_hub().stats()
+
+
+@router.get("/pipeline")
+async def pipeline() -> dict[str, int]:
+    return get_pipeline().stats()
+
+
+@router.get("/audit")
+async def audit_sink() -> dict[str, int]:
+    return get_audit_sink().stats()
+
+
+@router.get("/scoring")
+async def scoring() -> dict:
+    return get_scorer().stats()
@@ -1,9 +1,9 @@
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from ..core.audit import send_audit_event
 from ..core.auth import get_current_role, get_current_subject
-from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.pagination import forward_next_cursor, page_params, projected_response
 from ..models.domain import Patient, PatientCreate
 
 router = APIRouter(prefix="/patients", tags=["patients"])
@@ -11,20 +11,30 @@ router = APIRouter(prefix="/patients", tags=["patients"])
 
 @router.get("", response_model=list[Patient])
 async def list_patients(
+    response: Response,
+    limit: int | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
+    is_monitoring: bool | None = Query(default=None, alias="isMonitoring"),
+    risk: str | None = Query(default=None),
+    location: str | None = Query(default=None),
     subject: str = Depends(get_current_subject),
     role: str = Depends(get_current_role),
-) -> list[Patient]:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{settings.patients_service_url}/patients")
+) -> list[Patient] | Response:
+    params = page_params(limit, cursor, fields)
+    filters = {"isMonitoring": is_monitoring, "risk": risk, "location": location}
+    params.update({key: value for key, value in filters.items() if value is not None})
+    if role == "doctor":
+        # Doctors see their own patients plus unassigned ones; the patients
+        # service applies the scope against an (assigned_to, id) index.
+        params.update({"assigned_to": subject, "include_unassigned": "true"})
+    resp = await get_client("patients").get("/patients", params=params)
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
-    patients = [Patient(**p) for p in resp.json()]
-    if role == "doctor":
-        patients = [
-            p for p in patients if (p.assigned_to == subject or p.assigned_to is None)
-        ]
-    return patients
+    if fields:
+        return projected_response(resp, resp.json())
+    forward_next_cursor(resp, response)
+    return [Patient(**p) for p in resp.json()]
 
 
 @router.post("", response_model=Patient, status_code=status.HTTP_201_CREATED)
@@ -33,12 +43,9 @@ async def create_patient(
     subject: str = Depends(get_current_subject),
     role: str = Depends(get_current_role),
 ) -> Patient:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.patients_service_url}/patients",
-            json=payload.dict(by_alias=True),
-        )
+    resp = await get_client("patients").post(
+        "/patients", json=payload.dict(by_alias=True)
+    )
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     created = Patient(**resp.json())
@@ -55,12 +62,9 @@ async def create_patient(
 async def update_patient_monitoring(
     patient_id: str, isMonitoring: bool, subject: str = Depends(get_current_subject)
 ) -> Patient:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.patch(
-            f"{settings.patients_service_url}/patients/{patient_id}/monitor",
-            json={"isMonitoring": isMonitoring},
-        )
+    resp = await get_client("patients").patch(
+        f"/patients/{patient_id}/monitor", json={"isMonitoring": isMonitoring}
+    )
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return Patient(**resp.json())
@@ -1,9 +1,17 @@
+import json
+from datetime import datetime
+from typing import Literal
+
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 from ..core.auth import get_current_subject
-from ..core.config import get_settings
+from ..core.downstream import get_client
 from ..models.domain import RiskScoreResult, VitalsPayload
+from ..services.mock_model import get_model
+from ..services.scorer import get_scorer
 
 router = APIRouter(prefix="/scoring", tags=["scoring"])
 
@@ -12,11 +20,46 @@ router = APIRouter(prefix="/scoring", tags=["scoring"])
 async def score_vitals(
     vitals: VitalsPayload, subject: str = Depends(get_current_subject)
 ) -> RiskScoreResult:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.scoring_service_url}/score", json=vitals.dict()
+    try:
+        return await get_scorer().score(vitals)
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(
+            status_code=exc.response.status_code, detail=exc.response.text
+        ) from exc
+
+
+@router.post("/risk/batch")
+async def score_vitals_batch(
+    rows: list[VitalsPayload],
+    format: Literal["columnar", "ndjson"] = "columnar",
+    subject: str = Depends(get_current_subject),
+) -> Response:
+    scorer = get_scorer()
+    if scorer.mode == "remote":
+        resp = await get_client("scoring").post(
+            "/score/batch", params={"format": format}, json=jsonable_encoder(rows)
+        )
+        if resp.status_code >= 400:
+            raise HTTPException(status_code=resp.status_code, detail=resp.text)
+        return Response(
+            content=resp.content, media_type=resp.headers.get("content-type")
+        )
+
+    # Local scoring renders the scoring service's batch formats itself.
+    results = await scorer.score_batch(rows)
+    if format == "ndjson":
+        body = "".join(json.dumps(jsonable_encoder(r)) + "\n" for r in results)
+        return Response(content=body, media_type="application/x-ndjson")
+    return JSONResponse(
+        jsonable_encoder(
+            {
+                "model_version": get_model().version,
+                "count": len(results),
+                "patient_id": [r.patient_id for r in results],
+                "risk_score": [r.risk_score for r in results],
+                "risk_label": [r.risk_label for r in results],
+                "trend_signals": [r.trend_signals for r in results],
+                "generated_at": datetime.utcnow(),
+            }
         )
-    if resp.status_code >= 400:
-        raise HTTPException(status_code=resp.status_code, detail=resp.text)
-    return RiskScoreResult(**resp.json())
+    )
@@ -1,9 +1,9 @@
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from ..core.audit import send_audit_event
 from ..core.auth import get_current_subject, require_roles
-from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.pagination import forward_next_cursor, page_params, projected_response
 from ..models.domain import Task, TaskCreate, TaskUpdate
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -11,20 +11,25 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.get("", response_model=list[Task])
 async def list_tasks(
+    response: Response,
     patient_id: str | None = Query(default=None),
     status_filter: str | None = Query(default=None),
+    limit: int | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
     subject: str = Depends(get_current_subject),
-) -> list[Task]:
-    settings = get_settings()
-    params = {}
+) -> list[Task] | Response:
+    params = page_params(limit, cursor, fields)
     if patient_id:
         params["patient_id"] = patient_id
     if status_filter:
         params["status_filter"] = status_filter
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{settings.tasks_service_url}/tasks", params=params)
+    resp = await get_client("tasks").get("/tasks", params=params)
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    if fields:
+        return projected_response(resp, resp.json())
+    forward_next_cursor(resp, response)
     return [Task(**t) for t in resp.json()]
 
 
@@ -34,12 +39,9 @@ async def create_task(
     subject: str = Depends(get_current_subject),
     role: str = Depends(require_roles("admin", "doctor", "nurse")),
 ) -> Task:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.tasks_service_url}/tasks",
-            json={**payload.dict(), "created_by": subject},
-        )
+    resp = await get_client("tasks").post(
+        "/tasks", json={**payload.dict(), "created_by": subject}
+    )
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     task = Task(**resp.json())
@@ -59,11 +61,7 @@ async def update_task(
     subject: str = Depends(get_current_subject),
     role: str = Depends(require_roles("admin", "doctor", "nurse")),
 ) -> Task:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.patch(
-            f"{settings.tasks_service_url}/tasks/{task_id}", json=payload.dict()
-        )
+    resp = await get_client("tasks").patch(f"/tasks/{task_id}", json=payload.dict())
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     task = Task(**resp.json())
@@ -1,9 +1,19 @@
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from pydantic import ValidationError
 
 from ..core.auth import get_current_subject
 from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.pagination import forward_next_cursor, page_params, projected_response
+from ..core.streaming import proxy_stream
 from ..models.domain import VitalsPayload
+from ..services.pipeline import BrokerFull, get_pipeline
 
 router = APIRouter(prefix="/vitals", tags=["vitals"])
 
@@ -12,30 +22,109 @@ router = APIRouter(prefix="/vitals", tags=["vitals"])
 async def ingest_vitals(
     vitals: VitalsPayload, subject: str = Depends(get_current_subject)
 ) -> dict:
-    settings = get_settings()
     if not vitals.patient_id:
         raise HTTPException(status_code=422, detail="patient_id is required")
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.vitals_service_url}/vitals", json=vitals.dict()
-        )
+    resp = await get_client("vitals").post("/vitals", json=jsonable_encoder(vitals))
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    if get_settings().pipeline_enabled:
+        # The reading is already stored; scoring and alerting happen off the
+        # request path, so a saturated pipeline must not fail the ingest.
+        try:
+            await get_pipeline().submit(vitals)
+        except BrokerFull:
+            logger.warning(f"Pipeline full; reading for {vitals.patient_id} not scored")
     return resp.json()
 
 
+def _bulk_rows(body: bytes, content_type: str) -> list[Any]:
+    """Rows of a bulk body, indexed as the vitals service indexes them."""
+    if "ndjson" not in content_type:
+        return json.loads(body)
+    rows: list[Any] = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            rows.append(None)
+    return rows
+
+
+async def _submit_accepted(body: bytes, content_type: str, result: dict) -> None:
+    """Queue the rows the vitals service stored for scoring and alerting."""
+    rejected = {err["index"] for err in result.get("errors", [])}
+    pipeline = get_pipeline()
+    unscored = 0
+    for index, row in enumerate(_bulk_rows(body, content_type)):
+        if index in rejected:
+            continue
+        try:
+            await pipeline.submit(VitalsPayload.parse_obj(row))
+        except (BrokerFull, ValidationError):
+            unscored += 1
+    if unscored:
+        logger.warning(f"{unscored} bulk readings not queued for scoring")
+
+
+@router.post("/bulk")
+async def ingest_vitals_bulk(
+    request: Request, subject: str = Depends(get_current_subject)
+) -> dict:
+    # Rows are validated once, in the vitals service, so the body is relayed as-is.
+    body = await request.body()
+    content_type = request.headers.get("content-type", "application/json")
+    resp = await get_client("vitals").post(
+        "/vitals/bulk", content=body, headers={"content-type": content_type}
+    )
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    result = resp.json()
+    if get_settings().pipeline_enabled:
+        await _submit_accepted(body, content_type, result)
+    return result
+
+
 @router.post("/generate", response_model=VitalsPayload)
 async def generate_vitals(
     patient_id: str = Query(...),
     risk: str = Query("normal"),
     subject: str = Depends(get_current_subject),
 ) -> VitalsPayload:
-    settings = get_settings()
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.vitals_service_url}/vitals/generate",
-            params={"patient_id": patient_id, "risk": risk, "device_id": subject},
-        )
+    resp = await get_client("vitals").post(
+        "/vitals/generate",
+        params={"patient_id": patient_id, "risk": risk, "device_id": subject},
+    )
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return VitalsPayload(**resp.json())
+
+
+@router.get("/{patient_id}", response_model=list[VitalsPayload])
+async def list_vitals(
+    patient_id: str,
+    response: Response,
+    limit: int | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    format: Literal["json", "ndjson", "json-stream"] = Query(default="json"),
+    subject: str = Depends(get_current_subject),
+) -> list[VitalsPayload] | Response:
+    params: dict = page_params(limit, cursor, fields)
+    if since:
+        params["since"] = since
+    if until:
+        params["until"] = until
+    if format != "json":
+        params["format"] = format
+        return await proxy_stream(get_client("vitals"), f"/vitals/{patient_id}", params)
+    resp = await get_client("vitals").get(f"/vitals/{patient_id}", params=params)
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    if fields:
+        return projected_response(resp, resp.json())
+    forward_next_cursor(resp, response)
+    return [VitalsPayload(**v) for v in resp.json()]
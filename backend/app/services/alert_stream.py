@@ -0,0 +1,200 @@
+"""Live alert fan-out from the alerts service to gateway subscribers."""
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+from loguru import logger
+
+from ..core.config import get_settings
+from ..core.downstream import get_client
+from .patient_directory import get_patient_directory
+
+AlertFilter = Callable[[dict], bool]
+
+
+class Subscription:
+    """A subscriber's queue of `(event_id, alert, data)` events."""
+
+    def __init__(self, hub: "AlertHub", accepts: AlertFilter, maxsize: int) -> None:
+        self.hub = hub
+        self.accepts = accepts
+        self.queue: asyncio.Queue[tuple[int, dict, str]] = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    async def events(
+        self, heartbeat: float
+    ) -> AsyncIterator[tuple[int, dict, str] | None]:
+        """
+        Yield events as they arrive, or None after `heartbeat` idle seconds.
+
+        Ends once a lagging subscriber has drained what it was sent; the
+        client reconnects with its last event id to pick up the rest.
+        """
+        try:
+            while not (self.lagged and self.queue.empty()):
+                try:
+                    yield await asyncio.wait_for(self.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.hub.unsubscribe(self)
+
+
+class AlertHub:
+    """
+    In-process pub/sub for alerts with per-subscriber filters.
+
+    Each event is serialised once and shared by every subscriber, so publish
+    cost is one filter call and one queue put per subscriber. The last
+    `buffer_size` events are kept to replay for clients resuming with a
+    last event id.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self.published = 0
+        self.lagged = 0
+        self._buffer: deque[tuple[int, dict, str]] = deque(maxlen=buffer_size)
+        self._subscriptions: set[Subscription] = set()
+
+    def publish(self, event_id: int, alert: dict) -> None:
+        event = (event_id, alert, json.dumps(alert))
+        self._buffer.append(event)
+        self.published += 1
+        for sub in list(self._subscriptions):
+            if sub.accepts(alert):
+                self._offer(sub, event)
+
+    def subscribe(
+        self, accepts: AlertFilter, last_event_id: int | None = None
+    ) -> Subscription:
+        sub = Subscription(self, accepts, self.queue_size)
+        if last_event_id is not None:
+            for event in self._buffer:
+                if event[0] > last_event_id and accepts(event[1]):
+                    self._offer(sub, event)
+        if not sub.lagged:
+            self._subscriptions.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscriptions.discard(sub)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+            "lagged": self.lagged,
+            "buffered": len(self._buffer),
+            "last_event_id": self._buffer[-1][0] if self._buffer else 0,
+        }
+
+    def _offer(self, sub: Subscription, event: tuple[int, dict, str]) -> None:
+        try:
+            sub.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            sub.lagged = True
+            self._subscriptions.discard(sub)
+            self.lagged += 1
+
+
+class AlertRelay:
+    """
+    Follows the alerts service's `/alerts/stream` and publishes into a hub.
+
+    One upstream connection per gateway worker feeds every local subscriber.
+    Alerts are enriched with the patient name (as `GET /alerts` does) before
+    publishing, which also makes sure the patient directory knows the
+    patient's assignee when subscriber filters run.
+    """
+
+    def __init__(self, hub: AlertHub, retry_seconds: float = 2.0) -> None:
+        self.hub = hub
+        self.retry_seconds = retry_seconds
+        self.last_event_id: int | None = None
+        self.errors = 0
+        self.skipped = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._follow()
+            except httpx.HTTPError as exc:
+                logger.warning(f"Alert stream relay disconnected: {exc}")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A malformed frame must not end the relay for every subscriber.
+                self.errors += 1
+                logger.exception("Alert stream relay failed; reconnecting")
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _follow(self) -> None:
+        headers = {}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = str(self.last_event_id)
+        async with get_client("alerts").stream(
+            "GET", "/alerts/stream", headers=headers, timeout=httpx.Timeout(None)
+        ) as resp:
+            resp.raise_for_status()
+            event_id, data = None, None
+            async for line in resp.aiter_lines():
+                if line.startswith("id:"):
+                    event_id = line[3:].strip()
+                elif line.startswith("data:"):
+                    data = line[5:].strip()
+                elif not line and event_id is not None and data is not None:
+                    await self._handle_frame(event_id, data)
+                    event_id, data = None, None
+
+    async def _handle_frame(self, event_id: str, data: str) -> None:
+        try:
+            parsed_id = int(event_id)
+            alert = json.loads(data)
+            if not isinstance(alert, dict) or "patient_id" not in alert:
+                raise ValueError("no patient_id")
+        except ValueError as exc:
+            self.skipped += 1
+            logger.warning(f"Skipping malformed alert stream frame {event_id!r}: {exc}")
+            return
+        await self._publish(parsed_id, alert)
+
+    async def _publish(self, event_id: int, alert: dict) -> None:
+        names = await get_patient_directory().resolve_names([alert["patient_id"]])
+        alert["patient_name"] = names.get(alert["patient_id"])
+        self.last_event_id = event_id
+        self.hub.publish(event_id, alert)
+
+
+_hub: AlertHub | None = None
+_relay: AlertRelay | None = None
+
+
+def get_alert_hub() -> AlertHub:
+    global _hub
+    if _hub is None:
+        settings = get_settings()
+        _hub = AlertHub(
+            buffer_size=settings.alert_stream_buffer,
+            queue_size=settings.alert_stream_queue_size,
+        )
+    return _hub
+
+
+def get_alert_relay() -> AlertRelay:
+    global _relay
+    if _relay is None:
+        _relay = AlertRelay(get_alert_hub())
+    return _relay
@@ -1,9 +1,16 @@
+"""Service layer utilities (e.g., mock model loading)."""
+
 import json
-import math
+from functools import lru_cache
+from math import exp
+from operator import mul
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Mapping, Sequence, Tuple
+
+import numpy as np
 
 from ..core.config import get_settings
+from ..models.domain import VitalsPayload
 
 
 class MockRiskModel:
@@ -17,6 +24,12 @@ class MockRiskModel:
       "weights": {"heart_rate": 0.03, ...},
       "threshold": 0.5
     }
+
+    On load the weights are compiled into an ordered feature index
+    (`feature_names` / `feature_index`) and a contiguous float64
+    `weight_vector`, so scoring never walks the weights dict:
+    `score_row` takes values already in `feature_names` order and
+    `score_matrix` scores an (n_rows, n_features) array in one pass.
     """
 
     def __init__(self, artifact_path: Path):
@@ -25,6 +38,11 @@ class MockRiskModel:
         self.intercept = 0.0
         self.weights: Dict[str, float] = {}
         self.threshold = 0.5
+        self.feature_names: Tuple[str, ...] = ()
+        self.feature_index: Dict[str, int] = {}
+        self.weight_vector = np.zeros(0, dtype=np.float64)
+        self._weight_items: Tuple[Tuple[str, float], ...] = ()
+        self._row_weights: Tuple[float, ...] = ()
         self._load()
 
     def _load(self) -> None:
@@ -33,16 +51,53 @@ class MockRiskModel:
         self.intercept = float(payload.get("intercept", 0.0))
         self.weights = {k: float(v) for k, v in payload.get("weights", {}).items()}
         self.threshold = float(payload.get("threshold", 0.5))
+        self.feature_names = tuple(self.weights)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self.weight_vector = np.ascontiguousarray(
+            tuple(self.weights.values()), dtype=np.float64
+        )
+        self._weight_items = tuple(self.weights.items())
+        self._row_weights = tuple(self.weights.values())
 
-    def score(self, features: Dict[str, float]) -> Tuple[float, str]:
+    def score(self, features: Mapping[str, float]) -> Tuple[float, str]:
         z = self.intercept
-        for name, weight in self.weights.items():
-            z += weight * float(features.get(name, 0.0))
-        prob = 1 / (1 + math.exp(-z))
+        get = features.get
+        for name, weight in self._weight_items:
+            z += weight * float(get(name, 0.0))
+        prob = 1 / (1 + exp(-z))
+        label = "high" if prob >= self.threshold else "normal"
+        return prob, label
+
+    def score_row(self, values: Sequence[float]) -> Tuple[float, str]:
+        z = self.intercept + sum(map(mul, self._row_weights, values))
+        prob = 1 / (1 + exp(-z))
         label = "high" if prob >= self.threshold else "normal"
         return prob, label
 
+    def feature_matrix(self, rows: Sequence[VitalsPayload]) -> np.ndarray:
+        """
+        Pack payloads into an (n_rows, n_features) matrix in `feature_names`
+        order. Features that are not payload fields (the scoring service's
+        trend features) are 0.0, as the gateway keeps no trend windows.
+        """
+        matrix = np.zeros((len(rows), len(self.feature_names)), dtype=np.float64)
+        for j, name in enumerate(self.feature_names):
+            if name in VitalsPayload.__fields__:
+                matrix[:, j] = np.fromiter(
+                    (getattr(row, name) for row in rows),
+                    dtype=np.float64,
+                    count=len(rows),
+                )
+        return matrix
+
+    def score_matrix(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        z = matrix @ self.weight_vector + self.intercept
+        probs = 1.0 / (1.0 + np.exp(-z))
+        labels = np.where(probs >= self.threshold, "high", "normal")
+        return probs, labels
+
 
+@lru_cache
 def get_model() -> MockRiskModel:
     settings = get_settings()
     return MockRiskModel(settings.model_path)
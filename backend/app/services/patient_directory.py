@@ -0,0 +1,203 @@
+"""Gateway-side directory of patients owned by the patients service."""
+
+import asyncio
+import time
+from collections.abc import Iterable
+
+import httpx
+from loguru import logger
+
+from ..core.cache import TTLCache
+from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..core.pagination import NEXT_CURSOR_HEADER
+
+# Token from the patients service; sent back as `updated_since`.
+UPDATED_SINCE_HEADER = "X-Updated-Since"
+
+
+class PatientDirectory:
+    """
+    In-process copy of the patient roster, indexed by id and assignee.
+
+    The gateway has no database connection of its own. The roster is loaded
+    in full once, then kept current by `sync()`, which asks the patients
+    service only for patients changed since the previous sync (an indexed
+    `updated_since` query). Sync runs every `refresh_seconds` in the
+    background; callers about to need names can also run it concurrently
+    with their own downstream call. Ids still missing are fetched with one
+    batched `?ids=` lookup, and ids the service does not know are remembered
+    for `miss_ttl` seconds so they are not looked up on every request.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float,
+        miss_ttl: float = 30.0,
+        miss_cache_size: int = 10000,
+        page_size: int = 1000,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.page_size = page_size
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.syncs = 0
+        self.changes = 0
+        self._by_id: dict[str, dict] = {}
+        self._by_assignee: dict[str | None, set[str]] = {}
+        self._unknown: TTLCache[str, bool] = TTLCache(
+            maxsize=miss_cache_size, ttl=miss_ttl
+        )
+        self._since: str | None = None
+        self._synced_at = float("-inf")
+        self._sync: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def load(self) -> None:
+        """Replace the roster with a full, paged read of the patients service."""
+        rows, since = await self._read({})
+        by_assignee: dict[str | None, set[str]] = {}
+        for row in rows:
+            by_assignee.setdefault(row.get("assigned_to"), set()).add(row["id"])
+        self._by_id = {row["id"]: row for row in rows}
+        self._by_assignee = by_assignee
+        self._unknown.clear()
+        self._since = since
+        self._synced_at = time.monotonic()
+        self.reloads += 1
+
+    async def sync(self, max_age: float = 0.0) -> None:
+        """
+        Apply patients changed since the last sync, or load in full if the
+        roster was never loaded. Skipped if the last sync finished less than
+        `max_age` seconds ago; concurrent callers share one request.
+        """
+        if time.monotonic() - self._synced_at < max_age:
+            return
+        if self._sync is None:
+            self._sync = asyncio.create_task(self._sync_once())
+            self._sync.add_done_callback(self._sync_done)
+        await asyncio.shield(self._sync)
+
+    async def resolve_names(self, ids: Iterable[str]) -> dict[str, str | None]:
+        wanted = set(ids)
+        missing = [
+            i for i in wanted if i not in self._by_id and not self._unknown.get(i)
+        ]
+        self.hits += len(wanted) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            await self._fetch(missing)
+        return {i: self._by_id[i]["name"] if i in self._by_id else None for i in wanted}
+
+    def get(self, patient_id: str) -> dict | None:
+        return self._by_id.get(patient_id)
+
+    def assignee(self, patient_id: str) -> str | None:
+        row = self._by_id.get(patient_id)
+        return row.get("assigned_to") if row else None
+
+    def assigned_to(self, assignee: str | None) -> list[dict]:
+        return [self._by_id[i] for i in sorted(self._by_assignee.get(assignee, ()))]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "syncs": self.syncs,
+            "changes": self.changes,
+        }
+
+    async def _sync_once(self) -> None:
+        if self._since is None:
+            await self.load()
+            return
+        rows, since = await self._read({"updated_since": self._since})
+        for row in rows:
+            self._put(row)
+        self._since = since
+        self._synced_at = time.monotonic()
+        self.syncs += 1
+        self.changes += len(rows)
+
+    def _sync_done(self, task: asyncio.Task) -> None:
+        self._sync = None
+        if not task.cancelled() and task.exception() is not None:
+            # Callers see the error through shield(); this only marks it retrieved.
+            logger.debug(f"Patient directory sync failed: {task.exception()}")
+
+    async def _read(
+        self, params: dict[str, str | int]
+    ) -> tuple[list[dict], str | None]:
+        """All pages of `/patients` for `params`, plus the next `updated_since`."""
+        rows: list[dict] = []
+        params = {**params, "limit": self.page_size}
+        since: str | None = None
+        while True:
+            resp = await get_client("patients").get("/patients", params=params)
+            resp.raise_for_status()
+            rows.extend(resp.json())
+            # The first page's token is the earliest, so nothing falls between.
+            since = since or resp.headers.get(UPDATED_SINCE_HEADER)
+            cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                return rows, since
+            params["cursor"] = cursor
+
+    def _put(self, row: dict) -> None:
+        old = self._by_id.get(row["id"])
+        if old is not None:
+            self._by_assignee.get(old.get("assigned_to"), set()).discard(row["id"])
+        self._by_id[row["id"]] = row
+        self._by_assignee.setdefault(row.get("assigned_to"), set()).add(row["id"])
+        self._unknown.pop(row["id"])
+
+    async def _fetch(self, ids: list[str]) -> None:
+        resp = await get_client("patients").get(
+            "/patients", params={"ids": ",".join(sorted(ids))}
+        )
+        if resp.status_code >= 400:
+            logger.debug(f"Patient lookup failed: {resp.status_code}")
+            return
+        for row in resp.json():
+            self._put(row)
+        for patient_id in ids:
+            if patient_id not in self._by_id:
+                self._unknown.set(patient_id, True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except httpx.HTTPError as exc:
+                logger.warning(f"Patient directory refresh failed: {exc}")
+            except Exception:
+                # A malformed response must not end the refresher.
+                logger.exception("Patient directory refresh failed")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+_directory: PatientDirectory | None = None
+
+
+def get_patient_directory() -> PatientDirectory:
+    global _directory
+    if _directory is None:
+        settings = get_settings()
+        _directory = PatientDirectory(
+            refresh_seconds=settings.patient_directory_refresh_seconds,
+            miss_ttl=settings.patient_directory_miss_ttl_seconds,
+            miss_cache_size=settings.patient_directory_miss_cache_size,
+        )
+    return _directory
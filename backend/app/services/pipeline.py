@@ -0,0 +1,219 @@
+"""Asynchronous vitals -> scoring -> alerting stage, decoupled from ingest."""
+
+import asyncio
+from typing import Protocol
+
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..models.domain import Alert, RiskScoreResult, SimulationResult, VitalsPayload
+from .patient_directory import get_patient_directory
+from .rules import RuleResult, get_rule_engine, ward_of
+from .scorer import get_scorer
+
+VITALS_TOPIC = "vitals.ingested"
+
+
+class BrokerFull(RuntimeError):
+    """Raised by `Broker.publish` when a topic cannot take more messages."""
+
+
+class Broker(Protocol):
+    """
+    Topic queue the pipeline runs on.
+
+    Messages are JSON-compatible dicts so that an external broker (Redis
+    Streams, NATS JetStream, ...) can stand in for `InMemoryBroker`.
+    """
+
+    async def publish(self, topic: str, message: dict) -> None: ...
+
+    async def fetch(
+        self, topic: str, max_messages: int, timeout: float, linger: float
+    ) -> list[dict]:
+        """Wait up to `timeout` for a message, then up to `linger` for more."""
+        ...
+
+
+class InMemoryBroker:
+    """Bounded per-topic asyncio queues; messages live only in this process."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._topics: dict[str, asyncio.Queue[dict]] = {}
+
+    def _queue(self, topic: str) -> asyncio.Queue[dict]:
+        queue = self._topics.get(topic)
+        if queue is None:
+            queue = self._topics[topic] = asyncio.Queue(maxsize=self.maxsize)
+        return queue
+
+    async def publish(self, topic: str, message: dict) -> None:
+        try:
+            self._queue(topic).put_nowait(message)
+        except asyncio.QueueFull as exc:
+            raise BrokerFull(topic) from exc
+
+    async def fetch(
+        self, topic: str, max_messages: int, timeout: float, linger: float
+    ) -> list[dict]:
+        queue = self._queue(topic)
+        try:
+            batch = [await asyncio.wait_for(queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + linger
+        while len(batch) < max_messages:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def depth(self, topic: str) -> int:
+        return self._queue(topic).qsize()
+
+
+class VitalsPipeline:
+    """
+    Scores ingested readings in micro-batches and raises alerts for them.
+
+    `submit()` only enqueues, so ingest latency is independent of the
+    scoring and alerting hops. A pool of workers pulls up to `batch_size`
+    readings at a time, scores them in one call to the scorer, applies
+    the alert rules and creates the resulting alerts concurrently.
+    """
+
+    def __init__(
+        self, broker: Broker, workers: int, batch_size: int, linger_ms: int
+    ) -> None:
+        self.broker = broker
+        self.workers = workers
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.submitted = 0
+        self.processed = 0
+        self.batches = 0
+        self.alerts = 0
+        self.failed = 0
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, vitals: VitalsPayload) -> None:
+        await self.broker.publish(VITALS_TOPIC, jsonable_encoder(vitals))
+        self.submitted += 1
+
+    async def process(self, batch: list[VitalsPayload]) -> list[SimulationResult]:
+        """Run the stage inline; workers call this for each micro-batch."""
+        scores = await get_scorer().score_batch(batch, update_trends=True)
+        results = [
+            SimulationResult(vitals=vitals, score=score)
+            for vitals, score in zip(batch, scores, strict=True)
+        ]
+        directory = get_patient_directory()
+        wards = [
+            ward_of((directory.get(v.patient_id) or {}).get("location")) for v in batch
+        ]
+        verdicts = get_rule_engine().evaluate(batch, wards)
+        pending = []
+        # `scores` rather than `result.score`: the latter is Optional.
+        for i, (result, score) in enumerate(zip(results, scores, strict=True)):
+            model_high = score.risk_label == "high"
+            severity = "high" if model_high else verdicts.severity_of(i)
+            if severity:
+                pending.append((result, severity, _alert_message(score, verdicts, i)))
+        created = await asyncio.gather(
+            *(
+                self._create_alert(result.vitals.patient_id, severity, message)
+                for result, severity, message in pending
+            )
+        )
+        for (result, _, _), alert in zip(pending, created, strict=True):
+            result.alert = alert
+        self.processed += len(batch)
+        self.batches += 1
+        self.alerts += sum(1 for alert in created if alert is not None)
+        return results
+
+    def stats(self) -> dict[str, int]:
+        stats = {
+            "workers": len(self._tasks),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "batches": self.batches,
+            "alerts": self.alerts,
+            "failed": self.failed,
+        }
+        if isinstance(self.broker, InMemoryBroker):
+            stats["queued"] = self.broker.depth(VITALS_TOPIC)
+        return stats
+
+    async def _work(self) -> None:
+        while True:
+            messages = await self.broker.fetch(
+                VITALS_TOPIC, self.batch_size, timeout=1.0, linger=self.linger
+            )
+            if not messages:
+                continue
+            try:
+                await self.process([VitalsPayload(**m) for m in messages])
+            except Exception as exc:  # keep the worker alive; the batch is dropped
+                self.failed += len(messages)
+                logger.warning(f"Pipeline batch of {len(messages)} failed: {exc}")
+
+    async def _create_alert(
+        self, patient_id: str, severity: str, message: str
+    ) -> Alert | None:
+        resp = await get_client("alerts").post(
+            "/alerts",
+            json={"patient_id": patient_id, "severity": severity, "message": message},
+        )
+        if resp.status_code >= 400:
+            logger.warning(f"Alert for {patient_id} rejected: {resp.status_code}")
+            return None
+        return Alert(**resp.json())
+
+
+def _alert_message(score: RiskScoreResult, verdicts: RuleResult, row: int) -> str:
+    reasons: list[str] = []
+    if score.risk_label == "high":
+        reasons.append("Model risk flagged high")
+    issues = verdicts.describe(row)
+    if issues:
+        reasons.append("Abnormal vitals: " + ", ".join(issues))
+    # Trends explain an alert but never raise one on their own.
+    reasons.extend(score.trend_signals)
+    return " | ".join(reasons)
+
+
+_pipeline: VitalsPipeline | None = None
+
+
+def get_pipeline() -> VitalsPipeline:
+    global _pipeline
+    if _pipeline is None:
+        settings = get_settings()
+        _pipeline = VitalsPipeline(
+            InMemoryBroker(maxsize=settings.pipeline_max_queue),
+            workers=settings.pipeline_workers,
+            batch_size=settings.pipeline_batch_size,
+            linger_ms=settings.pipeline_linger_ms,
+        )
+    return _pipeline
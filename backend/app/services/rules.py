@@ -0,0 +1,237 @@
+"""
+Alerting rules applied to vitals readings.
+
+Thresholds live in a declarative table (`VitalRule` per vital, optionally
+overridden per ward) that `RuleEngine` compiles into NumPy arrays, so a
+whole batch is checked with a handful of vectorised comparisons. Results
+are per-row severity codes and issue bitmasks; the human-readable issue
+text is only rendered for rows that actually raise an alert. A single
+reading is checked against the same compiled bounds in plain Python, which
+beats array set-up for one row.
+"""
+
+import json
+import math
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..core.config import get_settings
+from ..models.domain import VitalsPayload
+
+SEVERITIES: tuple[str | None, ...] = (None, "moderate", "high")
+
+
+class VitalRule(BaseModel):
+    """Normal range of one vital; outside it is an issue, beyond critical is high."""
+
+    field: str
+    label: str
+    unit: str = ""
+    low: float = -math.inf
+    high: float = math.inf
+    critical_low: float = -math.inf
+    critical_high: float = math.inf
+
+
+DEFAULT_RULES: list[VitalRule] = [
+    VitalRule(field="heart_rate", label="HR", low=50, high=110),
+    VitalRule(field="respiratory_rate", label="RR", low=10, high=24),
+    VitalRule(field="systolic_bp", label="Systolic", low=90, high=160, critical_low=80),
+    VitalRule(field="diastolic_bp", label="Diastolic", low=50, high=100),
+    VitalRule(field="spo2", label="SpO2", unit="%", low=94, critical_low=90),
+    VitalRule(
+        field="temperature_c",
+        label="Temp",
+        unit="°C",
+        low=35.5,
+        high=38.5,
+        critical_high=39.5,
+    ),
+]
+
+# Rows with at least this many issues are high severity even if none is critical.
+HIGH_ISSUE_COUNT = 3
+
+
+def ward_of(location: str | None) -> str | None:
+    """Ward part of a patient location such as "ICU - Bed 3"."""
+    if not location:
+        return None
+    return location.split(" - ", 1)[0].strip() or None
+
+
+class RuleResult:
+    """Vectorised verdicts for a batch; row i maps to the i-th input reading."""
+
+    def __init__(
+        self,
+        engine: "RuleEngine",
+        values: np.ndarray,
+        severity: np.ndarray,
+        issues: np.ndarray,
+    ) -> None:
+        self.engine = engine
+        self.values = values
+        self.severity = severity
+        self.issues = issues
+
+    def severity_of(self, row: int) -> str | None:
+        return SEVERITIES[self.severity[row]]
+
+    def describe(self, row: int) -> list[str]:
+        """Render the issue text for one row, e.g. ["HR 124.0", "SpO2 89.0%"]."""
+        mask = int(self.issues[row])
+        return [
+            f"{rule.label} {self.values[row, j]}{rule.unit}"
+            for j, rule in enumerate(self.engine.rules)
+            if mask >> j & 1
+        ]
+
+
+class RuleEngine:
+    """
+    Threshold table compiled to (ward, vital) bound arrays.
+
+    Ward overrides may change any bound of an existing rule but not add
+    rules, so issue bit j means the same vital for every ward.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[VitalRule],
+        ward_overrides: Mapping[str, Mapping[str, Mapping[str, float]]] | None = None,
+        high_issue_count: int = HIGH_ISSUE_COUNT,
+    ) -> None:
+        self.rules = list(rules)
+        self.fields = [rule.field for rule in self.rules]
+        self.high_issue_count = high_issue_count
+        overrides = dict(ward_overrides or {})
+        self.wards = {ward: i + 1 for i, ward in enumerate(sorted(overrides))}
+
+        tables = [self.rules]
+        for ward in sorted(overrides):
+            unknown = set(overrides[ward]) - set(self.fields)
+            if unknown:
+                raise ValueError(f"Unknown vitals in {ward} rules: {sorted(unknown)}")
+            tables.append(
+                [
+                    rule.copy(update=dict(overrides[ward].get(rule.field, {})))
+                    for rule in self.rules
+                ]
+            )
+        bounds = np.array(
+            [
+                [(r.low, r.high, r.critical_low, r.critical_high) for r in table]
+                for table in tables
+            ],
+            dtype=np.float64,
+        )
+        # Each is (n_wards, n_rules); row 0 is the default table.
+        self.low, self.high, self.critical_low, self.critical_high = np.moveaxis(
+            bounds, 2, 0
+        )
+        self.bits = np.left_shift(1, np.arange(len(self.rules), dtype=np.int64))
+        # The same bounds as plain floats per ward, for scoring one reading
+        # without paying NumPy's per-call overhead.
+        self._scalar_bounds = [
+            list(zip(self.rules, *(b.tolist() for b in table), strict=True))
+            for table in zip(
+                self.low, self.high, self.critical_low, self.critical_high, strict=True
+            )
+        ]
+
+    def ward_index(self, ward: str | None) -> int:
+        return self.wards.get(ward, 0) if ward else 0
+
+    def matrix(self, readings: Sequence[VitalsPayload]) -> np.ndarray:
+        """Pack readings into an (n_rows, n_rules) matrix in rule order."""
+        matrix = np.empty((len(readings), len(self.fields)), dtype=np.float64)
+        for j, name in enumerate(self.fields):
+            matrix[:, j] = np.fromiter(
+                (getattr(v, name) for v in readings),
+                dtype=np.float64,
+                count=len(readings),
+            )
+        return matrix
+
+    def evaluate_one(
+        self, reading: VitalsPayload, ward: str | None = None
+    ) -> tuple[str | None, list[str]]:
+        """Severity and issue text for one reading; same verdicts as `evaluate`."""
+        issues: list[str] = []
+        critical = False
+        for rule, low, high, critical_low, critical_high in self._scalar_bounds[
+            self.ward_index(ward)
+        ]:
+            value = float(getattr(reading, rule.field))
+            if value < low or value > high:
+                issues.append(f"{rule.label} {value}{rule.unit}")
+            if value < critical_low or value > critical_high:
+                critical = True
+        if not issues:
+            return None, issues
+        high_severity = critical or len(issues) >= self.high_issue_count
+        return SEVERITIES[2 if high_severity else 1], issues
+
+    def evaluate(
+        self,
+        readings: Sequence[VitalsPayload],
+        wards: Sequence[str | None] | None = None,
+    ) -> RuleResult:
+        if wards is None:
+            ward_idx = np.zeros(len(readings), dtype=np.intp)
+        else:
+            ward_idx = np.fromiter(
+                (self.ward_index(w) for w in wards), dtype=np.intp, count=len(wards)
+            )
+        return self.evaluate_matrix(self.matrix(readings), ward_idx)
+
+    def evaluate_matrix(self, values: np.ndarray, ward_idx: np.ndarray) -> RuleResult:
+        if ward_idx.any():
+            low, high = self.low[ward_idx], self.high[ward_idx]
+            critical_low = self.critical_low[ward_idx]
+            critical_high = self.critical_high[ward_idx]
+        else:
+            # Default table only: broadcast one row instead of gathering n.
+            low, high = self.low[0], self.high[0]
+            critical_low, critical_high = self.critical_low[0], self.critical_high[0]
+        issues = ((values < low) | (values > high)) @ self.bits
+        flagged = issues != 0
+        escalated = flagged & (
+            (np.bitwise_count(issues) >= self.high_issue_count)
+            | ((values < critical_low) | (values > critical_high)).any(axis=1)
+        )
+        severity = flagged.astype(np.int8) + escalated
+        return RuleResult(self, values, severity, issues)
+
+
+def evaluate_abnormal_vitals(
+    v: VitalsPayload, ward: str | None = None
+) -> tuple[str | None, list[str]]:
+    """Single-reading convenience wrapper around the shared engine."""
+    return get_rule_engine().evaluate_one(v, ward)
+
+
+@lru_cache
+def get_rule_engine() -> RuleEngine:
+    """
+    Build the engine from `ALERT_RULES_PATH` if set, else the default table.
+
+    The file holds per-field bound overrides, e.g.
+    {"default": {"heart_rate": {"high": 120}}, "wards": {"ICU": {...}}}.
+    """
+    path: Path | None = get_settings().alert_rules_path
+    if path is None:
+        return RuleEngine(DEFAULT_RULES)
+    config = json.loads(path.read_text())
+    defaults = config.get("default", {})
+    rules = [rule.copy(update=defaults.get(rule.field, {})) for rule in DEFAULT_RULES]
+    return RuleEngine(
+        rules,
+        ward_overrides=config.get("wards", {}),
+        high_issue_count=config.get("high_issue_count", HIGH_ISSUE_COUNT),
+    )
@@ -0,0 +1,215 @@
+"""Risk scoring in-process, through the scoring service, or both."""
+
+import asyncio
+from typing import Literal
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from ..core.config import get_settings
+from ..core.downstream import get_client
+from ..models.domain import RiskScoreResult, VitalsPayload
+from .mock_model import get_model
+
+ScoringMode = Literal["local", "remote", "shadow"]
+
+
+class Scorer:
+    """
+    Scores vitals for the gateway's routers and vitals pipeline.
+
+    `remote` posts to the scoring service, which also keeps per-patient trend
+    windows and hot-reloads artifacts. `local` scores with the cached
+    `get_model()` artifact in-process and skips the network hop, at the cost
+    of trend features and signals. `shadow` answers locally and replays the
+    same rows against the service in the background, counting version and
+    score disagreements, so drift between the gateway's artifact and the
+    deployed model shows up before relying on `local`.
+    """
+
+    def __init__(
+        self,
+        mode: ScoringMode,
+        shadow_max_inflight: int,
+        shadow_tolerance: float,
+        version_check_seconds: float,
+    ) -> None:
+        self.mode = mode
+        self.shadow_max_inflight = shadow_max_inflight
+        self.shadow_tolerance = shadow_tolerance
+        self.version_check_seconds = version_check_seconds
+        self.remote_version: str | None = None
+        self.local_rows = 0
+        self.remote_rows = 0
+        self.shadow_rows = 0
+        self.shadow_skipped = 0
+        self.shadow_errors = 0
+        self.score_mismatches = 0
+        self.label_mismatches = 0
+        self.max_abs_diff = 0.0
+        self._checks: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.mode != "remote":
+            self._task = asyncio.create_task(self._watch_version())
+
+    async def stop(self) -> None:
+        tasks = [*self._checks, *([self._task] if self._task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def score(self, vitals: VitalsPayload) -> RiskScoreResult:
+        (result,) = await self.score_batch([vitals])
+        return result
+
+    async def score_batch(
+        self, rows: list[VitalsPayload], update_trends: bool = False
+    ) -> list[RiskScoreResult]:
+        """
+        Score rows in order; `remote` raises `httpx.HTTPStatusError` on errors.
+
+        Only ingested readings should pass `update_trends`, which adds them to
+        the scoring service's per-patient trend windows.
+        """
+        if self.mode == "remote":
+            return await self._remote(rows, update_trends)
+        results = self._local(rows)
+        if self.mode == "shadow":
+            self._shadow(rows, results, update_trends)
+        return results
+
+    def stats(self) -> dict:
+        local_version = get_model().version
+        return {
+            "mode": self.mode,
+            "local_version": local_version,
+            "remote_version": self.remote_version,
+            "version_drift": self.remote_version not in (None, local_version),
+            "local_rows": self.local_rows,
+            "remote_rows": self.remote_rows,
+            "shadow_rows": self.shadow_rows,
+            "shadow_inflight": len(self._checks),
+            "shadow_skipped": self.shadow_skipped,
+            "shadow_errors": self.shadow_errors,
+            "score_mismatches": self.score_mismatches,
+            "label_mismatches": self.label_mismatches,
+            "max_abs_diff": self.max_abs_diff,
+        }
+
+    def _local(self, rows: list[VitalsPayload]) -> list[RiskScoreResult]:
+        model = get_model()
+        probs, labels = model.score_matrix(model.feature_matrix(rows))
+        self.local_rows += len(rows)
+        return [
+            RiskScoreResult(
+                patient_id=row.patient_id,
+                risk_score=prob,
+                risk_label=label,
+                model_version=model.version,
+            )
+            for row, prob, label in zip(
+                rows, probs.tolist(), labels.tolist(), strict=True
+            )
+        ]
+
+    async def _remote(
+        self, rows: list[VitalsPayload], update_trends: bool = False
+    ) -> list[RiskScoreResult]:
+        resp = await get_client("scoring").post(
+            "/score/batch",
+            params={"update_trends": str(update_trends).lower()},
+            json=jsonable_encoder(rows),
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        self.remote_rows += len(rows)
+        self._observe_version(body["model_version"])
+        trend_signals = body.get("trend_signals") or [[] for _ in rows]
+        return [
+            RiskScoreResult(
+                patient_id=patient_id,
+                risk_score=risk_score,
+                risk_label=risk_label,
+                model_version=body["model_version"],
+                trend_signals=signals,
+                generated_at=body["generated_at"],
+            )
+            for patient_id, risk_score, risk_label, signals in zip(
+                body["patient_id"],
+                body["risk_score"],
+                body["risk_label"],
+                trend_signals,
+                strict=True,
+            )
+        ]
+
+    def _shadow(
+        self,
+        rows: list[VitalsPayload],
+        local: list[RiskScoreResult],
+        update_trends: bool,
+    ) -> None:
+        if len(self._checks) >= self.shadow_max_inflight:
+            self.shadow_skipped += len(rows)
+            return
+        task = asyncio.create_task(self._compare(rows, local, update_trends))
+        self._checks.add(task)
+        task.add_done_callback(self._checks.discard)
+
+    async def _compare(
+        self,
+        rows: list[VitalsPayload],
+        local: list[RiskScoreResult],
+        update_trends: bool,
+    ) -> None:
+        try:
+            remote = await self._remote(rows, update_trends)
+        except (httpx.HTTPError, KeyError, TypeError, ValueError) as exc:
+            # ValueError covers bad JSON, ragged columns and invalid results.
+            self.shadow_errors += len(rows)
+            logger.debug(f"Shadow scoring failed: {exc}")
+            return
+        self.shadow_rows += len(rows)
+        for mine, theirs in zip(local, remote, strict=True):
+            diff = abs(mine.risk_score - theirs.risk_score)
+            self.max_abs_diff = max(self.max_abs_diff, diff)
+            self.score_mismatches += diff > self.shadow_tolerance
+            self.label_mismatches += mine.risk_label != theirs.risk_label
+
+    async def _watch_version(self) -> None:
+        while True:
+            try:
+                resp = await get_client("scoring").get("/models")
+                resp.raise_for_status()
+                self._observe_version(resp.json()["active_version"])
+            except (httpx.HTTPError, KeyError, TypeError, ValueError) as exc:
+                logger.debug(f"Scoring model version check failed: {exc}")
+            await asyncio.sleep(self.version_check_seconds)
+
+    def _observe_version(self, version: str) -> None:
+        if version != self.remote_version and version != get_model().version:
+            logger.warning(
+                f"Scoring service runs model {version}; "
+                f"gateway has {get_model().version}"
+            )
+        self.remote_version = version
+
+
+_scorer: Scorer | None = None
+
+
+def get_scorer() -> Scorer:
+    global _scorer
+    if _scorer is None:
+        settings = get_settings()
+        _scorer = Scorer(
+            settings.scoring_mode,
+            shadow_max_inflight=settings.scoring_shadow_max_inflight,
+            shadow_tolerance=settings.scoring_shadow_tolerance,
+            version_check_seconds=settings.scoring_version_check_seconds,
+        )
+    return _scorer
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark for the compiled MockRiskModel scoring paths.
+
+Compares the original dict-walking scorer against `score`, `score_row` and
+`score_matrix` on the packaged artifact and prints the per-row cost of each.
+
+    PYTHONPATH=backend python backend/benchmarks/bench_mock_model.py
+"""
+
+import json
+import math
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from app.services.mock_model import MockRiskModel
+
+ARTIFACT = (
+    Path(__file__).resolve().parents[2]
+    / "models"
+    / "mock_artifacts"
+    / "sepsis_mock_model.json"
+)
+PAYLOAD = {
+    "heart_rate": 130.0,
+    "respiratory_rate": 26.0,
+    "systolic_bp": 90.0,
+    "diastolic_bp": 50.0,
+    "spo2": 90.0,
+    "temperature_c": 39.0,
+}
+MATRIX_ROWS = 10_000
+
+
+class LegacyModel:
+    """The pre-compilation scorer, kept as the baseline."""
+
+    def __init__(self, artifact_path: Path):
+        data = json.loads(artifact_path.read_text())
+        self.intercept = float(data.get("intercept", 0.0))
+        self.weights = {k: float(v) for k, v in data.get("weights", {}).items()}
+        self.threshold = float(data.get("threshold", 0.5))
+
+    def score(self, features: dict) -> tuple[float, str]:
+        import math
+
+        z = self.intercept
+        for name, weight in self.weights.items():
+            z += weight * float(features.get(name, 0.0))
+        prob = 1 / (1 + math.exp(-z))
+        label = "high" if prob >= self.threshold else "normal"
+        return prob, label
+
+
+def per_call_ns(stmt, number: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main() -> None:
+    model = MockRiskModel(ARTIFACT)
+    row = [PAYLOAD[name] for name in model.feature_names]
+    matrix = np.tile(np.asarray(row, dtype=np.float64), (MATRIX_ROWS, 1))
+
+    legacy = LegacyModel(ARTIFACT)
+    expected, _ = legacy.score(PAYLOAD)
+    if not math.isclose(model.score_row(row)[0], expected):
+        raise AssertionError("score_row diverged from the legacy scorer")
+
+    results = {
+        "legacy_dict_walk": per_call_ns(lambda: legacy.score(PAYLOAD), 20_000),
+        "score": per_call_ns(lambda: model.score(PAYLOAD), 20_000),
+        "score_row": per_call_ns(lambda: model.score_row(row), 20_000),
+        "score_matrix_per_row": per_call_ns(lambda: model.score_matrix(matrix), 50)
+        / MATRIX_ROWS,
+    }
+    baseline = results["legacy_dict_walk"]
+    for name, ns in results.items():
+        print(f"{name:>22}: {ns:9.1f} ns/row  ({baseline / ns:6.1f}x vs legacy)")
+
+
+if __name__ == "__main__":
+    main()
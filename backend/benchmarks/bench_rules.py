@@ -0,0 +1,84 @@
+"""
+Micro-benchmark for the vectorised alert rule engine.
+
+Compares the original per-reading if-chain (which also built every issue
+string eagerly) against one `RuleEngine.evaluate` call per batch.
+
+    PYTHONPATH=backend python backend/benchmarks/bench_rules.py
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from app.models.domain import VitalsPayload
+from app.services.rules import DEFAULT_RULES, RuleEngine
+
+BATCH_ROWS = 1_000
+
+
+def readings(n: int) -> list[VitalsPayload]:
+    rng = random.Random(0)
+    return [
+        VitalsPayload(
+            patient_id=f"p{i}",
+            heart_rate=rng.randint(40, 140),
+            respiratory_rate=rng.randint(8, 32),
+            systolic_bp=rng.randint(70, 170),
+            diastolic_bp=rng.randint(40, 110),
+            spo2=rng.randint(85, 100),
+            temperature_c=round(rng.uniform(35.0, 40.0), 1),
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_rules(v: VitalsPayload) -> tuple[str | None, list[str]]:
+    """The pre-engine if-chain, kept as the baseline."""
+    issues: list[str] = []
+    if v.heart_rate < 50 or v.heart_rate > 110:
+        issues.append(f"HR {v.heart_rate}")
+    if v.respiratory_rate < 10 or v.respiratory_rate > 24:
+        issues.append(f"RR {v.respiratory_rate}")
+    if v.systolic_bp < 90 or v.systolic_bp > 160:
+        issues.append(f"Systolic {v.systolic_bp}")
+    if v.diastolic_bp < 50 or v.diastolic_bp > 100:
+        issues.append(f"Diastolic {v.diastolic_bp}")
+    if v.spo2 < 94:
+        issues.append(f"SpO2 {v.spo2}%")
+    if v.temperature_c < 35.5 or v.temperature_c > 38.5:
+        issues.append(f"Temp {v.temperature_c}°C")
+    if not issues:
+        return None, issues
+    high = v.spo2 < 90 or v.systolic_bp < 80 or v.temperature_c > 39.5
+    return ("high" if high or len(issues) >= 3 else "moderate"), issues
+
+
+def per_row_ns(stmt, number: int, rows: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number / rows * 1e9
+
+
+def main() -> None:
+    batch = readings(BATCH_ROWS)
+    engine = RuleEngine(DEFAULT_RULES)
+    matrix = engine.matrix(batch)
+    wards = np.zeros(BATCH_ROWS, dtype=np.intp)
+
+    results = {
+        "legacy_if_chain": per_row_ns(
+            lambda: [legacy_rules(v) for v in batch], 50, BATCH_ROWS
+        ),
+        "batch_evaluate": per_row_ns(lambda: engine.evaluate(batch), 50, BATCH_ROWS),
+        "batch_matrix_only": per_row_ns(
+            lambda: engine.evaluate_matrix(matrix, wards), 200, BATCH_ROWS
+        ),
+    }
+    baseline = results["legacy_if_chain"]
+    for name, ns in results.items():
+        print(f"{name:>18}: {ns:9.1f} ns/row  ({baseline / ns:6.1f}x vs legacy)")
+
+
+if __name__ == "__main__":
+    main()
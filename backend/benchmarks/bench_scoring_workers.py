@@ -0,0 +1,153 @@
+"""
+Throughput benchmark for the scoring service across gunicorn worker counts.
+
+Starts services/scoring the way its Dockerfile does (gunicorn, uvicorn
+workers, --preload) once per worker count, waits for `/ready`, then drives
+`POST /score/batch` from separate client processes for a fixed duration and
+prints requests/s, rows/s and the speedup over one worker.
+
+    python backend/benchmarks/bench_scoring_workers.py --workers 1 2 4
+
+Client processes share the machine with the server, so scaling tops out
+once workers plus clients exceed the available cores (`os.cpu_count()`).
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+ROW = {
+    "patient_id": "bench",
+    "heart_rate": 118.0,
+    "respiratory_rate": 22.0,
+    "systolic_bp": 104.0,
+    "diastolic_bp": 66.0,
+    "spo2": 94.0,
+    "temperature_c": 38.1,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def image_tree(path: Path) -> Path:
+    """Lay out the app as the scoring Dockerfile does, shared metrics included."""
+    shutil.copytree(ROOT / "services" / "scoring" / "app", path / "app")
+    (path / "app" / "core").mkdir()
+    shutil.copy(ROOT / "backend" / "app" / "core" / "metrics.py", path / "app" / "core")
+    return path
+
+
+def start_server(workers: int, port: int, cwd: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "MODELS_DIR": str(ROOT / "models" / "mock_artifacts"),
+    }
+    cmd = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "app.main:app",
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--preload",
+        "--log-level",
+        "warning",
+    ]
+    return subprocess.Popen(cmd, cwd=cwd, env=env)
+
+
+def wait_ready(base_url: str, workers: int, timeout: float = 30.0) -> None:
+    """Wait until `/ready` has answered from every worker process."""
+    pids: set[int] = set()
+    deadline = time.monotonic() + timeout
+    with httpx.Client(base_url=base_url) as client:
+        while len(pids) < workers:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Only {len(pids)}/{workers} workers became ready")
+            try:
+                resp = client.get("/ready", headers={"Connection": "close"})
+            except httpx.HTTPError:
+                time.sleep(0.1)
+                continue
+            if resp.status_code == 200:
+                pids.add(resp.json()["pid"])
+            else:
+                time.sleep(0.1)
+
+
+def drive(base_url: str, rows: int, seconds: float, results) -> None:
+    body = [{**ROW, "patient_id": f"bench-{os.getpid()}-{i}"} for i in range(rows)]
+    done = 0
+    with httpx.Client(base_url=base_url) as client:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            client.post("/score/batch", json=body).raise_for_status()
+            done += 1
+    results.put(done)
+
+
+def measure(workers: int, clients: int, rows: int, seconds: float) -> float:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    tmp = tempfile.TemporaryDirectory()
+    server = start_server(workers, port, image_tree(Path(tmp.name)))
+    try:
+        wait_ready(base_url, workers)
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=drive, args=(base_url, rows, seconds, results)
+            )
+            for _ in range(clients)
+        ]
+        for proc in procs:
+            proc.start()
+        total = sum(results.get() for _ in procs)
+        for proc in procs:
+            proc.join()
+        return total / seconds
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        tmp.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=0, help="default: 2x workers")
+    parser.add_argument("--rows", type=int, default=64, help="rows per request")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} rows/request={args.rows} seconds={args.seconds}")
+    baseline = None
+    for workers in args.workers:
+        clients = args.clients or 2 * workers
+        rps = measure(workers, clients, args.rows, args.seconds)
+        baseline = baseline or rps
+        print(
+            f"workers={workers:>2} clients={clients:>2}: {rps:8.1f} req/s "
+            f"{rps * args.rows:10.0f} rows/s  ({rps / baseline:4.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
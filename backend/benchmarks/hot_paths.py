@@ -0,0 +1,233 @@
+"""
+Per-call timings for the hot paths behind every reading and list response.
+
+Covers model scoring, `VitalsPayload` parsing and serialisation, alert rule
+evaluation, the vitals generator and each service's `_doc_to_*` converter.
+`thresholds.json` stores a ceiling per case; `test_hot_paths.py` fails
+when a case runs slower than its ceiling. Scale all ceilings with
+BENCH_THRESHOLD_SCALE on slower machines.
+
+    PYTHONPATH=backend python backend/benchmarks/hot_paths.py
+    PYTHONPATH=backend python backend/benchmarks/hot_paths.py --update
+    PYTHONPATH=backend python -m pytest backend/benchmarks
+
+`--update` rewrites the ceilings as this machine's timings times HEADROOM;
+do that deliberately, in the commit that makes a path slower or faster.
+"""
+
+import argparse
+import json
+import os
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+
+from loadtest import ROOT, load_service
+
+from app.models.domain import VitalsPayload
+from app.services.mock_model import MockRiskModel
+from app.services.rules import evaluate_abnormal_vitals, get_rule_engine
+
+THRESHOLDS = Path(__file__).with_name("thresholds.json")
+HEADROOM = 3.0
+ARTIFACT = ROOT / "models" / "mock_artifacts" / "sepsis_mock_model.json"
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+FEATURES: dict[str, float] = {
+    "heart_rate": 118.0,
+    "respiratory_rate": 22.0,
+    "systolic_bp": 104.0,
+    "diastolic_bp": 66.0,
+    "spo2": 93.0,
+    "temperature_c": 38.1,
+}
+READING = {
+    "patient_id": "p-1",
+    **FEATURES,
+    "device_id": "bed-12",
+    "recorded_at": "2026-01-01T10:00:00+00:00",
+}
+
+
+@lru_cache
+def service(name: str) -> ModuleType:
+    os.environ.setdefault("MODELS_DIR", str(ARTIFACT.parent))
+    return load_service(name)
+
+
+def converter(
+    name: str, function: str, doc: dict
+) -> Callable[[], Callable[[], object]]:
+    """Converters pop `_id` from their argument, so each call gets a copy."""
+
+    def setup() -> Callable[[], object]:
+        convert = getattr(service(name), function)
+        return lambda: convert({"_id": "oid", **doc})
+
+    return setup
+
+
+def model_score() -> Callable[[], object]:
+    model = MockRiskModel(ARTIFACT)
+    return lambda: model.score(FEATURES)
+
+
+def model_score_row() -> Callable[[], object]:
+    model = MockRiskModel(ARTIFACT)
+    row = [FEATURES[name] for name in model.feature_names]
+    return lambda: model.score_row(row)
+
+
+def vitals_parse() -> Callable[[], object]:
+    return lambda: VitalsPayload.parse_obj(READING)
+
+
+def vitals_json() -> Callable[[], object]:
+    payload = VitalsPayload.parse_obj(READING)
+    return payload.json
+
+
+def rules_single() -> Callable[[], object]:
+    payload = VitalsPayload.parse_obj(READING)
+    get_rule_engine()
+    return lambda: evaluate_abnormal_vitals(payload, "ICU")
+
+
+def rules_batch_per_row() -> Callable[[], object]:
+    batch = [VitalsPayload.parse_obj(READING)] * 1000
+    engine = get_rule_engine()
+    return lambda: engine.evaluate(batch)
+
+
+def base_vitals_for_risk() -> Callable[[], object]:
+    generate = service("vitals")._base_vitals_for_risk
+    return lambda: generate("high")
+
+
+def scoring_service_batch() -> Callable[[], object]:
+    scoring = service("scoring")
+    model = scoring.registry.current()
+    rows = [scoring.VitalsPayload.parse_obj(READING)] * 64
+    return lambda: model.score_matrix(model.feature_matrix(rows))
+
+
+# Case name -> (setup returning the timed callable, rows handled per call).
+CASES: dict[str, tuple[Callable[[], Callable[[], object]], int]] = {
+    "model.score": (model_score, 1),
+    "model.score_row": (model_score_row, 1),
+    "vitals_payload.parse": (vitals_parse, 1),
+    "vitals_payload.json": (vitals_json, 1),
+    "rules.evaluate_abnormal_vitals": (rules_single, 1),
+    "rules.evaluate_batch_1000": (rules_batch_per_row, 1000),
+    "scoring_service.batch_64": (scoring_service_batch, 64),
+    "vitals._base_vitals_for_risk": (base_vitals_for_risk, 1),
+    "vitals._doc_to_vitals": (
+        converter("vitals", "_doc_to_vitals", {**READING, "recorded_at": NOW}),
+        1,
+    ),
+    "patients._doc_to_patient": (
+        converter(
+            "patients",
+            "_doc_to_patient",
+            {
+                "id": "p-1",
+                "name": "Avery Patel",
+                "age": 67,
+                "location": "ICU - Bed 3",
+                "risk": "high",
+                "is_monitoring": True,
+                "assigned_to": "dr.jane@sentinel.care",
+                "notes": None,
+            },
+        ),
+        1,
+    ),
+    "alerts._doc_to_alert": (
+        converter(
+            "alerts",
+            "_doc_to_alert",
+            {
+                "alert_id": "a-1",
+                "patient_id": "p-1",
+                "severity": "high",
+                "message": "Model risk flagged high | Abnormal vitals: HR 124.0",
+                "created_at": NOW,
+            },
+        ),
+        1,
+    ),
+    "tasks._doc_to_task": (
+        converter(
+            "tasks",
+            "_doc_to_task",
+            {
+                "id": "t-1",
+                "patient_id": "p-1",
+                "title": "Repeat lactate",
+                "status": "open",
+                "priority": "high",
+                "assigned_to": "nurse.kim@sentinel.care",
+                "due_at": NOW,
+                "created_by": "dr.jane@sentinel.care",
+                "created_at": NOW,
+                "updated_at": NOW,
+            },
+        ),
+        1,
+    ),
+    "audit._doc_to_event": (
+        converter(
+            "audit",
+            "_doc_to_event",
+            {
+                "id": "e-1",
+                "action": "create_patient",
+                "subject": "dr.jane@sentinel.care",
+                "actor_role": "doctor",
+                "path": None,
+                "detail": "patient=p-1",
+                "created_at": NOW,
+            },
+        ),
+        1,
+    ),
+}
+
+
+def measure(name: str) -> float:
+    """Best-of-5 nanoseconds per row for one case."""
+    setup, rows = CASES[name]
+    fn = setup()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / number / rows * 1e9
+
+
+def load_thresholds() -> dict[str, float]:
+    return json.loads(THRESHOLDS.read_text())["ns_per_row"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="rewrite thresholds.json")
+    args = parser.parse_args()
+
+    current = load_thresholds() if THRESHOLDS.exists() else {}
+    measured = {name: measure(name) for name in CASES}
+    for name, ns in measured.items():
+        ceiling = current.get(name)
+        note = f"(ceiling {ceiling:,.0f})" if ceiling else "(no ceiling)"
+        print(f"{name:>32}: {ns:12,.1f} ns/row  {note}")
+    if args.update:
+        ceilings = {name: round(ns * HEADROOM) for name, ns in measured.items()}
+        THRESHOLDS.write_text(
+            json.dumps({"headroom": HEADROOM, "ns_per_row": ceilings}, indent=2) + "\n"
+        )
+        print(f"Wrote {THRESHOLDS}")
+
+
+if __name__ == "__main__":
+    main()
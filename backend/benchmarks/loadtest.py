@@ -0,0 +1,358 @@
+"""
+End-to-end load test for the gateway and its services.
+
+By default the whole stack runs in this process. Each service app is
+imported from services/*/app/main.py with its collections swapped for one
+shared in-memory mongomock-motor database, and the gateway reaches the
+services through httpx ASGI transports. That keeps runs reproducible enough
+to compare commits, but load generator, gateway and services share one
+event loop and CPU. Use `--base-url` to aim the same scenarios at a
+running deployment instead.
+
+Load is open-loop. Requests start on a fixed schedule of `--rate` per
+second whether or not earlier ones have finished, and latency is measured
+from the scheduled start. A slow server therefore shows up as latency, not
+as a quietly reduced offered rate (coordinated omission). Requests beyond
+`--max-inflight` are counted as dropped instead of being sent.
+
+    pip install -r backend/benchmarks/requirements.txt
+    PYTHONPATH=backend python backend/benchmarks/loadtest.py --out before.json
+    PYTHONPATH=backend python backend/benchmarks/loadtest.py \\
+        --baseline before.json --out after.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from jose import jwt
+
+ROOT = Path(__file__).resolve().parents[2]
+IN_PROCESS_SERVICES = ("patients", "vitals", "alerts", "scoring", "tasks", "audit")
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended.
+HISTOGRAM_LE_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+METRICS = ("p50", "p95", "p99", "achieved_rps")
+
+Scenario = Callable[[httpx.AsyncClient, str], Awaitable[httpx.Response]]
+
+
+def vitals_row(patient_id: str) -> dict:
+    return {
+        "patient_id": patient_id,
+        "heart_rate": random.randint(55, 135),
+        "respiratory_rate": random.randint(12, 30),
+        "systolic_bp": random.randint(85, 150),
+        "diastolic_bp": random.randint(50, 95),
+        "spo2": random.randint(88, 100),
+        "temperature_c": round(random.uniform(36.0, 39.5), 1),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "vitals": lambda client, pid: client.post("/vitals", json=vitals_row(pid)),
+    "score": lambda client, pid: client.post("/scoring/risk", json=vitals_row(pid)),
+    "simulate": lambda client, pid: client.post(
+        "/simulate/run",
+        params={"patient_id": pid, "risk": random.choice(["normal", "high"])},
+    ),
+    "alerts": lambda client, pid: client.get("/alerts", params={"limit": 50}),
+}
+
+
+class InProcessStack:
+    """The gateway and the Mongo-backed services wired together in memory."""
+
+    def __init__(self) -> None:
+        self.services: dict[str, ModuleType] = {}
+        self.gateway: FastAPI | None = None
+
+    async def start(self) -> httpx.AsyncClient:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError as exc:
+            raise SystemExit(
+                "In-process mode needs mongomock-motor: "
+                "pip install -r backend/benchmarks/requirements.txt"
+            ) from exc
+        from pymongo.errors import OperationFailure
+
+        os.environ.setdefault("MODELS_DIR", str(ROOT / "models" / "mock_artifacts"))
+        db = AsyncMongoMockClient()["sentinelcare"]
+
+        def no_change_streams(*args, **kwargs):
+            # What a standalone mongod says; services fall back to polling.
+            raise OperationFailure(
+                "The $changeStream stage is only supported on replica sets"
+            )
+
+        from app.core.downstream import downstream
+
+        for name in IN_PROCESS_SERVICES:
+            module = load_service(name)
+            for attr, value in list(vars(module).items()):
+                if attr.endswith("_col"):
+                    collection = db[value.name]
+                    # setattr: mypy rejects assigning to a method or to an
+                    # attribute it cannot see on a module.
+                    setattr(collection, "watch", no_change_streams)  # noqa: B010
+                    setattr(module, attr, collection)
+            setattr(module, "db", db)  # noqa: B010
+            for hook in module.app.router.on_startup:
+                await hook()
+            self.services[name] = module
+            downstream._clients[name] = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=module.app), base_url=f"http://{name}"
+            )
+
+        from app.main import app
+
+        self.gateway = app
+        for hook in app.router.on_startup:
+            # The alert relay follows an endless SSE stream, which ASGI
+            # transports buffer rather than stream; nothing here subscribes.
+            if hook.__name__ != "start_alert_relay":
+                await hook()
+        # httpx types ASGI scopes as dict, Starlette as MutableMapping.
+        transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+        return httpx.AsyncClient(transport=transport, base_url="http://gateway")
+
+    async def stop(self) -> None:
+        if self.gateway is not None:
+            for hook in self.gateway.router.on_shutdown:
+                await hook()
+        for module in self.services.values():
+            for hook in module.app.router.on_shutdown:
+                await hook()
+
+
+def load_service(name: str) -> ModuleType:
+    path = ROOT / "services" / name / "app" / "main.py"
+    spec = importlib.util.spec_from_file_location(f"loadtest_{name}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load service {name!r} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def mint_token() -> str:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    claims = {
+        "sub": "loadtest@sentinel.care",
+        "role": "admin",
+        "iss": settings.auth_issuer,
+        "aud": settings.auth_audience,
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(claims, settings.auth_secret, algorithm="HS256")
+
+
+async def seed_patients(client: httpx.AsyncClient, count: int) -> list[str]:
+    ids = []
+    for i in range(count):
+        resp = await client.post(
+            "/patients",
+            json={
+                "name": f"Load Test {i}",
+                "age": 40 + i % 50,
+                "location": "ICU - Bed 1",
+            },
+        )
+        resp.raise_for_status()
+        ids.append(resp.json()["id"])
+    return ids
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    patient_ids: list[str],
+    rate: float,
+    duration: float,
+    max_inflight: int,
+) -> dict:
+    latencies: list[float] = []
+    outcomes: Counter[str] = Counter()
+    inflight: set[asyncio.Task] = set()
+    loop = asyncio.get_running_loop()
+
+    async def one(scheduled: float) -> None:
+        try:
+            resp = await scenario(client, random.choice(patient_ids))
+            outcomes[str(resp.status_code)] += 1
+        except httpx.HTTPError as exc:
+            outcomes[type(exc).__name__] += 1
+        latencies.append((loop.time() - scheduled) * 1000)
+
+    start = loop.time()
+    total = int(rate * duration)
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(inflight) >= max_inflight:
+            outcomes["dropped"] += 1
+            continue
+        task = asyncio.create_task(one(scheduled))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+    await asyncio.gather(*inflight)
+    # The last request is scheduled just before `duration`; do not credit that gap.
+    elapsed = max(loop.time() - start, duration)
+
+    ok = sum(n for code, n in outcomes.items() if code.startswith("2"))
+    values = np.asarray(latencies) if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    counts = np.histogram(values, bins=[0, *HISTOGRAM_LE_MS, np.inf])[0]
+    return {
+        "offered_rps": rate,
+        "achieved_rps": round(ok / elapsed, 2),
+        "requests": total,
+        "ok": ok,
+        "outcomes": dict(sorted(outcomes.items())),
+        "latency_ms": {
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "mean": round(float(values.mean()), 3),
+            "max": round(float(values.max()), 3),
+        },
+        "histogram": {"le_ms": [*HISTOGRAM_LE_MS, "inf"], "counts": counts.tolist()},
+    }
+
+
+def git_revision() -> dict:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain")),
+    }
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(
+        f"\n{'scenario':<10} {'metric':<13} {'baseline':>10} {'current':>10} {'change':>8}"
+    )
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        for metric in METRICS:
+            old = (
+                before[metric]
+                if metric == "achieved_rps"
+                else before["latency_ms"][metric]
+            )
+            new = (
+                result[metric]
+                if metric == "achieved_rps"
+                else result["latency_ms"][metric]
+            )
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"{name:<10} {metric:<13} {old:>10.2f} {new:>10.2f} {change:>+7.1f}%")
+
+
+async def main(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    stack = None
+    if args.base_url:
+        transport_client = httpx.AsyncClient(base_url=args.base_url)
+    else:
+        stack = InProcessStack()
+        transport_client = await stack.start()
+    token = args.token or mint_token()
+    transport_client.headers["Authorization"] = f"Bearer {token}"
+    transport_client.timeout = httpx.Timeout(args.timeout)
+
+    results: dict = {
+        "meta": {
+            **git_revision(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or "in-process",
+            "python": platform.python_version(),
+            "rate": args.rate,
+            "duration": args.duration,
+            "max_inflight": args.max_inflight,
+            "patients": args.patients,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+    try:
+        patient_ids = await seed_patients(transport_client, args.patients)
+        for name in args.scenarios:
+            result = await run_scenario(
+                transport_client,
+                SCENARIOS[name],
+                patient_ids,
+                rate=args.rate,
+                duration=args.duration,
+                max_inflight=args.max_inflight,
+            )
+            results["scenarios"][name] = result
+            latency = result["latency_ms"]
+            print(
+                f"{name:<10} {result['achieved_rps']:8.1f} ok/s  "
+                f"p50={latency['p50']:.1f}ms p95={latency['p95']:.1f}ms "
+                f"p99={latency['p99']:.1f}ms  {result['outcomes']}",
+                file=sys.stderr,
+            )
+    finally:
+        await transport_client.aclose()
+        if stack is not None:
+            await stack.stop()
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--rate", type=float, default=100.0, help="requests/s offered")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds each")
+    parser.add_argument("--max-inflight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--patients", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", help="target a running gateway instead")
+    parser.add_argument("--token", help="bearer token (default: minted locally)")
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare with")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(main(args))
+    body = json.dumps(results, indent=2)
+    if args.out:
+        args.out.write_text(body + "\n")
+    else:
+        print(body)
+    if args.baseline:
+        compare(json.loads(args.baseline.read_text()), results)
@@ -0,0 +1,18 @@
+import os
+
+import pytest
+from hot_paths import CASES, load_thresholds, measure
+
+THRESHOLDS = load_thresholds()
+# CI agents are slower and noisier than the machine that wrote thresholds.json.
+SCALE = float(os.environ.get("BENCH_THRESHOLD_SCALE", "1.0"))
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_hot_path_within_threshold(name):
+    if name not in THRESHOLDS:
+        pytest.skip(f"No threshold recorded for {name}; run hot_paths.py --update")
+    ceiling = THRESHOLDS[name] * SCALE
+    ns = measure(name)
+    if ns > ceiling:
+        raise AssertionError(f"{name}: {ns:,.0f} ns/row exceeds {ceiling:,.0f} ns/row")
@@ -0,0 +1,31 @@
+import importlib.util
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="session")
+def load_service() -> Callable[[str], ModuleType]:
+    """Import services/<name>/app/main.py once per session, as its image would."""
+    os.environ.setdefault("MODELS_DIR", str(ROOT / "models" / "mock_artifacts"))
+    loaded: dict[str, ModuleType] = {}
+
+    def load(name: str) -> ModuleType:
+        if name not in loaded:
+            path = ROOT / "services" / name / "app" / "main.py"
+            spec = importlib.util.spec_from_file_location(f"service_{name}", path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Cannot load {path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
+            loaded[name] = module
+        return loaded[name]
+
+    return load
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from app.services.alert_stream import AlertHub, AlertRelay
+
+
+def _alert(patient_id: str, severity: str = "high") -> dict:
+    return {"patient_id": patient_id, "severity": severity, "message": "m"}
+
+
+def test_hub_filters_and_resumes_from_last_event_id():
+    hub = AlertHub(buffer_size=10, queue_size=10)
+    live = hub.subscribe(lambda a: a["patient_id"] == "p1")
+    for event_id, patient_id in enumerate(["p1", "p2", "p1"], start=1):
+        hub.publish(event_id, _alert(patient_id))
+    if [live.queue.get_nowait()[0] for _ in range(live.queue.qsize())] != [1, 3]:
+        raise AssertionError("Subscribers must only receive matching alerts")
+    resumed = hub.subscribe(lambda a: True, last_event_id=1)
+    if [resumed.queue.get_nowait()[0] for _ in range(2)] != [2, 3]:
+        raise AssertionError("Resume must replay buffered events after the last id")
+
+
+def test_lagging_subscriber_is_cut_after_draining():
+    hub = AlertHub(buffer_size=10, queue_size=2)
+    sub = hub.subscribe(lambda a: True)
+    for event_id in range(1, 4):
+        hub.publish(event_id, _alert("p1"))
+
+    async def drain() -> list[int]:
+        return [event[0] async for event in sub.events(heartbeat=1) if event]
+
+    if asyncio.run(drain()) != [1, 2] or hub.stats()["subscribers"] != 0:
+        raise AssertionError("A full queue must end the stream once drained")
+
+
+def test_relay_skips_malformed_frames_and_keeps_publishing():
+    class DirectRelay(AlertRelay):
+        async def _publish(self, event_id: int, alert: dict) -> None:
+            self.last_event_id = event_id
+            self.hub.publish(event_id, alert)
+
+    hub = AlertHub(buffer_size=10, queue_size=10)
+    sub = hub.subscribe(lambda a: True)
+    relay = DirectRelay(hub)
+
+    async def feed() -> None:
+        await relay._handle_frame("x", json.dumps(_alert("p1")))
+        await relay._handle_frame("1", "{not json")
+        await relay._handle_frame("2", json.dumps({"severity": "high"}))
+        await relay._handle_frame("3", json.dumps(_alert("p1")))
+
+    asyncio.run(feed())
+    if relay.skipped != 3 or [sub.queue.get_nowait()[0]] != [3]:
+        raise AssertionError(f"Malformed frames must be skipped: {relay.skipped}")
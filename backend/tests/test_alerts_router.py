@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+from fastapi import Response
+
+from app.core.downstream import downstream
+from app.models.domain import Alert
+from app.routers import alerts as alerts_router
+from app.services.patient_directory import PatientDirectory
+
+
+def test_list_alerts_syncs_the_directory_alongside_the_alerts_hop(monkeypatch):
+    directory = PatientDirectory(refresh_seconds=30)
+    monkeypatch.setattr(alerts_router, "get_patient_directory", lambda: directory)
+
+    async def run() -> tuple[list[Alert] | Response, int]:
+        patients_called = asyncio.Event()
+        lookups = 0
+
+        async def alerts(request: httpx.Request) -> httpx.Response:
+            # Deadlocks (and times out) unless the patients call is in flight.
+            await asyncio.wait_for(patients_called.wait(), timeout=1)
+            item = {"patient_id": "p9", "severity": "high", "message": "HR 140"}
+            return httpx.Response(200, json=[item])
+
+        async def patients(request: httpx.Request) -> httpx.Response:
+            nonlocal lookups
+            patients_called.set()
+            if "ids" in request.url.params:
+                lookups += 1
+            return httpx.Response(200, json=[{"id": "p9", "name": "New Patient"}])
+
+        downstream._clients["alerts"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(alerts), base_url="http://alerts.test"
+        )
+        downstream._clients["patients"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(patients), base_url="http://patients.test"
+        )
+        result = await alerts_router.list_alerts(
+            Response(), limit=None, cursor=None, fields=None, subject="dr.a"
+        )
+        return result, lookups
+
+    try:
+        result, lookups = asyncio.run(run())
+    finally:
+        downstream._clients.pop("alerts")
+        downstream._clients.pop("patients")
+    if not isinstance(result, list) or lookups != 0:
+        raise AssertionError(f"Expected alerts without a name lookup: {result}")
+    if [a.patient_name for a in result] != ["New Patient"]:
+        raise AssertionError(f"Name must come from the overlapped sync: {result}")
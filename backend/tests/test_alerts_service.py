@@ -0,0 +1,81 @@
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def alerts(load_service, monkeypatch):
+    module = load_service("alerts")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(module, "alerts_col", db["alerts"])
+    return module
+
+
+def client(module) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=module.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://alerts")
+
+
+def _alert(i: int) -> dict:
+    # Pairs share a timestamp so pages must break ties on alert_id.
+    created_at = START + timedelta(minutes=i // 2)
+    return {
+        "alert_id": f"a{i}",
+        "patient_id": f"p{i % 3}",
+        "severity": "high" if i % 2 else "moderate",
+        "message": f"Alert {i}",
+        "created_at": created_at.isoformat(),
+    }
+
+
+async def _pages(c: httpx.AsyncClient, **params) -> list[httpx.Response]:
+    pages = [await c.get("/alerts", params=params)]
+    while "X-Next-Cursor" in pages[-1].headers:
+        cursor = pages[-1].headers["X-Next-Cursor"]
+        pages.append(await c.get("/alerts", params={**params, "cursor": cursor}))
+    return pages
+
+
+def test_keyset_pages_cover_every_alert_once_in_order(alerts):
+    async def run() -> list[httpx.Response]:
+        async with client(alerts) as c:
+            for i in range(7):
+                (await c.post("/alerts", json=_alert(i))).raise_for_status()
+            return await _pages(c, limit=3)
+
+    pages = asyncio.run(run())
+    sizes = [len(page.json()) for page in pages]
+    ids = [a["alert_id"] for page in pages for a in page.json()]
+    if sizes != [3, 3, 1]:
+        raise AssertionError(f"Only full pages may carry a next cursor: {sizes}")
+    if ids != [f"a{i}" for i in range(6, -1, -1)]:
+        raise AssertionError(f"Pages must follow (created_at, alert_id) desc: {ids}")
+
+
+def test_fields_projection_keeps_sort_keys_and_rejects_unknown_fields(alerts):
+    async def run() -> tuple[list[httpx.Response], httpx.Response, httpx.Response]:
+        async with client(alerts) as c:
+            for i in range(4):
+                (await c.post("/alerts", json=_alert(i))).raise_for_status()
+            pages = await _pages(c, limit=2, fields="severity")
+            unknown = await c.get("/alerts", params={"fields": "severity,ssn"})
+            bad = base64.urlsafe_b64encode(b"not json").decode()
+            broken = await c.get("/alerts", params={"cursor": bad})
+        return pages, unknown, broken
+
+    pages, unknown, broken = asyncio.run(run())
+    rows = [row for page in pages for row in page.json()]
+    if len(rows) != 4 or any(
+        set(row) != {"severity", "created_at", "alert_id"} for row in rows
+    ):
+        raise AssertionError(f"Projected pages must hold only requested keys: {rows}")
+    if unknown.status_code != 400 or broken.status_code != 400:
+        raise AssertionError(
+            f"Bad fields/cursor must be 400: {unknown.status_code}, {broken.status_code}"
+        )
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def events(audit, first: int, count: int) -> list:
+    return [
+        audit.AuditEvent(
+            id=f"e{i}",
+            action="view_patient",
+            detail="x" * 40,
+            created_at=START + timedelta(seconds=i),
+        )
+        for i in range(first, first + count)
+    ]
+
+
+def open_log(audit, directory, max_bytes=10_000, dedupe_window=1000):
+    log = audit.SegmentLog(
+        directory, max_bytes, fsync=False, dedupe_window=dedupe_window
+    )
+    log.open()
+    return log
+
+
+def ids(records) -> list[str]:
+    return [json.loads(record)["id"] for record in records]
+
+
+def test_segment_log_rotates_and_queries_newest_first(load_service, tmp_path):
+    audit = load_service("audit")
+    log = open_log(audit, tmp_path, max_bytes=1000)
+    # Arrival order differs from created_at order, including across segments.
+    batches = [events(audit, 10, 10), events(audit, 0, 10), events(audit, 20, 10)]
+    for batch in batches:
+        asyncio.run(log.append(batch))
+    if log.stats()["segments"] < 3:
+        raise AssertionError(f"Expected rotation past max_bytes: {log.stats()}")
+    every = ids(log.query(None, None, None))
+    if every != [f"e{i}" for i in range(29, -1, -1)]:
+        raise AssertionError(f"Records must come back newest first: {every}")
+    newest = ids(log.query(None, None, 5))
+    window = ids(
+        log.query(START + timedelta(seconds=5), START + timedelta(seconds=15), 3)
+    )
+    if newest != ["e29", "e28", "e27", "e26", "e25"] or window != ["e14", "e13", "e12"]:
+        raise AssertionError(f"Unexpected limited queries: {newest} / {window}")
+    log.close()
+
+
+def test_segment_log_recovers_a_torn_tail(load_service, tmp_path):
+    audit = load_service("audit")
+    log = open_log(audit, tmp_path)
+    asyncio.run(log.append(events(audit, 0, 3)))
+    log.close()
+    segment = log.segments[-1]
+    with open(segment.data_path, "ab") as fh:
+        fh.write(b'{"id": "torn", "act')
+    with open(segment.index_path, "ab") as fh:
+        fh.write(b"\x01\x02\x03")
+
+    log = open_log(audit, tmp_path)
+    asyncio.run(log.append(events(audit, 3, 1)))
+    if ids(log.query(None, None, None)) != ["e3", "e2", "e1", "e0"]:
+        raise AssertionError("A torn tail must be cut off and appends resume after it")
+    if log.stats()["records"] != 4:
+        raise AssertionError(f"Unexpected stats after recovery: {log.stats()}")
+    log.close()
+
+
+def test_segment_log_dedupes_across_segments_after_restart(load_service, tmp_path):
+    audit = load_service("audit")
+    log = open_log(audit, tmp_path, max_bytes=1000, dedupe_window=25)
+    for first in range(0, 30, 10):
+        asyncio.run(log.append(events(audit, first, 10)))
+    log.close()
+
+    log = open_log(audit, tmp_path, max_bytes=1000, dedupe_window=25)
+    inserted, duplicates = asyncio.run(log.append(events(audit, 5, 25)))
+    if (inserted, duplicates) != (0, 25):
+        raise AssertionError(
+            f"Replayed ids from older segments: {inserted}, {duplicates}"
+        )
+    # e0-e4 fell outside the window, so they are accepted again.
+    inserted, duplicates = asyncio.run(log.append(events(audit, 0, 5)))
+    if (inserted, duplicates) != (5, 0):
+        raise AssertionError(f"Window must hold only the newest ids: {inserted}")
+    log.close()
@@ -0,0 +1,119 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+from app.core.audit import AuditSink, Delivery
+
+
+class ScriptedSink(AuditSink):
+    """Sink whose audit service is up or down as the test says."""
+
+    def __init__(self, spool_path: Path) -> None:
+        super().__init__(queue_size=2, batch_size=2, flush_ms=10, spool_path=spool_path)
+        self.up = False
+        self.refuse: set[str] = set()
+        self.received: list[list[dict]] = []
+
+    async def _send(self, batch: list[dict]) -> Delivery:
+        if not self.up:
+            return "retry"
+        if any(event["id"] in self.refuse for event in batch):
+            return "rejected"
+        self.received.append(batch)
+        return "sent"
+
+
+def test_audit_sink_spools_while_down_and_replays_in_batches():
+    async def scenario(spool: Path) -> ScriptedSink:
+        sink = ScriptedSink(spool)
+        for i in range(3):
+            sink.emit({"id": str(i), "action": "x"})
+        if sink.dropped != 1:
+            raise AssertionError(f"Queue bound not applied: {sink.stats()}")
+        await sink.stop()  # drains the queue; the service is down
+        if not spool.exists() or sink.spooled != 2:
+            raise AssertionError(f"Batch was not spooled: {sink.stats()}")
+        sink.up = True
+        await sink.flush([{"id": "2", "action": "x"}])
+        await sink.replay_spool()
+        return sink
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spool = Path(tmp) / "audit" / "spool.ndjson"
+        sink = asyncio.run(scenario(spool))
+        if spool.exists():
+            raise AssertionError("Spool must be removed once replayed")
+    ids = [[event["id"] for event in batch] for batch in sink.received]
+    if ids != [["2"], ["0", "1"]] or sink.replayed != 2:
+        raise AssertionError(f"Unexpected deliveries: {ids} {sink.stats()}")
+
+
+def test_audit_sink_stop_ships_the_batch_the_flusher_was_filling():
+    async def scenario() -> ScriptedSink:
+        sink = ScriptedSink(Path(tmp) / "spool.ndjson")
+        sink.flush_interval = 60  # the flusher lingers on a half-full batch
+        sink.up = True
+        sink.start()
+        sink.emit({"id": "0", "action": "x"})
+        await asyncio.sleep(0.01)
+        if sink.queue.qsize() != 0 or sink.stats()["pending"] != 1:
+            raise AssertionError(f"Flusher should hold the event: {sink.stats()}")
+        await sink.stop()
+        return sink
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = asyncio.run(scenario())
+    if sink.received != [[{"id": "0", "action": "x"}]]:
+        raise AssertionError(f"In-flight batch lost on stop: {sink.stats()}")
+
+
+def test_audit_sink_skips_torn_spool_lines_and_dead_letters_refused_batches():
+    async def scenario(sink: ScriptedSink) -> None:
+        sink.spool_path.write_text(
+            '{"id": "0", "action": "x"}\n{"id": "1", "action": "x"}\n'
+            '{"id": "2", "action": "x"}\n{"id": "3", "act'
+        )
+        sink.up = True
+        sink.refuse = {"0"}
+        await sink.replay_spool()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = ScriptedSink(Path(tmp) / "spool.ndjson")
+        asyncio.run(scenario(sink))
+        dead = sink.dead_letter_path.read_text().splitlines()
+        if sink.spool_path.exists():
+            raise AssertionError("Spool must be removed once replayed")
+    if len(dead) != 2 or sink.dead_lettered != 2:
+        raise AssertionError(f"Refused batch not dead-lettered: {sink.stats()}")
+    if sink.received != [[{"id": "2", "action": "x"}]] or sink.replayed != 1:
+        raise AssertionError(
+            f"Replay must continue past a refused batch: {sink.stats()}"
+        )
+
+
+def test_audit_sink_flusher_survives_unexpected_errors():
+    class FlakySink(ScriptedSink):
+        failures = 1
+
+        async def _send(self, batch: list[dict]) -> Delivery:
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("boom")
+            return await super()._send(batch)
+
+    async def scenario() -> FlakySink:
+        sink = FlakySink(Path(tmp) / "spool.ndjson")
+        sink.up = True
+        sink.start()
+        sink.emit({"id": "0", "action": "x"})
+        for _ in range(100):
+            if sink.sent:
+                break
+            await asyncio.sleep(0.01)
+        await sink.stop()
+        return sink
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = asyncio.run(scenario())
+    if sink.errors != 1 or sink.received != [[{"id": "0", "action": "x"}]]:
+        raise AssertionError(f"Flusher must retry after an error: {sink.stats()}")
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from jose import jwt
+
+from app.core import auth
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+
+def _token(exp_offset: int) -> str:
+    settings = get_settings()
+    return jwt.encode(
+        {
+            "sub": "nurse.sam@sentinel.care",
+            "role": "nurse",
+            "iss": settings.auth_issuer,
+            "aud": settings.auth_audience,
+            "exp": int(time.time()) + exp_offset,
+        },
+        settings.auth_secret,
+        algorithm="HS256",
+    )
+
+
+def test_verified_claims_are_served_from_cache():
+    cache = auth.get_claims_cache()
+    cache.clear()
+    header = f"Bearer {_token(600)}"
+    first = asyncio.run(auth.get_current_claims(header))
+    hits = cache.hits
+    second = asyncio.run(auth.get_current_claims(header))
+    if second is not first or cache.hits != hits + 1:
+        raise AssertionError("Second lookup should skip signature verification")
+
+
+def test_cache_entries_expire_with_the_token():
+    now = [1000.0]
+    cache: TTLCache[str, dict] = TTLCache(maxsize=2, ttl=300, clock=lambda: now[0])
+    cache.set("short", {"sub": "a"}, ttl=5)
+    cache.set("long", {"sub": "b"})
+    now[0] += 10
+    if cache.get("short") is not None:
+        raise AssertionError("Entry must not outlive the token's exp")
+    if cache.get("long") is None:
+        raise AssertionError("Entry within the cache TTL should still be served")
@@ -0,0 +1,18 @@
+import asyncio
+
+from app.core.config import Settings
+from app.core.downstream import DownstreamClients
+
+
+def test_downstream_clients_reuse_one_pool_per_service():
+    settings = Settings(alerts_service_url="http://alerts.test:8103")
+    clients = DownstreamClients()
+    clients.start(settings)
+    first = clients.get("alerts")
+    if first is not clients.get("alerts"):
+        raise AssertionError("Registry must hand out the same pooled client")
+    if str(first.base_url) != "http://alerts.test:8103":
+        raise AssertionError("Client base URL must come from Settings")
+    asyncio.run(clients.aclose())
+    if not first.is_closed:
+        raise AssertionError("aclose() must close every pooled client")
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.metrics import InstrumentedTransport, instrument
+
+
+def _sample(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"No sample starting with {prefix}")
+
+
+def test_metrics_label_requests_by_route_and_downstream_by_target():
+    app = FastAPI()
+    instrument(app, "metrics-test")
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    async def run() -> str:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=InstrumentedTransport(transport, "metrics-test", "items"),
+            base_url="http://items",
+        ) as client:
+            for item_id in ("a", "b", "c"):
+                (await client.get(f"/items/{item_id}")).raise_for_status()
+            await client.get("/nowhere")
+            resp = await client.get("/metrics")
+        resp.raise_for_status()
+        return resp.text
+
+    body = asyncio.run(run())
+    count = _sample(
+        body,
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/items/{item_id}",service="metrics-test",status="200"}',
+    )
+    if count != 3:
+        raise AssertionError("Requests must be grouped under the route template")
+    _sample(body, 'http_request_duration_seconds_count{method="GET",route="unmatched"')
+    downstream = _sample(
+        body,
+        'downstream_request_duration_seconds_count{method="GET",'
+        'service="metrics-test",status="200",target="items"}',
+    )
+    if downstream != 3:
+        raise AssertionError("Outgoing calls must be timed per target service")
@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+
+from app.core.downstream import downstream
+from app.services.patient_directory import PatientDirectory
+
+
+def test_patient_names_are_batched_and_remembered():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[{"id": "p1", "name": "Ada"}])
+
+    downstream._clients["patients"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://patients.test"
+    )
+    directory = PatientDirectory(refresh_seconds=30)
+    try:
+        first = asyncio.run(directory.resolve_names(["p1", "p2", "p1"]))
+        second = asyncio.run(directory.resolve_names(["p1", "p2"]))
+    finally:
+        downstream._clients.pop("patients")
+    if first != {"p1": "Ada", "p2": None} or second != first:
+        raise AssertionError(f"Unexpected names: {first} / {second}")
+    if len(requests) != 1 or requests[0].url.params["ids"] != "p1,p2":
+        raise AssertionError("Misses must be fetched once in a single ?ids= lookup")
+    if directory.assigned_to(None) != [{"id": "p1", "name": "Ada"}]:
+        raise AssertionError("Fetched patients must be indexed by assignee")
+
+
+def test_refresher_survives_malformed_responses():
+    bodies = iter([[{"name": "no id"}], {"not": "a list"}])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = next(bodies, [{"id": "p1", "name": "Ada"}])
+        return httpx.Response(200, json=body)
+
+    downstream._clients["patients"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://patients.test"
+    )
+    directory = PatientDirectory(refresh_seconds=0)
+
+    async def run() -> None:
+        directory.start()
+        await asyncio.sleep(0.05)
+        await directory.stop()
+
+    try:
+        asyncio.run(run())
+    finally:
+        downstream._clients.pop("patients")
+    if directory.get("p1") is None or directory.reloads == 0:
+        raise AssertionError("Refresher must keep going after bad responses")
+
+
+def test_directory_syncs_only_changed_patients_and_caches_misses():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        params = request.url.params
+        if "ids" in params:
+            return httpx.Response(200, json=[])
+        if "updated_since" not in params:
+            rows = [
+                {"id": "p1", "name": "Ada", "assigned_to": "dr.a"},
+                {"id": "p2", "name": "Bo", "assigned_to": "dr.a"},
+            ]
+            return httpx.Response(200, json=rows, headers={"X-Updated-Since": "t1"})
+        if params["updated_since"] == "t1":
+            moved = [{"id": "p2", "name": "Bo", "assigned_to": "dr.b"}]
+            return httpx.Response(200, json=moved, headers={"X-Updated-Since": "t2"})
+        return httpx.Response(200, json=[], headers={"X-Updated-Since": "t3"})
+
+    downstream._clients["patients"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://patients.test"
+    )
+    directory = PatientDirectory(refresh_seconds=30, miss_ttl=30)
+
+    async def run() -> None:
+        await directory.sync()
+        await directory.sync()
+        await directory.sync()
+        await directory.sync(max_age=60)
+        await directory.resolve_names(["ghost"])
+        await directory.resolve_names(["ghost", "p1"])
+
+    try:
+        asyncio.run(run())
+    finally:
+        downstream._clients.pop("patients")
+    since = [r.url.params.get("updated_since") for r in requests[:3]]
+    if since != [None, "t1", "t2"] or len(requests) != 4:
+        raise AssertionError(
+            f"Unexpected sync requests: {[str(r.url) for r in requests]}"
+        )
+    if [p["id"] for p in directory.assigned_to("dr.a")] != ["p1"]:
+        raise AssertionError("A reassigned patient must move between assignees")
+    if directory.stats()["reloads"] != 1 or directory.stats()["changes"] != 1:
+        raise AssertionError(f"Unexpected stats: {directory.stats()}")
@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Response
+from mongomock_motor import AsyncMongoMockClient
+
+
+@pytest.fixture
+def patients(load_service, monkeypatch):
+    module = load_service("patients")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(module, "patients_col", db["patients"])
+    monkeypatch.setattr(module.directory, "ready", False)
+    return module
+
+
+def client(module) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=module.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://patients")
+
+
+def test_updated_since_returns_only_changed_patients(patients, monkeypatch):
+    monkeypatch.setattr(patients.settings, "sync_grace_seconds", 0.0)
+    new = {"name": "Ada", "age": 40, "location": "ICU - Bed 1"}
+
+    async def run() -> tuple[list[str], list[str]]:
+        async with client(patients) as c:
+            first = (await c.post("/patients", json=new)).json()
+            await c.post("/patients", json={**new, "name": "Bo"})
+            token = (await c.get("/patients")).headers["X-Updated-Since"]
+            await asyncio.sleep(0.01)
+            patch = {"isMonitoring": False}
+            await c.patch(f"/patients/{first['id']}/monitor", json=patch)
+            changed = await c.get("/patients", params={"updated_since": token})
+            later = changed.headers["X-Updated-Since"]
+            await asyncio.sleep(0.01)
+            none = await c.get("/patients", params={"updated_since": later})
+        return [p["name"] for p in changed.json()], none.json()
+
+    changed, none = asyncio.run(run())
+    if changed != ["Ada"] or none != []:
+        raise AssertionError(f"Unexpected change feed: {changed} / {none}")
+
+
+FILTERS: list[dict[str, str]] = [
+    {},
+    {"assigned_to": "dr.a"},
+    {"assigned_to": "dr.a", "include_unassigned": "true"},
+    {"assigned_to": "dr.b", "include_unassigned": "true", "isMonitoring": "true"},
+    {"risk": "high"},
+    {"isMonitoring": "false", "location": "ICU - Bed 0"},
+    {"assigned_to": "dr.c", "include_unassigned": "true", "risk": "moderate"},
+]
+
+
+def roster(module) -> list[dict]:
+    assignees = ["dr.a", "dr.b", None]
+    risks = ["normal", "moderate", "high"]
+    return [
+        {
+            **module.Patient(
+                id=f"p{i:02d}",
+                name=f"Patient {i}",
+                age=30 + i,
+                location=f"ICU - Bed {i % 2}",
+                risk=risks[i % 3],
+                is_monitoring=i % 4 != 0,
+                assigned_to=assignees[i % 5 % 3],
+            ).dict(by_alias=False),
+            "_id": f"p{i:02d}",
+        }
+        for i in range(23)
+    ]
+
+
+async def pages(c: httpx.AsyncClient, params: dict[str, str]) -> list[list[str]]:
+    """Ids page by page, following X-Next-Cursor."""
+    pages: list[list[str]] = []
+    query = {**params, "limit": "4"}
+    while True:
+        resp = await c.get("/patients", params=query)
+        resp.raise_for_status()
+        pages.append([p["id"] for p in resp.json()])
+        if "X-Next-Cursor" not in resp.headers:
+            return pages
+        query["cursor"] = resp.headers["X-Next-Cursor"]
+
+
+def expected(docs: list[dict], params: dict[str, str]) -> list[str]:
+    assignees = {params.get("assigned_to")}
+    if params.get("include_unassigned") == "true":
+        assignees.add(None)
+    return [
+        d["id"]
+        for d in docs
+        if ("assigned_to" not in params or d["assigned_to"] in assignees)
+        and ("risk" not in params or d["risk"] == params["risk"])
+        and ("location" not in params or d["location"] == params["location"])
+        and (
+            "isMonitoring" not in params
+            or d["is_monitoring"] == (params["isMonitoring"] == "true")
+        )
+    ]
+
+
+def test_directory_and_mongo_return_the_same_filtered_pages(patients, monkeypatch):
+    docs = roster(patients)
+
+    async def run() -> tuple[list[list[list[str]]], list[list[list[str]]]]:
+        await patients.patients_col.insert_many(docs)
+        async with client(patients) as c:
+            from_mongo = [await pages(c, params) for params in FILTERS]
+            directory = patients.PatientDirectory(refresh_seconds=60)
+            await directory.load()
+            monkeypatch.setattr(patients, "directory", directory)
+            from_directory = [await pages(c, params) for params in FILTERS]
+        return from_mongo, from_directory
+
+    from_mongo, from_directory = asyncio.run(run())
+    for params, mongo, memory in zip(FILTERS, from_mongo, from_directory, strict=True):
+        if mongo != memory:
+            raise AssertionError(f"{params}: Mongo {mongo} != directory {memory}")
+        if [i for page in mongo for i in page] != expected(docs, params):
+            raise AssertionError(f"{params}: wrong patients {mongo}")
+
+
+def test_gateway_pushes_doctor_scope_and_filters_down(monkeypatch):
+    from app.core.downstream import downstream
+    from app.routers import patients as patients_router
+
+    seen: list[httpx.QueryParams] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params)
+        return httpx.Response(200, json=[])
+
+    async def run() -> None:
+        downstream._clients["patients"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://patients.test"
+        )
+        for role in ("doctor", "nurse"):
+            await patients_router.list_patients(
+                Response(),
+                limit=None,
+                cursor=None,
+                fields=None,
+                is_monitoring=True,
+                risk="high",
+                location=None,
+                subject="dr.a",
+                role=role,
+            )
+
+    try:
+        asyncio.run(run())
+    finally:
+        downstream._clients.pop("patients")
+    doctor, nurse = (dict(params) for params in seen)
+    want = {"isMonitoring": "true", "risk": "high"}
+    if doctor != {**want, "assigned_to": "dr.a", "include_unassigned": "true"}:
+        raise AssertionError(f"Doctor scope must be sent to the service: {doctor}")
+    if nurse != want:
+        raise AssertionError(f"Only the requested filters may be sent: {nurse}")
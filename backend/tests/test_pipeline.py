@@ -0,0 +1,24 @@
+import asyncio
+
+from app.services.pipeline import BrokerFull, InMemoryBroker
+
+
+def test_in_memory_broker_fetches_micro_batches_and_pushes_back():
+    async def scenario() -> tuple[list[int], list[int], bool]:
+        broker = InMemoryBroker(maxsize=3)
+        for i in range(3):
+            await broker.publish("t", {"i": i})
+        try:
+            await broker.publish("t", {"i": 3})
+            rejected = False
+        except BrokerFull:
+            rejected = True
+        first = await broker.fetch("t", max_messages=2, timeout=0.1, linger=0)
+        rest = await broker.fetch("t", max_messages=2, timeout=0.1, linger=0.01)
+        return [m["i"] for m in first], [m["i"] for m in rest], rejected
+
+    first, rest, rejected = asyncio.run(scenario())
+    if first != [0, 1] or rest != [2]:
+        raise AssertionError(f"Unexpected batches: {first} / {rest}")
+    if not rejected:
+        raise AssertionError("A full topic must raise BrokerFull")
@@ -0,0 +1,77 @@
+import random
+
+from app.models.domain import VitalsPayload
+from app.services.rules import DEFAULT_RULES, RuleEngine, ward_of
+
+
+def _legacy(v: VitalsPayload) -> tuple[str | None, list[str]]:
+    """The original if-chain evaluator the engine must reproduce."""
+    issues: list[str] = []
+    if v.heart_rate < 50 or v.heart_rate > 110:
+        issues.append(f"HR {v.heart_rate}")
+    if v.respiratory_rate < 10 or v.respiratory_rate > 24:
+        issues.append(f"RR {v.respiratory_rate}")
+    if v.systolic_bp < 90 or v.systolic_bp > 160:
+        issues.append(f"Systolic {v.systolic_bp}")
+    if v.diastolic_bp < 50 or v.diastolic_bp > 100:
+        issues.append(f"Diastolic {v.diastolic_bp}")
+    if v.spo2 < 94:
+        issues.append(f"SpO2 {v.spo2}%")
+    if v.temperature_c < 35.5 or v.temperature_c > 38.5:
+        issues.append(f"Temp {v.temperature_c}°C")
+    if not issues:
+        return None, issues
+    high = v.spo2 < 90 or v.systolic_bp < 80 or v.temperature_c > 39.5
+    return ("high" if high or len(issues) >= 3 else "moderate"), issues
+
+
+def _reading(rng: random.Random) -> VitalsPayload:
+    return VitalsPayload(
+        patient_id="p1",
+        heart_rate=rng.randint(40, 140),
+        respiratory_rate=rng.randint(8, 32),
+        systolic_bp=rng.randint(70, 170),
+        diastolic_bp=rng.randint(40, 110),
+        spo2=rng.randint(85, 100),
+        temperature_c=round(rng.uniform(35.0, 40.0), 1),
+    )
+
+
+def test_batch_engine_matches_the_legacy_rules():
+    rng = random.Random(7)
+    readings = [_reading(rng) for _ in range(500)]
+    result = RuleEngine(DEFAULT_RULES).evaluate(readings)
+    for i, reading in enumerate(readings):
+        if (result.severity_of(i), result.describe(i)) != _legacy(reading):
+            raise AssertionError(f"Row {i} diverged from the legacy rules")
+
+
+def test_ward_overrides_only_apply_to_that_ward():
+    engine = RuleEngine(DEFAULT_RULES, {"ICU": {"heart_rate": {"high": 130}}})
+    reading = VitalsPayload(
+        patient_id="p1",
+        heart_rate=120,
+        respiratory_rate=16,
+        systolic_bp=120,
+        diastolic_bp=80,
+        spo2=98,
+        temperature_c=37,
+    )
+    result = engine.evaluate([reading, reading], [ward_of("ICU - Bed 3"), "Ward"])
+    if [result.severity_of(0), result.severity_of(1)] != [None, "moderate"]:
+        raise AssertionError("ICU threshold override was not applied per row")
+
+
+def test_single_reading_path_matches_the_batch_engine():
+    rng = random.Random(11)
+    readings = [_reading(rng) for _ in range(500)]
+    wards = [rng.choice([None, "ICU", "Ward"]) for _ in readings]
+    engine = RuleEngine(
+        DEFAULT_RULES,
+        {"ICU": {"heart_rate": {"high": 130}, "spo2": {"critical_low": 92}}},
+    )
+    result = engine.evaluate(readings, wards)
+    for i, (reading, ward) in enumerate(zip(readings, wards, strict=True)):
+        want = (result.severity_of(i), result.describe(i))
+        if engine.evaluate_one(reading, ward) != want:
+            raise AssertionError(f"Row {i} ({ward}) diverged from the batch engine")
@@ -1,6 +1,33 @@
+import asyncio
+import itertools
+import math
 from pathlib import Path
 
-from app.services.mock_model import MockRiskModel
+import httpx
+import numpy as np
+import pytest
+
+from app.core.config import get_settings
+from app.core.downstream import downstream
+from app.models.domain import VitalsPayload
+from app.services.mock_model import MockRiskModel, get_model
+from app.services.scorer import Scorer
+
+ARTIFACT = (
+    Path(__file__).resolve().parents[2]
+    / "models"
+    / "mock_artifacts"
+    / "sepsis_mock_model.json"
+)
+
+
+@pytest.fixture
+def packaged_model(monkeypatch):
+    """Point settings at the repo's artifact so get_model() works from any cwd."""
+    monkeypatch.setattr(get_settings(), "model_path", ARTIFACT)
+    get_model.cache_clear()
+    yield
+    get_model.cache_clear()
 
 
 def test_mock_model_golden_scores_high():
@@ -47,3 +74,105 @@ def test_mock_model_golden_scores_normal():
         raise AssertionError("Score must remain between 0 and 1 for normal-vital set")
     if label != "normal":
         raise AssertionError("Normal payload should produce 'normal' label")
+
+
+def test_mock_model_compiled_paths_match_dict_scoring():
+    artifact = (
+        Path(__file__).resolve().parents[2]
+        / "models"
+        / "mock_artifacts"
+        / "sepsis_mock_model.json"
+    )
+    model = MockRiskModel(artifact)
+    payloads = [
+        {"heart_rate": 130, "respiratory_rate": 26, "systolic_bp": 90},
+        {"heart_rate": 80, "spo2": 98, "temperature_c": 36.8},
+    ]
+    rows = [[p.get(name, 0.0) for name in model.feature_names] for p in payloads]
+    probs, labels = model.score_matrix(np.asarray(rows, dtype=np.float64))
+    for i, payload in enumerate(payloads):
+        expected = model.score(payload)
+        row_score, row_label = model.score_row(rows[i])
+        if not math.isclose(row_score, expected[0]) or row_label != expected[1]:
+            raise AssertionError("score_row must match dict-based score")
+        if not math.isclose(probs[i], expected[0]) or labels[i] != expected[1]:
+            raise AssertionError("score_matrix must match dict-based score")
+
+
+def test_get_model_returns_cached_instance(packaged_model):
+    if get_model() is not get_model():
+        raise AssertionError("get_model() should reuse the loaded artifact")
+
+
+def test_local_scorer_matches_model_and_zero_fills_trend_features(packaged_model):
+    model = get_model()
+    rows = [
+        VitalsPayload(
+            patient_id=f"p{i}",
+            heart_rate=80 + 25 * i,
+            respiratory_rate=16 + 5 * i,
+            systolic_bp=125 - 15 * i,
+            diastolic_bp=75,
+            spo2=98 - 4 * i,
+            temperature_c=36.8 + 1.5 * i,
+        )
+        for i in range(2)
+    ]
+    scorer = Scorer(
+        "local", shadow_max_inflight=1, shadow_tolerance=0.0, version_check_seconds=60
+    )
+    results = asyncio.run(scorer.score_batch(rows))
+    for row, result in zip(rows, results, strict=True):
+        expected = model.score(row.dict())
+        if (
+            not math.isclose(result.risk_score, expected[0])
+            or result.risk_label != expected[1]
+        ):
+            raise AssertionError("Local scoring must match the cached model")
+    trend_model = MockRiskModel.__new__(MockRiskModel)
+    trend_model.feature_names = ("heart_rate", "heart_rate_slope")
+    matrix = trend_model.feature_matrix(rows)
+    if matrix[:, 1].any() or matrix[1, 0] != 105:
+        raise AssertionError(f"Unexpected feature matrix: {matrix}")
+
+
+def test_shadow_compare_counts_malformed_responses_as_errors(packaged_model):
+    bodies = itertools.cycle([{"nope": True}, "not a dict", ["ragged"]])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/score/batch":
+            return httpx.Response(200, json={"model_version": "v2"})
+        return httpx.Response(200, json=next(bodies))
+
+    downstream._clients["scoring"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://scoring.test"
+    )
+    row = VitalsPayload(
+        patient_id="p1",
+        heart_rate=80,
+        respiratory_rate=16,
+        systolic_bp=125,
+        diastolic_bp=75,
+        spo2=98,
+        temperature_c=36.8,
+    )
+    scorer = Scorer(
+        "shadow", shadow_max_inflight=1, shadow_tolerance=0.0, version_check_seconds=0
+    )
+
+    async def run() -> None:
+        local = scorer._local([row])
+        await scorer._compare([row], local, False)
+        watcher = asyncio.create_task(scorer._watch_version())
+        await asyncio.sleep(0.05)
+        if watcher.done():
+            raise AssertionError("The version watcher must survive bad bodies")
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+
+    try:
+        asyncio.run(run())
+    finally:
+        downstream._clients.pop("scoring")
+    if scorer.shadow_errors != 1 or scorer.shadow_rows != 0:
+        raise AssertionError(f"Unexpected shadow stats: {scorer.stats()}")
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+ARTIFACT = {"version": "v1", "intercept": -1.0, "weights": {"heart_rate": 0.01}}
+
+
+def _write(path: Path, artifact: object, mtime: float) -> None:
+    path.write_text(json.dumps(artifact))
+    os.utime(path, (mtime, mtime))
+
+
+def test_model_registry_reloads_newest_and_keeps_model_on_bad_artifacts(
+    load_service, tmp_path
+):
+    scoring = load_service("scoring")
+    _write(tmp_path / "a.json", ARTIFACT, 1000)
+    registry = scoring.ModelRegistry(tmp_path, "*.json", keep=3)
+    registry.load_initial()
+
+    _write(tmp_path / "b.json", {**ARTIFACT, "version": "v2"}, 2000)
+    if not asyncio.run(registry.refresh()) or registry.active.version != "v2":
+        raise AssertionError(f"Newer artifact must be swapped in: {registry.status()}")
+
+    corrupt_artifacts = ({**ARTIFACT, "weights": None}, [1, 2], "{half-writ")
+    for i, corrupt in enumerate(corrupt_artifacts):
+        path = tmp_path / f"c{i}.json"
+        if isinstance(corrupt, str):
+            path.write_text(corrupt)
+            os.utime(path, (3000 + i, 3000 + i))
+        else:
+            _write(path, corrupt, 3000 + i)
+        if asyncio.run(registry.refresh()) or registry.active.version != "v2":
+            raise AssertionError(f"Corrupt artifact {corrupt!r} must be skipped")
+        if not registry.last_error:
+            raise AssertionError("A failed reload must be reported")
+
+
+def test_model_registry_survives_artifacts_removed_mid_poll(load_service, tmp_path):
+    scoring = load_service("scoring")
+    _write(tmp_path / "a.json", ARTIFACT, 1000)
+    registry = scoring.ModelRegistry(tmp_path, "*.json", keep=3)
+    registry.load_initial()
+
+    class VanishingDir:
+        """A directory whose listing names a file that is gone by stat time."""
+
+        def glob(self, pattern: str):
+            return [tmp_path / "gone.json", tmp_path / "a.json"]
+
+    registry.models_dir = VanishingDir()
+    if asyncio.run(registry.refresh()) or registry.active.version != "v1":
+        raise AssertionError("A file removed between glob and stat must be ignored")
+
+    registry.models_dir = tmp_path
+    (tmp_path / "a.json").unlink()
+    if asyncio.run(registry.refresh()) or registry.active.version != "v1":
+        raise AssertionError("With no artifacts left the current model stays active")
+
+    async def watch_once() -> None:
+        def broken():
+            raise RuntimeError("boom")
+
+        registry._newest_artifact = broken
+        task = asyncio.create_task(registry.watch(0.001))
+        await asyncio.sleep(0.02)
+        if task.done():
+            raise AssertionError("watch() must survive refresh errors")
+        task.cancel()
+
+    asyncio.run(watch_once())
+
+
+def _expected(times: list[float], values):
+    import numpy as np
+
+    x = np.asarray(times) / 60.0
+    y = np.asarray(values, dtype=np.float64)
+    slope = np.polyfit(x, y, 1)[0] if len(x) > 1 else np.zeros(y.shape[1])
+    return y.mean(axis=0), y.var(axis=0), slope
+
+
+def test_rolling_window_matches_numpy_and_evicts_by_time(load_service):
+    import numpy as np
+
+    scoring = load_service("scoring")
+    window = scoring.RollingWindow(span_seconds=600, max_readings=1000)
+    rng = np.random.default_rng(0)
+    readings = [(t * 30.0, 80 + 0.1 * t + rng.normal(size=6)) for t in range(100)]
+    for timestamp, y in readings:
+        window.push(timestamp, y)
+    kept = [(t, y) for t, y in readings if t >= readings[-1][0] - 600]
+    if window.count != len(kept) or abs(window.span_minutes() - 10.0) > 1e-9:
+        raise AssertionError(f"Window must hold the last 10 minutes: {window.count}")
+    mean, variance, slope = window.stats()
+    want = _expected([t for t, _ in kept], [y for _, y in kept])
+    for got, expected in zip((mean, variance, slope), want, strict=True):
+        if not np.allclose(got, expected, rtol=1e-9, atol=1e-9):
+            raise AssertionError(f"Window stats drifted: {got} != {expected}")
+
+    capped = scoring.RollingWindow(span_seconds=600, max_readings=4)
+    for timestamp, y in readings[:10]:
+        capped.push(timestamp, y)
+    if capped.count != 4 or not np.allclose(
+        capped.stats()[0],
+        _expected([t for t, _ in readings[6:10]], [y for _, y in readings[6:10]])[0],
+    ):
+        raise AssertionError("max_readings must evict the oldest readings")
+
+
+def test_rolling_window_stays_accurate_over_a_long_stay(load_service):
+    import numpy as np
+
+    scoring = load_service("scoring")
+    window = scoring.RollingWindow(span_seconds=900, max_readings=1024)
+    # Four days at 1 Hz with a steady +1/min heart-rate trend.
+    start = 1.7e9
+    for second in range(4 * 24 * 3600):
+        window.push(start + second, np.full(6, 80.0 + second / 60.0))
+    _, _, slope = window.stats()
+    if not np.allclose(slope, 1.0, rtol=1e-6):
+        raise AssertionError(f"Slope lost precision over a long stay: {slope}")
+    if window.signals(min_samples=4, min_span_minutes=1.0) == []:
+        raise AssertionError("A 15-minute window at 1 Hz must be able to signal")
+
+
+def test_ad_hoc_scores_do_not_touch_trend_windows(load_service):
+    import httpx
+
+    scoring = load_service("scoring")
+    row = {
+        "patient_id": "trend-p1",
+        "heart_rate": 90,
+        "respiratory_rate": 18,
+        "systolic_bp": 120,
+        "diastolic_bp": 80,
+        "spo2": 97,
+        "temperature_c": 37.0,
+    }
+
+    async def run() -> None:
+        transport = httpx.ASGITransport(app=scoring.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://s") as c:
+            (await c.post("/score", json=row)).raise_for_status()
+            (await c.post("/score/batch", json=[row])).raise_for_status()
+            if scoring.trends.get("trend-p1") is not None:
+                raise AssertionError("What-if scoring must not update trends")
+            params = {"update_trends": "true"}
+            (await c.post("/score/batch", params=params, json=[row])).raise_for_status()
+            (await c.post("/score", params=params, json=row)).raise_for_status()
+
+    asyncio.run(run())
+    if scoring.trends.get("trend-p1").count != 2:
+        raise AssertionError("Ingest scoring must add readings to the window")
+
+
+def test_batch_scores_match_single_scores_row_for_row(load_service):
+    import httpx
+
+    scoring = load_service("scoring")
+    rows = [
+        {
+            "patient_id": f"batch-p{i}",
+            "heart_rate": 70 + 12 * i,
+            "respiratory_rate": 14 + 3 * i,
+            "systolic_bp": 130 - 9 * i,
+            "diastolic_bp": 80 - 4 * i,
+            "spo2": 99 - 2 * i,
+            "temperature_c": 36.6 + 0.6 * i,
+        }
+        for i in range(5)
+    ]
+
+    async def run() -> tuple[dict, list[dict]]:
+        transport = httpx.ASGITransport(app=scoring.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://s") as c:
+            batch = (await c.post("/score/batch", json=rows)).json()
+            single = [(await c.post("/score", json=row)).json() for row in rows]
+        return batch, single
+
+    batch, single = asyncio.run(run())
+    for i, one in enumerate(single):
+        if (
+            batch["patient_id"][i] != one["patient_id"]
+            or abs(batch["risk_score"][i] - one["risk_score"]) > 1e-12
+            or batch["risk_label"][i] != one["risk_label"]
+        ):
+            raise AssertionError(f"Row {i} differs: {one} vs batch {batch}")
+
+    model = scoring.registry.current()
+    as_text = {k: str(v) for k, v in rows[4].items() if k != "patient_id"}
+    if model.score(as_text) != model.score({k: float(v) for k, v in as_text.items()}):
+        raise AssertionError("score() must coerce numeric strings like it used to")
+
+
+def test_trend_aware_model_scores_without_trends(load_service, tmp_path):
+    import numpy as np
+
+    scoring = load_service("scoring")
+    weights = {"heart_rate": 0.01, "heart_rate_slope": 0.5, "spo2_var": -0.2}
+    _write(tmp_path / "t.json", {**ARTIFACT, "weights": weights}, 1000)
+    model = scoring.MockRiskModel(tmp_path / "t.json")
+    rows = [
+        scoring.VitalsPayload(
+            patient_id=f"t{i}",
+            heart_rate=80 + i,
+            respiratory_rate=16,
+            systolic_bp=120,
+            diastolic_bp=80,
+            spo2=97,
+            temperature_c=37.0,
+        )
+        for i in range(3)
+    ]
+
+    matrix = model.feature_matrix(rows, None)
+    if not np.array_equal(matrix[:, 1:], np.zeros((3, 2))):
+        raise AssertionError(f"Missing trends must score as neutral: {matrix}")
+    probs, _ = model.score_matrix(matrix)
+    for i, row in enumerate(rows):
+        if abs(probs[i] - model.score_row(model.row(row))[0]) > 1e-12:
+            raise AssertionError(f"Row {i} must match the scalar path without trends")
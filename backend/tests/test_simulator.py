@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def simulator(load_service, monkeypatch):
+    module = load_service("simulator")
+    monkeypatch.setattr(module, "cycle_lock", asyncio.Lock())
+    monkeypatch.setattr(
+        module, "stats", {"cycles": 0, "overruns": 0, "skipped": 0, "last_cycle": None}
+    )
+    monkeypatch.setattr(module, "PAGE_SIZE", 10)
+    return module
+
+
+def use_handler(module, monkeypatch, handler) -> None:
+    """Route the cycle's own HTTP client through `handler`."""
+    monkeypatch.setattr(
+        module,
+        "InstrumentedTransport",
+        lambda transport, service: httpx.MockTransport(handler),
+    )
+
+
+def patients_page(request: httpx.Request, total: int) -> httpx.Response:
+    start = int(request.url.params.get("cursor", 0))
+    end = min(start + int(request.url.params["limit"]), total)
+    rows = [
+        {"id": f"p{i}", "risk": "high" if i % 5 == 0 else "normal"}
+        for i in range(start, end)
+    ]
+    headers = {"X-Next-Cursor": str(end)} if end < total else {}
+    return httpx.Response(200, headers=headers, json=rows)
+
+
+def test_cycle_fans_out_with_bounded_concurrency(simulator, monkeypatch):
+    monkeypatch.setattr(simulator, "CONCURRENCY", 4)
+    in_flight = peak = 0
+    alerts: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        path = request.url.path
+        if path == "/patients":
+            return patients_page(request, total=23)
+        if path == "/vitals/generate":
+            pid = request.url.params["patient_id"]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            if pid == "p7":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"patient_id": pid})
+        if path == "/score":
+            pid = json.loads(request.content)["patient_id"]
+            label = "high" if pid in {"p0", "p10", "p20"} else "normal"
+            return httpx.Response(200, json={"risk_label": label})
+        if path == "/alerts":
+            alerts.append(json.loads(request.content)["patient_id"])
+            return httpx.Response(201, json={})
+        return httpx.Response(404)
+
+    use_handler(simulator, monkeypatch, handler)
+    cycle = asyncio.run(simulator.run_cycle())
+
+    if cycle is None or (cycle["patients"], cycle["succeeded"], cycle["failed"]) != (
+        23,
+        22,
+        1,
+    ):
+        raise AssertionError(f"Every paged patient must be simulated once: {cycle}")
+    if peak != 4:
+        raise AssertionError(f"At most CONCURRENCY patients in flight, got peak {peak}")
+    if sorted(alerts) != ["p0", "p10", "p20"]:
+        raise AssertionError(f"High scores must raise alerts: {alerts}")
+
+
+def test_overlapping_cycles_are_skipped_and_overruns_counted(simulator, monkeypatch):
+    monkeypatch.setattr(simulator, "INTERVAL", 0)
+
+    async def run() -> tuple[object, object]:
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/patients":
+                await release.wait()
+                return patients_page(request, total=0)
+            return httpx.Response(404)
+
+        use_handler(simulator, monkeypatch, handler)
+        first = asyncio.create_task(simulator.run_cycle())
+        await asyncio.sleep(0)
+        skipped = await simulator.run_cycle()
+        release.set()
+        return await first, skipped
+
+    cycle, skipped = asyncio.run(run())
+    if skipped is not None or simulator.stats["skipped"] != 1:
+        raise AssertionError(
+            f"A start during a running cycle must skip: {simulator.stats}"
+        )
+    if not isinstance(cycle, dict) or not cycle["overrun"]:
+        raise AssertionError(f"A cycle longer than the interval is an overrun: {cycle}")
+    if (simulator.stats["cycles"], simulator.stats["overruns"]) != (1, 1):
+        raise AssertionError(
+            f"Overruns must be counted, not overlapped: {simulator.stats}"
+        )
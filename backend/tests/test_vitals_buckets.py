@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+HOUR = datetime(2026, 1, 1, 10)
+
+
+def reading(patient_id: str, recorded_at: datetime, heart_rate: float) -> dict:
+    return {
+        "patient_id": patient_id,
+        "heart_rate": heart_rate,
+        "respiratory_rate": 16.0,
+        "systolic_bp": 120.0,
+        "diastolic_bp": 80.0,
+        "spo2": 98.0,
+        "temperature_c": 37.0,
+        "device_id": None,
+        "recorded_at": recorded_at,
+    }
+
+
+@pytest.fixture
+def vitals(load_service, monkeypatch):
+    module = load_service("vitals")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(module, "buckets_col", db["vitals_buckets"])
+    monkeypatch.setattr(module.settings, "storage_mode", "bucket")
+    monkeypatch.setattr(module.settings, "bucket_seconds", 3600)
+    return module
+
+
+def test_readings_group_into_aligned_buckets_and_retries_do_not_duplicate(vitals):
+    docs = [
+        reading("p1", HOUR + timedelta(minutes=50), 80),
+        reading("p2", HOUR + timedelta(minutes=5), 90),
+        reading("p1", HOUR + timedelta(minutes=70), 81),
+        reading("p1", HOUR + timedelta(minutes=10), 82),
+    ]
+
+    async def run() -> list[dict]:
+        batch_id = ObjectId()
+        if await vitals._push_to_buckets(docs, batch_id):
+            raise AssertionError("Bucket writes failed")
+        # A retried flush replays the same rows under the same batch id.
+        if await vitals._push_to_buckets(docs, batch_id):
+            raise AssertionError("A replayed batch must not be reported as failed")
+        later = [reading("p1", HOUR + timedelta(minutes=20), 83)]
+        await vitals._push_to_buckets(later)
+        return await vitals.buckets_col.find().sort("_id", 1).to_list(None)
+
+    buckets = asyncio.run(run())
+    summary = [
+        (b["patient_id"], b["start"], b["count"], b["heart_rate"]) for b in buckets
+    ]
+    expected = [
+        ("p1", HOUR, 3, [80, 82, 83]),
+        ("p1", HOUR + timedelta(hours=1), 1, [81]),
+        ("p2", HOUR, 1, [90]),
+    ]
+    if summary != expected:
+        raise AssertionError(f"Unexpected buckets: {summary}")
+    for bucket in buckets:
+        lengths = {len(bucket[c]) for c in vitals.BUCKET_COLUMNS}
+        if lengths != {bucket["count"]}:
+            raise AssertionError(f"Bucket columns out of step: {bucket['_id']}")
+    if buckets[0]["first"] != HOUR + timedelta(minutes=10):
+        raise AssertionError("first must be the earliest reading in the bucket")
+
+
+def test_bucket_pages_unpack_newest_first_across_buckets(vitals):
+    times = [HOUR + timedelta(minutes=15 * i) for i in range(9)]
+    # Two readings share a timestamp; position in the bucket breaks the tie.
+    times.append(times[3])
+    docs = [reading("p1", t, 60 + i) for i, t in enumerate(times)]
+
+    async def run() -> list[dict]:
+        await vitals._push_to_buckets(docs)
+        transport = httpx.ASGITransport(app=vitals.app)
+        pages: list[dict] = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://v") as c:
+            params = {"limit": 3}
+            while True:
+                resp = await c.get("/vitals/p1", params=params)
+                resp.raise_for_status()
+                pages.extend(resp.json())
+                cursor = resp.headers.get(vitals.NEXT_CURSOR_HEADER)
+                if not cursor:
+                    return pages
+                params = {"limit": 3, "cursor": cursor}
+
+    rows = asyncio.run(run())
+    got = [(row["recorded_at"], row["heart_rate"]) for row in rows]
+    expected = sorted(
+        ((t.isoformat(), 60.0 + i) for i, t in enumerate(times)), reverse=True
+    )
+    if got != expected:
+        raise AssertionError(f"Pages lost, repeated or misordered readings: {got}")
+
+
+def test_bucket_batch_ids_stay_capped(vitals):
+    async def run() -> dict:
+        for i in range(vitals.RECENT_BATCHES + 5):
+            await vitals._push_to_buckets(
+                [reading("p1", HOUR + timedelta(seconds=i), 80)]
+            )
+        return await vitals.buckets_col.find_one()
+
+    bucket = asyncio.run(run())
+    if bucket["count"] != vitals.RECENT_BATCHES + 5:
+        raise AssertionError(f"Every distinct batch must be stored: {bucket['count']}")
+    if len(bucket["batches"]) != vitals.RECENT_BATCHES:
+        raise AssertionError(f"Batch ids must be capped: {len(bucket['batches'])}")
@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+
+
+def test_ndjson_bulk_reports_bad_lines_and_stores_the_rest(load_service, monkeypatch):
+    vitals = load_service("vitals")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(vitals, "vitals_col", db["vitals"])
+    monkeypatch.setattr(vitals.settings, "storage_mode", "document")
+    row = {
+        "patient_id": "p1",
+        "heart_rate": 80,
+        "respiratory_rate": 16,
+        "systolic_bp": 120,
+        "diastolic_bp": 80,
+        "spo2": 98,
+        "temperature_c": 37.0,
+    }
+    lines = [json.dumps(row), '{"patient_id": "p1", "heart', "", json.dumps(row)]
+    lines.append(json.dumps({"patient_id": "p1"}))
+
+    async def run() -> tuple[dict, int]:
+        transport = httpx.ASGITransport(app=vitals.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://v") as c:
+            resp = await c.post(
+                "/vitals/bulk",
+                content="\n".join(lines).encode(),
+                headers={"content-type": "application/x-ndjson"},
+            )
+        resp.raise_for_status()
+        return resp.json(), await vitals.vitals_col.count_documents({})
+
+    result, stored = asyncio.run(run())
+    if (result["received"], result["inserted"], result["rejected"]) != (4, 2, 2):
+        raise AssertionError(f"Unexpected counts: {result}")
+    torn, invalid = result["errors"]
+    if torn["index"] != 1 or torn["errors"][0]["loc"] != ["line", 2]:
+        raise AssertionError(f"Torn line must be reported with its line: {torn}")
+    if invalid["index"] != 3 or stored != 2:
+        raise AssertionError(f"Valid rows must still be stored: {result}, {stored}")
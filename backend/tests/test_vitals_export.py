@@ -0,0 +1,100 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.streaming import proxy_stream
+
+START = datetime(2026, 1, 1, 10)
+
+
+@pytest.fixture(params=["document", "bucket"])
+def vitals(request, load_service, monkeypatch):
+    module = load_service("vitals")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(module, "vitals_col", db["vitals"])
+    monkeypatch.setattr(module, "buckets_col", db["vitals_buckets"])
+    monkeypatch.setattr(module.settings, "storage_mode", request.param)
+    # Smaller than the export so rows straddle several chunks.
+    monkeypatch.setattr(module.settings, "stream_batch_size", 2)
+    return module
+
+
+def _reading(i: int) -> dict:
+    return {
+        "patient_id": "p1",
+        "heart_rate": 70.0 + i,
+        "respiratory_rate": 16.0,
+        "systolic_bp": 120.0,
+        "diastolic_bp": 80.0,
+        "spo2": 98.0,
+        "temperature_c": 37.0,
+        "device_id": None,
+        "recorded_at": START + timedelta(seconds=i),
+    }
+
+
+LATER = "2027-01-01T00:00:00"
+EXPORTS: dict[str, dict[str, str | int]] = {
+    "ndjson": {"format": "ndjson"},
+    "array": {"format": "json-stream"},
+    "limited": {"format": "ndjson", "limit": 3},
+    "empty_ndjson": {"format": "ndjson", "since": LATER},
+    "empty_array": {"format": "json-stream", "since": LATER},
+}
+
+
+async def _export(module, params: dict[str, str | int]) -> httpx.Response:
+    transport = httpx.ASGITransport(app=module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://v") as c:
+        return await c.get("/vitals/p1", params=params)
+
+
+def test_ndjson_and_json_stream_frame_every_reading(vitals):
+    async def run() -> dict[str, httpx.Response]:
+        if await vitals._insert_vitals([_reading(i) for i in range(5)]):
+            raise AssertionError("Seeding readings failed")
+        return {name: await _export(vitals, params) for name, params in EXPORTS.items()}
+
+    got = asyncio.run(run())
+    if not got["ndjson"].headers["content-type"].startswith("application/x-ndjson"):
+        raise AssertionError(f"NDJSON media type: {got['ndjson'].headers}")
+    newest_first = [74.0, 73.0, 72.0, 71.0, 70.0]
+    lines = got["ndjson"].text.split("\n")
+    if (
+        lines[-1] != ""
+        or [json.loads(x)["heart_rate"] for x in lines[:-1]] != newest_first
+    ):
+        raise AssertionError(f"One newest-first reading per line: {lines}")
+    if [r["heart_rate"] for r in got["array"].json()] != newest_first:
+        raise AssertionError(f"json-stream must be one JSON array: {got['array'].text}")
+    if got["limited"].text.count("\n") != 3:
+        raise AssertionError(f"limit must cap the export: {got['limited'].text}")
+    if got["empty_ndjson"].text != "" or got["empty_array"].json() != []:
+        raise AssertionError("Empty exports must still be well-formed")
+
+
+def test_gateway_proxies_export_bytes_unchanged():
+    body = b'{"heart_rate": 80}\n{"heart_rate": 81}\n'
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        headers = {"content-type": "application/x-ndjson"}
+        return httpx.Response(200, headers=headers, content=body)
+
+    async def run() -> bytes:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, base_url="http://v") as c:
+            response = await proxy_stream(c, "/vitals/p1", {"format": "ndjson"})
+            chunks = [chunk async for chunk in response.body_iterator]
+        if not all(isinstance(chunk, bytes) for chunk in chunks):
+            raise AssertionError(f"Proxy must pass raw bytes through: {chunks!r}")
+        return b"".join(chunk for chunk in chunks if isinstance(chunk, bytes))
+
+    streamed = asyncio.run(run())
+    if streamed != body or seen[0].url.params.get("format") != "ndjson":
+        raise AssertionError(f"Proxy altered the stream: {streamed!r}")
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from app.models.domain import VitalsPayload
+from app.routers import vitals as vitals_router
+from app.services.pipeline import BrokerFull
+
+
+class RecordingPipeline:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.submitted: list[VitalsPayload] = []
+
+    async def submit(self, vitals: VitalsPayload) -> None:
+        if len(self.submitted) >= self.capacity:
+            raise BrokerFull("full")
+        self.submitted.append(vitals)
+
+
+def row(patient_id: str) -> dict:
+    return {
+        "patient_id": patient_id,
+        "heart_rate": 80,
+        "respiratory_rate": 16,
+        "systolic_bp": 120,
+        "diastolic_bp": 80,
+        "spo2": 98,
+        "temperature_c": 37.0,
+    }
+
+
+def test_bulk_ingest_queues_only_rows_the_service_stored(monkeypatch):
+    pipeline = RecordingPipeline(capacity=10)
+    monkeypatch.setattr(vitals_router, "get_pipeline", lambda: pipeline)
+    lines = [json.dumps(row("p0")), "{torn", "", json.dumps({"patient_id": "p2"})]
+    lines.append(json.dumps(row("p3")))
+    body = "\n".join(lines).encode()
+    result = {"errors": [{"index": 1}, {"index": 2}]}
+
+    asyncio.run(vitals_router._submit_accepted(body, "application/x-ndjson", result))
+    if [v.patient_id for v in pipeline.submitted] != ["p0", "p3"]:
+        raise AssertionError(f"Unexpected submissions: {pipeline.submitted}")
+
+    full = RecordingPipeline(capacity=1)
+    monkeypatch.setattr(vitals_router, "get_pipeline", lambda: full)
+    body = json.dumps([row("a"), row("b"), row("c")]).encode()
+    asyncio.run(vitals_router._submit_accepted(body, "application/json", {}))
+    if [v.patient_id for v in full.submitted] != ["a"]:
+        raise AssertionError("A full pipeline must not fail the bulk ingest")
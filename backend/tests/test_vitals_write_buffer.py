@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from bson.errors import InvalidDocument
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect
+
+
+def reading(i: int) -> dict:
+    return {
+        "patient_id": f"p{i}",
+        "heart_rate": 80.0,
+        "respiratory_rate": 16.0,
+        "systolic_bp": 120.0,
+        "diastolic_bp": 80.0,
+        "spo2": 98.0,
+        "temperature_c": 37.0,
+    }
+
+
+@pytest.fixture
+def vitals(load_service, monkeypatch):
+    module = load_service("vitals")
+    db = AsyncMongoMockClient()["sentinelcare"]
+    monkeypatch.setattr(module, "vitals_col", db["vitals"])
+    monkeypatch.setattr(module.settings, "storage_mode", "document")
+    return module
+
+
+def buffer(vitals, **overrides):
+    options = dict(
+        max_queue=100, batch_size=100, flush_ms=10_000, enqueue_timeout_ms=10
+    )
+    return vitals.VitalsWriteBuffer(**{**options, **overrides})
+
+
+def test_buffer_flushes_full_batches_without_waiting_for_the_timer(vitals):
+    wb = buffer(vitals, batch_size=3, flush_ms=500)
+
+    async def run() -> int:
+        wb.start()
+        for i in range(3):
+            await wb.put(reading(i))
+        await asyncio.sleep(0.05)
+        stored = await vitals.vitals_col.count_documents({})
+        await wb.stop()
+        return stored
+
+    if asyncio.run(run()) != 3 or wb.flushed_batches != 1:
+        raise AssertionError(f"A full batch must flush at once: {wb.stats()}")
+
+
+def test_buffer_flushes_partial_batches_on_the_timer(vitals):
+    wb = buffer(vitals, flush_ms=20)
+
+    async def run() -> int:
+        wb.start()
+        await wb.put(reading(0))
+        await wb.put(reading(1))
+        await asyncio.sleep(0.2)
+        stored = await vitals.vitals_col.count_documents({})
+        await wb.stop()
+        return stored
+
+    if asyncio.run(run()) != 2 or wb.flushed_batches != 1:
+        raise AssertionError(f"A partial batch must flush after flush_ms: {wb.stats()}")
+
+
+def test_buffer_pushes_back_when_full(vitals):
+    wb = buffer(vitals, max_queue=2)
+
+    async def run() -> list[bool]:
+        # No flusher: the queue only fills.
+        return [await wb.put(reading(i)) for i in range(3)]
+
+    if asyncio.run(run()) != [True, True, False] or wb.rejected_rows != 1:
+        raise AssertionError(
+            f"A full queue must reject after the timeout: {wb.stats()}"
+        )
+
+
+def test_buffer_flushes_everything_on_stop(vitals):
+    wb = buffer(vitals, batch_size=4)
+
+    async def run() -> int:
+        wb.start()
+        for i in range(10):
+            await wb.put(reading(i))
+        await wb.stop()
+        return await vitals.vitals_col.count_documents({})
+
+    if asyncio.run(run()) != 10 or wb.stats()["queued"] != 0:
+        raise AssertionError(f"stop() must drain the queue: {wb.stats()}")
+
+
+def test_buffer_survives_unexpected_errors_and_counts_replays_once(vitals, monkeypatch):
+    wb = buffer(vitals, flush_ms=10)
+    insert_many = vitals.vitals_col.insert_many
+    calls = []
+
+    async def flaky_insert_many(docs, ordered=True):
+        calls.append(len(docs))
+        if len(calls) == 1:
+            raise InvalidDocument("cannot encode object")
+        if len(calls) == 2:
+            # Stored, but the acknowledgement was lost.
+            await insert_many(docs, ordered=ordered)
+            raise AutoReconnect("connection reset")
+        return await insert_many(docs, ordered=ordered)
+
+    monkeypatch.setattr(vitals.vitals_col, "insert_many", flaky_insert_many)
+
+    async def run() -> int:
+        wb.start()
+        await wb.put(reading(0))
+        await asyncio.sleep(0.1)
+        await wb.put(reading(1))
+        await wb.put(reading(2))
+        await asyncio.sleep(0.3)
+        await wb.stop()
+        return await vitals.vitals_col.count_documents({})
+
+    stored = asyncio.run(run())
+    stats = wb.stats()
+    if stored != 2 or stats["flushed_rows"] != 2 or stats["failed_rows"] != 1:
+        raise AssertionError(f"Unexpected buffer stats after errors: {stored} {stats}")
@@ -12,7 +12,10 @@ export function getToken() {
   return token;
 }
 
-async function request(path, options = {}) {
+// List endpoints return one page per call (the services cap it at 1000).
+const PAGE_SIZE = 1000;
+
+async function send(path, options = {}) {
   const res = await fetch(`${API_BASE}${path}`, {
     ...options,
     headers: {
@@ -25,7 +28,28 @@ async function request(path, options = {}) {
     const detail = await res.text();
     throw new Error(`API ${res.status}: ${detail}`);
   }
-  return res.json();
+  return res;
+}
+
+async function request(path, options = {}) {
+  return (await send(path, options)).json();
+}
+
+// Follows X-Next-Cursor until the last page, so lists are never cut short.
+async function requestAll(path, params = {}) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const query = new URLSearchParams({
+      ...params,
+      limit: PAGE_SIZE,
+      ...(cursor ? { cursor } : {}),
+    });
+    const res = await send(`${path}?${query}`);
+    rows.push(...(await res.json()));
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return rows;
 }
 
 export const api = {
@@ -43,8 +67,54 @@ export const api = {
     setToken(data.access_token);
     return data;
   },
-  fetchAlerts: () => request("/alerts"),
-  fetchPatients: () => request("/patients"),
+  fetchAlerts: () => requestAll("/alerts"),
+  // EventSource cannot send an Authorization header, and a token in the URL
+  // ends up in access logs, so the SSE stream is read with fetch instead.
+  // Like EventSource, it reconnects and resumes with Last-Event-ID.
+  subscribeAlerts: (onAlert) => {
+    const controller = new AbortController();
+    let lastEventId = null;
+    const follow = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const res = await fetch(`${API_BASE}/alerts/stream`, {
+            headers: {
+              Accept: "text/event-stream",
+              ...(token ? { Authorization: `Bearer ${token}` } : {}),
+              ...(lastEventId ? { "Last-Event-ID": lastEventId } : {}),
+            },
+            signal: controller.signal,
+          });
+          if (!res.ok || !res.body) throw new Error(`API ${res.status}`);
+          const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = "";
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            const frames = buffer.split("\n\n");
+            buffer = frames.pop();
+            for (const frame of frames) {
+              let data = null;
+              for (const line of frame.split("\n")) {
+                if (line.startsWith("id:")) lastEventId = line.slice(3).trim();
+                else if (line.startsWith("data:")) data = line.slice(5).trim();
+              }
+              if (data) onAlert(JSON.parse(data));
+            }
+          }
+        } catch {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+      }
+    };
+    follow();
+    return () => controller.abort();
+  },
+  // Pages come back in id order; show patients by name instead.
+  fetchPatients: async () =>
+    (await requestAll("/patients")).sort((a, b) => a.name.localeCompare(b.name)),
   createPatient: (payload) =>
     request("/patients", { method: "POST", body: JSON.stringify(payload) }),
   updatePatientMonitoring: (patientId, isMonitoring) =>
@@ -52,7 +122,7 @@ export const api = {
       method: "PATCH",
     }),
   fetchTasks: (params = {}) =>
-    request(`/tasks${params.patient_id ? `?patient_id=${params.patient_id}` : ""}`),
+    requestAll("/tasks", params.patient_id ? { patient_id: params.patient_id } : {}),
   createTask: (payload) =>
     request("/tasks", { method: "POST", body: JSON.stringify(payload) }),
   updateTask: (taskId, payload) =>
@@ -67,7 +137,7 @@ export const api = {
       body: JSON.stringify(payload),
     }),
   simulate: ({ patient_id, risk }) =>
-    request(`/simulate/run?patient_id=${patient_id}&risk=${risk}`, {
+    request(`/simulate/run?patient_id=${patient_id}&risk=${risk}&wait=true`, {
       method: "POST",
     }),
   health: () => request("/health"),
@@ -38,33 +38,20 @@ export function Layout({ children, onToggleTheme, themeMode, role }) {
   const [settingsAnchor, setSettingsAnchor] = useState(null);
 
   useEffect(() => {
-    let active = true;
     let flashTimeout;
-    const pollAlerts = async () => {
-      try {
-        const data = await api.fetchAlerts();
-        if (!active || !Array.isArray(data) || data.length === 0) return;
-        const newest = data.reduce((acc, cur) => {
-          if (!acc) return cur;
-          return new Date(cur.created_at) > new Date(acc.created_at) ? cur : acc;
-        }, null);
-        if (newest?.alert_id && newest.alert_id !== latestAlertIdRef.current) {
-          setAlertFlash(true);
-          flashTimeout = setTimeout(() => setAlertFlash(false), 2000);
-          latestAlertIdRef.current = newest.alert_id;
-        }
-        if (newest?.severity) {
-          setLatestAlertSeverity(newest.severity);
-        }
-      } catch (err) {
-        // ignore polling errors to avoid UI noise
+    const unsubscribe = api.subscribeAlerts((alert) => {
+      if (alert?.alert_id && alert.alert_id !== latestAlertIdRef.current) {
+        setAlertFlash(true);
+        if (flashTimeout) clearTimeout(flashTimeout);
+        flashTimeout = setTimeout(() => setAlertFlash(false), 2000);
+        latestAlertIdRef.current = alert.alert_id;
       }
-    };
-    pollAlerts();
-    const interval = setInterval(pollAlerts, 8000);
+      if (alert?.severity) {
+        setLatestAlertSeverity(alert.severity);
+      }
+    });
     return () => {
-      active = false;
-      clearInterval(interval);
+      unsubscribe();
       if (flashTimeout) clearTimeout(flashTimeout);
     };
   }, []);
@@ -16,7 +16,7 @@ async def send_vitals(client, payload):
         json=payload,
     )
     resp.raise_for_status()
-    return await resp.json()
+    return resp.json()
 
 
 async def main():
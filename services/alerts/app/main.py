@@ -1,19 +1,37 @@
+import asyncio
+import base64
+import json
+import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import AsyncIterator, Deque, List, Optional, Set, Tuple
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, BaseSettings, Field
 
+from app.core.metrics import MongoCommandMetrics, instrument
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
     mongo_db: str = "sentinelcare"
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    stream_buffer: int = 1000
+    stream_queue_size: int = 1024
+    stream_heartbeat_seconds: float = 15.0
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("alerts")]
+)
 db = client[settings.mongo_db]
 alerts_col = db["alerts"]
 
@@ -33,11 +51,13 @@ class AlertAck(BaseModel):
 
 
 app = FastAPI(title="Alerts Service", version="0.1.0")
+instrument(app, "alerts")
 
 
 @app.on_event("startup")
 async def init_db():
     await alerts_col.create_index("alert_id", unique=True)
+    await alerts_col.create_index([("created_at", -1), ("alert_id", -1)])
     if await alerts_col.estimated_document_count() == 0:
         seed = [
             Alert(
@@ -64,18 +84,161 @@ def _doc_to_alert(doc: dict) -> Alert:
     return Alert(**doc)
 
 
+def _encode_cursor(created_at: datetime, alert_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), alert_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, alert_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(alert_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _projection(fields: Optional[str]) -> Optional[dict]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(Alert.__fields__)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    # Sort keys are always projected so the next cursor can be built.
+    return {f: 1 for f in requested | {"created_at", "alert_id"}}
+
+
 @app.get("/alerts", response_model=List[Alert])
-async def list_alerts() -> List[Alert]:
-    cursor = alerts_col.find({}).sort("created_at", -1)
-    return [_doc_to_alert(doc) async for doc in cursor]
+async def list_alerts(
+    response: Response,
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    query: dict = {}
+    if cursor:
+        created_at, alert_id = _decode_cursor(cursor)
+        query = {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "alert_id": {"$lt": alert_id}},
+            ]
+        }
+    projection = _projection(fields)
+    docs = (
+        await alerts_col.find(query, projection)
+        .sort([("created_at", -1), ("alert_id", -1)])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    headers = {}
+    if len(docs) == limit:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(docs[-1]["created_at"], docs[-1]["alert_id"])
+    if projection is not None:
+        for doc in docs:
+            doc.pop("_id", None)
+        return JSONResponse(jsonable_encoder(docs), headers=headers)
+    response.headers.update(headers)
+    return [_doc_to_alert(doc) for doc in docs]
+
+
+class AlertBroadcaster:
+    """
+    In-process fan-out of newly created alerts to `/alerts/stream` listeners.
+
+    Event ids are microsecond timestamps forced to increase, so a listener
+    resuming with Last-Event-ID after a restart never sees ids go backwards.
+    The last `buffer_size` events are kept for resume; a listener that falls
+    `queue_size` events behind is disconnected and expected to resume.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._last_id = 0
+        self._buffer: Deque[Tuple[int, str]] = deque(maxlen=buffer_size)
+        self._listeners: Set[asyncio.Queue] = set()
+
+    def publish(self, alert: Alert) -> None:
+        self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+        event = (self._last_id, json.dumps(jsonable_encoder(alert)))
+        self._buffer.append(event)
+        self.published += 1
+        for queue in list(self._listeners):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind: cut the listener loose; it resumes from its last id.
+                self._listeners.discard(queue)
+                self.dropped += 1
+
+    def subscribe(self, last_event_id: Optional[int]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if last_event_id is not None:
+            for event in self._buffer:
+                if event[0] > last_event_id and queue.qsize() < self.queue_size:
+                    queue.put_nowait(event)
+        self._listeners.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._listeners.discard(queue)
+
+    def is_subscribed(self, queue: asyncio.Queue) -> bool:
+        return queue in self._listeners
+
+    def stats(self) -> dict:
+        return {
+            "listeners": len(self._listeners),
+            "published": self.published,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer),
+            "last_event_id": self._last_id,
+        }
+
+
+broadcaster = AlertBroadcaster(settings.stream_buffer, settings.stream_queue_size)
 
 
 @app.post("/alerts", response_model=Alert, status_code=status.HTTP_201_CREATED)
 async def create_alert(alert: Alert) -> Alert:
     await alerts_col.insert_one({**alert.dict(), "_id": alert.alert_id})
+    broadcaster.publish(alert)
     return alert
 
 
+async def _sse_events(queue: asyncio.Queue) -> AsyncIterator[str]:
+    try:
+        while not (queue.empty() and not broadcaster.is_subscribed(queue)):
+            try:
+                event_id, data = await asyncio.wait_for(
+                    queue.get(), settings.stream_heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event_id}\nevent: alert\ndata: {data}\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+@app.get("/alerts/stream")
+async def stream_alerts(last_event_id: Optional[int] = Header(None)):
+    """Server-sent events for every alert created from now (or after Last-Event-ID)."""
+    queue = broadcaster.subscribe(last_event_id)
+    return StreamingResponse(
+        _sse_events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/alerts/stream/stats")
+async def stream_stats():
+    return broadcaster.stats()
+
+
 @app.post("/alerts/ack", response_model=AlertAck, status_code=status.HTTP_202_ACCEPTED)
 async def acknowledge_alert(ack: AlertAck) -> AlertAck:
     doc = await alerts_col.find_one({"alert_id": ack.alert_id})
@@ -1,19 +1,44 @@
+import asyncio
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import List, Optional
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Literal, Optional, Tuple
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, BaseSettings, Field
+from pymongo.errors import BulkWriteError
+
+from app.core.metrics import MongoCommandMetrics, instrument
+
+DUPLICATE_KEY = 11000
 
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
     mongo_db: str = "sentinelcare"
+    stream_batch_size: int = 500
+    bulk_max_events: int = 5000
+    segment_log_enabled: bool = False
+    segment_dir: str = "/data/audit"
+    segment_max_bytes: int = 64 * 1024 * 1024
+    segment_fsync: bool = True
+    segment_dedupe_window: int = 100_000
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("audit")]
+)
 db = client[settings.mongo_db]
 audit_col = db["audit_events"]
 hi = "hi string for changing"
@@ -36,7 +61,13 @@ class AuditCreate(BaseModel):
     detail: Optional[str] = None
 
 
+class BulkAuditResult(BaseModel):
+    inserted: int
+    duplicates: int
+
+
 app = FastAPI(title="Audit Service", version="0.1.0")
+instrument(app, "audit")
 
 
 @app.on_event("startup")
@@ -51,19 +82,374 @@ def _doc_to_event(doc: dict) -> AuditEvent:
     return AuditEvent(**doc)
 
 
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _stream_docs(cursor, array: bool) -> AsyncIterator[bytes]:
+    """Serialise a Motor cursor batch by batch instead of materialising it."""
+    if array:
+        yield b"["
+    chunk: List[str] = []
+    first = True
+    async for doc in cursor:
+        doc.pop("_id", None)
+        line = json.dumps(doc, default=_json_default)
+        if array:
+            chunk.append(line if first else "," + line)
+        else:
+            chunk.append(line + "\n")
+        first = False
+        if len(chunk) >= settings.stream_batch_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+    if array:
+        yield b"]"
+
+
+def _next_chunk(records: Iterator[bytes], size: int) -> List[bytes]:
+    return list(islice(records, size))
+
+
+async def _stream_records(records: Iterator[bytes], array: bool) -> AsyncIterator[bytes]:
+    """Stream segment log records, pulling each chunk off the event loop."""
+    if array:
+        yield b"["
+    first = True
+    while True:
+        chunk = await asyncio.to_thread(_next_chunk, records, settings.stream_batch_size)
+        if not chunk:
+            break
+        if array:
+            body = b",".join(line.rstrip(b"\n") for line in chunk)
+            yield body if first else b"," + body
+        else:
+            yield b"".join(chunk)
+        first = False
+    if array:
+        yield b"]"
+
+
+# One index entry per record: created_at (µs since epoch), byte offset, length.
+INDEX_ENTRY = struct.Struct("<qQI")
+
+
+def _epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+class Segment:
+    """
+    One append-only NDJSON data file plus its fixed-width time index.
+
+    Records are appended in arrival order, which is not strictly `created_at`
+    order (the gateway stamps events before batching them), so the index is
+    dense rather than sparse and a range scan filters every entry. At 20
+    bytes per record that is still far cheaper than reading the data.
+    """
+
+    def __init__(self, seq: int, directory: Path):
+        self.seq = seq
+        self.data_path = directory / f"{seq:010d}.log"
+        self.index_path = directory / f"{seq:010d}.idx"
+        self.size = 0
+        self.records = 0
+        self.min_ts: Optional[int] = None
+        self.max_ts: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._map_lock = threading.Lock()
+
+    def recover(self) -> None:
+        """Load bounds from the index and cut off a torn tail from a crash."""
+        index = self.index_path.read_bytes() if self.index_path.exists() else b""
+        usable = len(index) - len(index) % INDEX_ENTRY.size
+        entries = list(INDEX_ENTRY.iter_unpack(index[:usable]))
+        size = entries[-1][1] + entries[-1][2] if entries else 0
+        if usable != len(index):
+            os.truncate(self.index_path, usable)
+        if self.data_path.exists() and self.data_path.stat().st_size != size:
+            os.truncate(self.data_path, size)
+        self.size = size
+        self.records = len(entries)
+        self._track(ts for ts, _, _ in entries)
+
+    def append(self, lines: List[bytes], stamps: List[int], fsync: bool) -> None:
+        index = bytearray()
+        offset = self.size
+        for line, ts in zip(lines, stamps, strict=True):
+            index += INDEX_ENTRY.pack(ts, offset, len(line))
+            offset += len(line)
+        # Data first: an index entry must never point past the data file.
+        for path, payload in ((self.data_path, b"".join(lines)), (self.index_path, index)):
+            with open(path, "ab") as fh:
+                fh.write(payload)
+                if fsync:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+        self.size = offset
+        self.records += len(lines)
+        self._track(stamps)
+
+    def overlaps(self, since_us: int, until_us: int) -> bool:
+        return self.records > 0 and self.max_ts >= since_us and self.min_ts < until_us
+
+    def entries(self) -> List[Tuple[int, int, int]]:
+        """Every index entry, in append order."""
+        if not self.records:
+            return []
+        with open(self.index_path, "rb") as fh:
+            index = fh.read(self.records * INDEX_ENTRY.size)
+        return list(INDEX_ENTRY.iter_unpack(index))
+
+    def scan(self, since_us: int, until_us: int) -> List[Tuple[int, int, int]]:
+        """Index entries with since <= created_at < until, newest first."""
+        hits = [e for e in self.entries() if since_us <= e[0] < until_us]
+        hits.sort(key=lambda e: e[0], reverse=True)
+        return hits
+
+    def read(self, offset: int, length: int) -> bytes:
+        with self._map_lock:
+            # The active segment grows; remap once a record lies past the mapping.
+            if self._map is None or len(self._map) < offset + length:
+                self._unmap()
+                with open(self.data_path, "rb") as fh:
+                    self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[offset : offset + length]
+
+    def close(self) -> None:
+        with self._map_lock:
+            self._unmap()
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _track(self, stamps) -> None:
+        for ts in stamps:
+            self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+            self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+
+
+class SegmentLog:
+    """
+    Local append-only audit store used instead of MongoDB when enabled.
+
+    Writes append one batch to the active segment and rotate to a new one
+    past `max_bytes`. Reads pick segments by their in-memory time bounds,
+    scan their indexes and copy the matching records out of a read-only
+    mmap, so recent reads stay in the page cache and never parse the rest
+    of the log. Ids of the last `dedupe_window` events, across segments and
+    restarts, are remembered so a batch replayed from the gateway's spool is
+    not stored twice.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, fsync: bool, dedupe_window: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.dedupe_window = dedupe_window
+        self.segments: List[Segment] = []
+        self._recent_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        seqs = sorted(int(p.stem) for p in self.directory.glob("*.log"))
+        self.segments = [Segment(seq, self.directory) for seq in seqs]
+        for segment in self.segments:
+            segment.recover()
+        if not self.segments:
+            self.segments.append(Segment(0, self.directory))
+        self._load_recent_ids()
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+
+    async def append(self, events: List[AuditEvent]) -> Tuple[int, int]:
+        """Append events not seen recently; returns (inserted, duplicates)."""
+        async with self._lock:
+            fresh = [e for e in events if e.id not in self._recent_ids]
+            if fresh:
+                await asyncio.to_thread(self._write, fresh)
+                for event in fresh:
+                    self._remember(event.id)
+            return len(fresh), len(events) - len(fresh)
+
+    def query(
+        self, since: Optional[datetime], until: Optional[datetime], limit: Optional[int]
+    ) -> Iterator[bytes]:
+        """Yield raw NDJSON records in `created_at` descending order."""
+        since_us = _epoch_us(since) if since else -(2**63)
+        until_us = _epoch_us(until) if until else 2**63 - 1
+        candidates = [s for s in self.segments if s.overlaps(since_us, until_us)]
+        candidates.sort(key=lambda s: s.max_ts, reverse=True)
+        hits: List[Tuple[int, Segment, int, int]] = []
+        for segment in candidates:
+            # Segments are visited by newest record; once `limit` hits are newer
+            # than everything left, older segments cannot contribute.
+            if limit and len(hits) >= limit and segment.max_ts < hits[limit - 1][0]:
+                break
+            for ts, offset, length in segment.scan(since_us, until_us):
+                hits.append((ts, segment, offset, length))
+            hits.sort(key=lambda h: h[0], reverse=True)
+        for _, segment, offset, length in hits[:limit] if limit else hits:
+            yield segment.read(offset, length)
+
+    def stats(self) -> dict:
+        return {
+            "segments": len(self.segments),
+            "records": sum(s.records for s in self.segments),
+            "bytes": sum(s.size for s in self.segments),
+            "active_segment": self.segments[-1].seq if self.segments else None,
+        }
+
+    def _write(self, events: List[AuditEvent]) -> None:
+        active = self.segments[-1]
+        if active.size >= self.max_bytes:
+            active.close()
+            active = Segment(active.seq + 1, self.directory)
+            self.segments.append(active)
+        lines = [(json.dumps(e.dict(), default=_json_default) + "\n").encode() for e in events]
+        active.append(lines, [_epoch_us(e.created_at) for e in events], self.fsync)
+
+    def _load_recent_ids(self) -> None:
+        """Remember the last `dedupe_window` appended ids, newest segments first."""
+        chunks: List[Tuple[Segment, List[Tuple[int, int, int]]]] = []
+        wanted = self.dedupe_window
+        for segment in reversed(self.segments):
+            if wanted <= 0:
+                break
+            entries = segment.entries()[-wanted:]
+            chunks.append((segment, entries))
+            wanted -= len(entries)
+        for segment, entries in reversed(chunks):
+            for _, offset, length in entries:
+                self._remember(json.loads(segment.read(offset, length))["id"])
+            if segment is not self.segments[-1]:
+                segment.close()
+
+    def _remember(self, event_id: str) -> None:
+        self._recent_ids[event_id] = None
+        if len(self._recent_ids) > self.dedupe_window:
+            self._recent_ids.popitem(last=False)
+
+
+segment_log = SegmentLog(
+    directory=Path(settings.segment_dir),
+    max_bytes=settings.segment_max_bytes,
+    fsync=settings.segment_fsync,
+    dedupe_window=settings.segment_dedupe_window,
+)
+
+
+@app.on_event("startup")
+async def open_segment_log():
+    if settings.segment_log_enabled:
+        await asyncio.to_thread(segment_log.open)
+        logger.info(f"Audit segment log ready: {segment_log.stats()}")
+
+
+@app.on_event("shutdown")
+async def close_segment_log():
+    segment_log.close()
+
+
 @app.get("/audit", response_model=List[AuditEvent])
-async def list_events(limit: int = 100) -> List[AuditEvent]:
-    cursor = audit_col.find({}).sort("created_at", -1).limit(limit)
-    return [_doc_to_event(doc) async for doc in cursor]
+async def list_events(
+    limit: Optional[int] = Query(None, ge=1),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Literal["json", "ndjson", "json-stream"] = "json",
+):
+    query: dict = {}
+    if since or until:
+        query["created_at"] = {}
+        if since:
+            query["created_at"]["$gte"] = since
+        if until:
+            query["created_at"]["$lt"] = until
+    if settings.segment_log_enabled:
+        records = segment_log.query(since, until, limit if format != "json" else limit or 100)
+        if format != "json":
+            return StreamingResponse(
+                _stream_records(records, format == "json-stream"),
+                media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+            )
+        lines = await asyncio.to_thread(list, records)
+        return [AuditEvent(**json.loads(line)) for line in lines]
+
+    find = audit_col.find(query).sort("created_at", -1)
+
+    if format != "json":
+        # Streams are exports: unbounded unless the caller asks for a limit.
+        if limit:
+            find = find.limit(limit)
+        return StreamingResponse(
+            _stream_docs(find.batch_size(settings.stream_batch_size), format == "json-stream"),
+            media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+        )
+
+    find = find.limit(limit or 100)
+    return [_doc_to_event(doc) async for doc in find]
 
 
 @app.post("/audit", response_model=AuditEvent, status_code=status.HTTP_201_CREATED)
 async def create_event(payload: AuditCreate) -> AuditEvent:
     event = AuditEvent(**payload.dict())
+    if settings.segment_log_enabled:
+        await segment_log.append([event])
+        return event
     await audit_col.insert_one({**event.dict(), "_id": event.id})
     return event
 
 
+@app.post("/audit/bulk", response_model=BulkAuditResult)
+async def create_events_bulk(events: List[AuditEvent]) -> BulkAuditResult:
+    """
+    Store a batch of events emitted by the gateway's audit sink.
+
+    Events carry their own `id` and `created_at`, so a batch replayed from
+    the sender's disk spool is idempotent: ids already stored are counted as
+    duplicates instead of failing the request.
+    """
+    if len(events) > settings.bulk_max_events:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.bulk_max_events} events per request"
+        )
+    if not events:
+        return BulkAuditResult(inserted=0, duplicates=0)
+    if settings.segment_log_enabled:
+        inserted, duplicates = await segment_log.append(events)
+        return BulkAuditResult(inserted=inserted, duplicates=duplicates)
+    try:
+        result = await audit_col.insert_many(
+            [{**event.dict(), "_id": event.id} for event in events], ordered=False
+        )
+        return BulkAuditResult(inserted=len(result.inserted_ids), duplicates=0)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        duplicates = sum(1 for err in errors if err.get("code") == DUPLICATE_KEY)
+        if duplicates != len(errors):
+            logger.error(f"Audit bulk insert failed: {errors[:3]}")
+            raise HTTPException(status_code=500, detail="Audit bulk insert failed") from exc
+        return BulkAuditResult(inserted=exc.details.get("nInserted", 0), duplicates=duplicates)
+
+
+@app.get("/audit-log/stats")
+async def audit_log_stats():
+    if not settings.segment_log_enabled:
+        raise HTTPException(status_code=404, detail="Segment log is disabled")
+    return segment_log.stats()
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
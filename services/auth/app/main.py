@@ -9,6 +9,8 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel, BaseSettings, Field
 
+from app.core.metrics import instrument
+
 
 class Settings(BaseSettings):
     auth_secret: str = Field("super-secret-demo-key", env="AUTH_SECRET")
@@ -66,6 +68,7 @@ seed_users: List[User] = [
 users_by_username = {u.username: u for u in seed_users}
 
 app = FastAPI(title="Auth Service", version="0.1.0")
+instrument(app, "auth")
 
 app.add_middleware(
     CORSMiddleware,
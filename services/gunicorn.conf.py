@@ -0,0 +1,26 @@
+"""
+Gunicorn hooks for the multi-worker service images (scoring, vitals).
+
+Gunicorn loads ./gunicorn.conf.py by default, so the Dockerfiles copy this
+file next to the app. With PROMETHEUS_MULTIPROC_DIR set, each worker writes
+its metrics to files in that directory and `/metrics` sums them.
+"""
+
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    # Files left by a previous run of this container would be summed in.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drops the exited worker's live gauges (requests in flight).
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -7,6 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, BaseSettings, Field
 
+from app.core.metrics import MongoCommandMetrics, instrument
+
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
@@ -14,7 +16,9 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("notifications")]
+)
 db = client[settings.mongo_db]
 prefs_col = db["notification_prefs"]
 
@@ -38,6 +42,7 @@ class NotificationPrefsUpdate(BaseModel):
 
 
 app = FastAPI(title="Notifications Service", version="0.1.0")
+instrument(app, "notifications")
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,18 +1,42 @@
-from typing import List
+import asyncio
+import base64
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, BaseSettings, Field
+from pymongo.errors import PyMongoError
+
+from app.core.metrics import MongoCommandMetrics, instrument
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Pass back as `updated_since` to fetch only patients changed since this call.
+UPDATED_SINCE_HEADER = "X-Updated-Since"
 
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
     mongo_db: str = "sentinelcare"
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    directory_enabled: bool = True
+    directory_refresh_seconds: float = 30.0
+    # `updated_since` tokens trail the clock by this much, so writes still in
+    # flight (or stamped by a replica with a slightly slow clock) are re-sent
+    # rather than missed.
+    sync_grace_seconds: float = 5.0
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("patients")]
+)
 db = client[settings.mongo_db]
 patients_col = db["patients"]
 
@@ -52,11 +76,19 @@ class PatientMonitorUpdate(BaseModel):
 
 
 app = FastAPI(title="Patients Service", version="0.1.0")
+instrument(app, "patients")
 
 
 @app.on_event("startup")
 async def init_db():
     await patients_col.create_index("id", unique=True)
+    # Each list filter is an equality match followed by the keyset sort on id.
+    for field in ("assigned_to", "is_monitoring", "risk", "location", "updated_at"):
+        await patients_col.create_index([(field, 1), ("id", 1)])
+    # Patients stored before `updated_at` existed are treated as changed now.
+    await patients_col.update_many(
+        {"updated_at": {"$exists": False}}, {"$set": {"updated_at": _now()}}
+    )
     if await patients_col.estimated_document_count() == 0:
         seed = [
             Patient(
@@ -86,7 +118,13 @@ async def init_db():
                 is_monitoring=False,
             ),
         ]
-        await patients_col.insert_many([{**p.dict(by_alias=False), "_id": p.id} for p in seed])
+        await patients_col.insert_many(
+            [{**p.dict(by_alias=False), "_id": p.id, "updated_at": _now()} for p in seed]
+        )
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 def _doc_to_patient(doc: dict) -> Patient:
@@ -94,22 +132,284 @@ def _doc_to_patient(doc: dict) -> Patient:
     return Patient(**cleaned)
 
 
+def _encode_cursor(patient_id: str) -> str:
+    return base64.urlsafe_b64encode(patient_id.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _projection(fields: Optional[str]) -> Optional[dict]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    # Accept the API alias as well as the stored field name.
+    requested = {"is_monitoring" if f == "isMonitoring" else f for f in requested}
+    unknown = requested - set(Patient.__fields__)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    return {f: 1 for f in requested | {"id"}}
+
+
+def _projected_doc(doc: dict) -> dict:
+    cleaned = {k: v for k, v in doc.items() if k != "_id"}
+    if "is_monitoring" in cleaned:
+        cleaned["isMonitoring"] = cleaned.pop("is_monitoring")
+    return cleaned
+
+
+def _filters(
+    assigned_to: Optional[str],
+    include_unassigned: bool,
+    is_monitoring: Optional[bool],
+    risk: Optional[str],
+    location: Optional[str],
+) -> Dict[str, list]:
+    """Equality filters as field -> accepted values, shared by the Mongo and in-memory paths."""
+    filters: Dict[str, list] = {}
+    if assigned_to is not None:
+        filters["assigned_to"] = [assigned_to, None] if include_unassigned else [assigned_to]
+    if is_monitoring is not None:
+        filters["is_monitoring"] = [is_monitoring]
+    if risk is not None:
+        filters["risk"] = [risk]
+    if location is not None:
+        filters["location"] = [location]
+    return filters
+
+
+def _matches(doc: dict, filters: Dict[str, list]) -> bool:
+    return all(doc.get(field) in values for field, values in filters.items())
+
+
+def _apply_projection(doc: dict, projection: Optional[dict]) -> dict:
+    if projection is None:
+        return doc
+    return {k: v for k, v in doc.items() if k in projection}
+
+
+class PatientDirectory:
+    """
+    In-memory copy of the patients collection indexed by id and assignee.
+
+    Kept warm from a MongoDB change stream when the deployment supports one
+    (replica set / Atlas); on a standalone server it falls back to reloading
+    the collection every `refresh_seconds`. Writes made through this service
+    are applied immediately either way.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.mode = "loading"
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.ready = False
+        self._by_id: Dict[str, dict] = {}
+        self._by_assignee: Dict[Optional[str], Set[str]] = {}
+        self._sorted_ids: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def load(self) -> None:
+        docs = await patients_col.find({}, {"_id": 0}).to_list(length=None)
+        by_id = {doc["id"]: doc for doc in docs}
+        by_assignee: Dict[Optional[str], Set[str]] = {}
+        for doc in docs:
+            by_assignee.setdefault(doc.get("assigned_to"), set()).add(doc["id"])
+        self._by_id, self._by_assignee, self._sorted_ids = by_id, by_assignee, sorted(by_id)
+        self.reloads += 1
+        self.ready = True
+
+    def put(self, doc: dict) -> None:
+        doc = {k: v for k, v in doc.items() if k != "_id"}
+        old = self._by_id.get(doc["id"])
+        if old is None:
+            bisect.insort(self._sorted_ids, doc["id"])
+        else:
+            self._by_assignee.get(old.get("assigned_to"), set()).discard(doc["id"])
+        self._by_id[doc["id"]] = doc
+        self._by_assignee.setdefault(doc.get("assigned_to"), set()).add(doc["id"])
+
+    def remove(self, patient_id: str) -> None:
+        old = self._by_id.pop(patient_id, None)
+        if old is not None:
+            self._by_assignee.get(old.get("assigned_to"), set()).discard(patient_id)
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, patient_id)]
+
+    def get(self, patient_id: str) -> Optional[dict]:
+        doc = self._by_id.get(patient_id)
+        if doc is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return doc
+
+    def lookup(self, ids: Iterable[str], filters: Dict[str, list]) -> List[dict]:
+        docs = (self.get(i) for i in sorted(set(ids)))
+        return [doc for doc in docs if doc is not None and _matches(doc, filters)]
+
+    def page(self, after: Optional[str], limit: int, filters: Dict[str, list]) -> List[dict]:
+        """Keyset page over ids in ascending order, matching the Mongo path."""
+        if "assigned_to" in filters:
+            ids = sorted(
+                set().union(*(self._by_assignee.get(a, ()) for a in filters["assigned_to"]))
+            )
+        else:
+            ids = self._sorted_ids
+        start = bisect.bisect_right(ids, after) if after else 0
+        self.hits += 1
+        docs: List[dict] = []
+        for i in range(start, len(ids)):
+            doc = self._by_id[ids[i]]
+            if _matches(doc, filters):
+                docs.append(doc)
+                if len(docs) == limit:
+                    break
+        return docs
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "size": len(self._by_id),
+            "assignees": len(self._by_assignee),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._watch()
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as exc:
+                if self.mode != "ttl":
+                    logger.info(f"Patient change stream unavailable, using TTL refresh: {exc}")
+                self.mode = "ttl"
+            except Exception:
+                # An unexpected change event must not end the refresher.
+                logger.exception("Patient change stream failed; reloading")
+            try:
+                await self.load()
+            except PyMongoError as exc:
+                logger.warning(f"Patient directory reload failed: {exc}")
+            except Exception:
+                logger.exception("Patient directory reload failed")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def _watch(self) -> None:
+        async with patients_col.watch(full_document="updateLookup") as stream:
+            # Load after opening the stream so no change falls between the two.
+            await self.load()
+            self.mode = "change_stream"
+            async for change in stream:
+                if change["operationType"] == "delete":
+                    self.remove(change["documentKey"]["_id"])
+                elif change.get("fullDocument"):
+                    self.put(change["fullDocument"])
+                elif change["operationType"] in ("drop", "rename", "invalidate"):
+                    break
+
+
+directory = PatientDirectory(settings.directory_refresh_seconds)
+
+
+@app.on_event("startup")
+async def start_directory():
+    if settings.directory_enabled:
+        await directory.load()
+        directory.start()
+
+
+@app.on_event("shutdown")
+async def stop_directory():
+    await directory.stop()
+
+
 @app.get("/patients", response_model=List[Patient])
-async def list_patients() -> List[Patient]:
-    cursor = patients_col.find({})
-    return [_doc_to_patient(doc) async for doc in cursor]
+async def list_patients(
+    response: Response,
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated patient ids to look up"),
+    assigned_to: Optional[str] = None,
+    include_unassigned: bool = Query(
+        False, description="With assigned_to, also return patients nobody is assigned to"
+    ),
+    is_monitoring: Optional[bool] = Query(None, alias="isMonitoring"),
+    risk: Optional[str] = None,
+    location: Optional[str] = None,
+    updated_since: Optional[datetime] = Query(
+        None, description=f"Only patients changed since this {UPDATED_SINCE_HEADER} token"
+    ),
+):
+    sync_token = (_now() - timedelta(seconds=settings.sync_grace_seconds)).isoformat()
+    filters = _filters(assigned_to, include_unassigned, is_monitoring, risk, location)
+    query: dict = {field: {"$in": values} for field, values in filters.items()}
+    if updated_since is not None:
+        query["updated_at"] = {"$gte": updated_since}
+    id_list = [i for i in (ids or "").split(",") if i]
+    if id_list:
+        # Batched lookup: one round trip for a known set of patients, no paging.
+        if len(id_list) > settings.max_page_size:
+            raise HTTPException(
+                status_code=400, detail=f"At most {settings.max_page_size} ids per lookup"
+            )
+        query["id"] = {"$in": id_list}
+        limit = len(id_list)
+    after = _decode_cursor(cursor) if cursor and not id_list else None
+    if after:
+        query["id"] = {"$gt": after}
+    projection = _projection(fields)
+    # The directory does not index `updated_at`; change feeds read Mongo.
+    if directory.ready and updated_since is None:
+        docs = directory.lookup(id_list, filters) if id_list else directory.page(after, limit, filters)
+        docs = [_apply_projection(doc, projection) for doc in docs]
+    else:
+        docs = (
+            await patients_col.find(query, projection)
+            .sort("id", 1)
+            .limit(limit)
+            .to_list(length=limit)
+        )
+    headers = {UPDATED_SINCE_HEADER: sync_token}
+    if not id_list and len(docs) == limit:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(docs[-1]["id"])
+    if projection is not None:
+        return JSONResponse(
+            jsonable_encoder([_projected_doc(doc) for doc in docs]), headers=headers
+        )
+    response.headers.update(headers)
+    return [_doc_to_patient(doc) for doc in docs]
 
 
 @app.post("/patients", response_model=Patient, status_code=status.HTTP_201_CREATED)
 async def create_patient(payload: PatientCreate) -> Patient:
     patient = Patient(**payload.dict())
-    await patients_col.insert_one({**patient.dict(by_alias=False), "_id": patient.id})
+    doc = {**patient.dict(by_alias=False), "updated_at": _now()}
+    await patients_col.insert_one({**doc, "_id": patient.id})
+    directory.put(doc)
     return patient
 
 
 @app.get("/patients/{patient_id}", response_model=Patient)
 async def get_patient(patient_id: str) -> Patient:
-    doc = await patients_col.find_one({"id": patient_id})
+    doc = directory.get(patient_id) or await patients_col.find_one({"id": patient_id})
     if not doc:
         raise HTTPException(status_code=404, detail="Patient not found")
     return _doc_to_patient(doc)
@@ -118,14 +418,21 @@ async def get_patient(patient_id: str) -> Patient:
 @app.patch("/patients/{patient_id}/monitor", response_model=Patient)
 async def update_monitoring(patient_id: str, payload: PatientMonitorUpdate) -> Patient:
     res = await patients_col.update_one(
-        {"id": patient_id}, {"$set": {"is_monitoring": payload.is_monitoring}}
+        {"id": patient_id},
+        {"$set": {"is_monitoring": payload.is_monitoring, "updated_at": _now()}},
     )
     if res.matched_count == 0:
         raise HTTPException(status_code=404, detail="Patient not found")
     doc = await patients_col.find_one({"id": patient_id})
+    directory.put(doc)
     return _doc_to_patient(doc)
 
 
+@app.get("/patients-directory/stats")
+async def directory_stats():
+    return directory.stats()
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
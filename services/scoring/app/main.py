@@ -1,9 +1,39 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from math import exp
+from operator import mul
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Literal, Optional, Sequence
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Response
+from loguru import logger
+from pydantic import BaseModel, BaseSettings, Field
+
+from app.core.metrics import instrument
+
+
+class Settings(BaseSettings):
+    models_dir: Path = Path(__file__).resolve().parents[1] / "models" / "mock_artifacts"
+    model_glob: str = "*.json"
+    model_poll_seconds: float = 5.0
+    model_keep_versions: int = 3
+    # Trend windows cover the last `trend_window_seconds` of readings, capped at
+    # `trend_max_readings` per patient (memory grows with the ingest rate).
+    trend_window_seconds: float = 900.0
+    trend_max_readings: int = 1024
+    trend_min_samples: int = 4
+    trend_min_span_seconds: float = 60.0
+    trend_max_patients: int = 50000
+    # Read by gunicorn as well; trend windows are per worker process.
+    web_concurrency: int = 1
+
+
+settings = Settings()
 
 
 class VitalsPayload(BaseModel):
@@ -23,49 +53,578 @@ class RiskScoreResult(BaseModel):
     risk_score: float
     risk_label: str
     model_version: str
+    trend_signals: List[str] = Field(default_factory=list)
+    generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class BatchScoreResult(BaseModel):
+    """Columnar batch response: the i-th entry of each list belongs to row i."""
+
+    model_version: str
+    count: int
+    patient_id: List[str]
+    risk_score: List[float]
+    risk_label: List[str]
+    trend_signals: List[List[str]]
     generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class MockRiskModel:
-    def __init__(self, artifact_path: Path):
-        import json
+    """Logistic mock model compiled to an ordered feature index and weight array."""
 
+    def __init__(self, artifact_path: Path):
         data = json.loads(artifact_path.read_text())
+        if not isinstance(data, dict) or not isinstance(data.get("weights", {}), dict):
+            raise ValueError("artifact must be a JSON object with a weights mapping")
         self.version = data.get("version", "unknown")
         self.intercept = float(data.get("intercept", 0.0))
         self.weights = {k: float(v) for k, v in data.get("weights", {}).items()}
         self.threshold = float(data.get("threshold", 0.5))
+        self.feature_names = tuple(self.weights)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self.weight_vector = np.ascontiguousarray(
+            tuple(self.weights.values()), dtype=np.float64
+        )
+        self._weight_items = tuple(self.weights.items())
+        self._row_weights = tuple(self.weights.values())
+        # Weights on names other than payload fields (e.g. "heart_rate_slope")
+        # are read from the patient's rolling-window trend features.
+        self.trend_features = tuple(
+            name for name in self.feature_names if name not in VitalsPayload.__fields__
+        )
 
     def score(self, features: Dict[str, float]) -> tuple[float, str]:
-        import math
-
         z = self.intercept
-        for name, weight in self.weights.items():
-            z += weight * float(features.get(name, 0.0))
-        prob = 1 / (1 + math.exp(-z))
+        get = features.get
+        for name, weight in self._weight_items:
+            z += weight * float(get(name, 0.0))
+        prob = 1 / (1 + exp(-z))
+        label = "high" if prob >= self.threshold else "normal"
+        return prob, label
+
+    def score_row(self, values: Sequence[float]) -> tuple[float, str]:
+        z = self.intercept + sum(map(mul, self._row_weights, values))
+        prob = 1 / (1 + exp(-z))
         label = "high" if prob >= self.threshold else "normal"
         return prob, label
 
+    def row(
+        self, vitals: VitalsPayload, trends: Optional[Dict[str, float]] = None
+    ) -> list[float]:
+        if not self.trend_features:
+            return [getattr(vitals, name) for name in self.feature_names]
+        trends = trends or {}
+        return [
+            trends.get(name, 0.0) if name in self.trend_features else getattr(vitals, name)
+            for name in self.feature_names
+        ]
+
+    def feature_matrix(
+        self,
+        rows: List[VitalsPayload],
+        trends: Optional[List[Dict[str, float]]] = None,
+    ) -> np.ndarray:
+        """Pack rows into an (n_rows, n_features) matrix in `feature_names` order."""
+        matrix = np.empty((len(rows), len(self.feature_names)), dtype=np.float64)
+        for j, name in enumerate(self.feature_names):
+            if name in self.trend_features:
+                # Without trend data the feature is neutral rather than missing.
+                if trends is None:
+                    matrix[:, j] = 0.0
+                    continue
+                values = (t.get(name, 0.0) for t in trends)
+                matrix[:, j] = np.fromiter(values, dtype=np.float64, count=len(rows))
+                continue
+            matrix[:, j] = np.fromiter(
+                (getattr(row, name) for row in rows),
+                dtype=np.float64,
+                count=len(rows),
+            )
+        return matrix
+
+    def score_matrix(self, matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        z = matrix @ self.weight_vector + self.intercept
+        probs = 1.0 / (1.0 + np.exp(-z))
+        labels = np.where(probs >= self.threshold, "high", "normal")
+        return probs, labels
+
+
+TREND_VITALS = (
+    "heart_rate",
+    "respiratory_rate",
+    "systolic_bp",
+    "diastolic_bp",
+    "spo2",
+    "temperature_c",
+)
+TREND_LABELS = {
+    "heart_rate": "Heart rate",
+    "respiratory_rate": "Respiratory rate",
+    "systolic_bp": "Systolic BP",
+    "diastolic_bp": "Diastolic BP",
+    "spo2": "SpO2",
+    "temperature_c": "Temperature",
+}
+# Change per minute beyond which a vital is reported as trending.
+TREND_SLOPE_THRESHOLDS = np.array([2.0, 1.0, 3.0, 2.0, 0.5, 0.1])
+
+
+class RollingWindow:
+    """
+    One patient's readings from the last `span_seconds`, at most `max_readings`.
+
+    Running sums of x (minutes since `origin`), x^2, y, y^2 and xy are
+    adjusted for each reading that enters or leaves, so `push()` and the
+    mean / variance / least-squares slope are amortised O(1). Every
+    `capacity` pushes the sums are recomputed from the buffer with `origin`
+    rebased to the oldest reading, so rounding error from the running
+    add/subtract cannot build up over a long stay. The buffer starts small
+    and doubles up to `max_readings`.
+    """
+
+    __slots__ = ("span", "max_readings", "count", "head", "origin", "pushes")
+    __slots__ += ("times", "values", "sum_x", "sum_xx", "sum_y", "sum_yy", "sum_xy")
+
+    def __init__(self, span_seconds: float, max_readings: int, initial_capacity: int = 8):
+        self.span = span_seconds / 60.0
+        self.max_readings = max_readings
+        self.count = 0
+        self.head = 0
+        self.origin: Optional[float] = None
+        self.pushes = 0
+        capacity = max(1, min(initial_capacity, max_readings))
+        self.times = np.zeros(capacity)
+        self.values = np.zeros((capacity, len(TREND_VITALS)))
+        self.sum_x = 0.0
+        self.sum_xx = 0.0
+        self.sum_y = np.zeros(len(TREND_VITALS))
+        self.sum_yy = np.zeros(len(TREND_VITALS))
+        self.sum_xy = np.zeros(len(TREND_VITALS))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.times)
+
+    def _oldest(self) -> int:
+        return (self.head - self.count) % self.capacity
+
+    def _positions(self) -> np.ndarray:
+        """Buffer indices of the readings, oldest first."""
+        return (self.head - self.count + np.arange(self.count)) % self.capacity
+
+    def push(self, timestamp: float, y: np.ndarray) -> None:
+        if self.origin is None:
+            self.origin = timestamp
+        x = (timestamp - self.origin) / 60.0
+        if self.count and x < self.times[self.head - 1] - self.span:
+            return  # arrived after its place in the window had expired
+        while self.count and x - self.times[self._oldest()] > self.span:
+            self._evict()
+        if self.count == self.capacity:
+            if self.capacity < self.max_readings:
+                self._grow()
+            else:
+                self._evict()
+        self.times[self.head] = x
+        self.values[self.head] = y
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_y += y
+        self.sum_yy += y * y
+        self.sum_xy += x * y
+        self.pushes += 1
+        if self.pushes >= self.capacity:
+            self._resync()
+
+    def _evict(self) -> None:
+        oldest = self._oldest()
+        old_x, old_y = self.times[oldest], self.values[oldest]
+        self.sum_x -= old_x
+        self.sum_xx -= old_x * old_x
+        self.sum_y -= old_y
+        self.sum_yy -= old_y * old_y
+        self.sum_xy -= old_x * old_y
+        self.count -= 1
+
+    def _grow(self) -> None:
+        positions = self._positions()
+        capacity = min(self.capacity * 2, self.max_readings)
+        times, values = np.zeros(capacity), np.zeros((capacity, len(TREND_VITALS)))
+        times[: self.count] = self.times[positions]
+        values[: self.count] = self.values[positions]
+        self.times, self.values = times, values
+        self.head = self.count % capacity
+
+    def _resync(self) -> None:
+        """Rebase `origin` to the oldest reading and recompute the sums exactly."""
+        positions = self._positions()
+        shift = float(self.times[positions[0]])
+        self.times -= shift
+        self.origin += shift * 60.0
+        x, y = self.times[positions], self.values[positions]
+        self.sum_x = float(x.sum())
+        self.sum_xx = float(x @ x)
+        self.sum_y = y.sum(axis=0)
+        self.sum_yy = (y * y).sum(axis=0)
+        self.sum_xy = x @ y
+        self.pushes = 0
+
+    def stats(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-vital (mean, variance, slope per minute)."""
+        n = self.count
+        mean = self.sum_y / n
+        variance = np.maximum(self.sum_yy / n - mean * mean, 0.0)
+        denom = n * self.sum_xx - self.sum_x * self.sum_x
+        if denom <= 1e-9:
+            slope = np.zeros(len(TREND_VITALS))
+        else:
+            slope = (n * self.sum_xy - self.sum_x * self.sum_y) / denom
+        return mean, variance, slope
+
+    def span_minutes(self) -> float:
+        """Time between the oldest and newest reading in the window."""
+        if not self.count:
+            return 0.0
+        return float(self.times[self.head - 1] - self.times[self._oldest()])
+
+    def features(self) -> Dict[str, float]:
+        mean, variance, slope = self.stats()
+        features: Dict[str, float] = {"trend_samples": float(self.count)}
+        for i, name in enumerate(TREND_VITALS):
+            features[f"{name}_mean"] = float(mean[i])
+            features[f"{name}_var"] = float(variance[i])
+            features[f"{name}_slope"] = float(slope[i])
+        return features
+
+    def signals(self, min_samples: int, min_span_minutes: float) -> List[str]:
+        """Human-readable trends, e.g. "Heart rate trending upward"."""
+        # Bursts of readings seconds apart would turn noise into steep slopes.
+        if self.count < min_samples or self.span_minutes() < min_span_minutes:
+            return []
+        _, _, slope = self.stats()
+        return [
+            f"{TREND_LABELS[name]} trending {'upward' if slope[i] > 0 else 'downward'}"
+            for i, name in enumerate(TREND_VITALS)
+            if abs(slope[i]) >= TREND_SLOPE_THRESHOLDS[i]
+        ]
+
+
+class TrendStore:
+    """Per-patient rolling windows, least recently updated patients evicted first."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_readings: int,
+        max_patients: int,
+        min_samples: int,
+        min_span_seconds: float,
+    ):
+        self.window_seconds = window_seconds
+        self.max_readings = max_readings
+        self.max_patients = max_patients
+        self.min_samples = min_samples
+        self.min_span_minutes = min_span_seconds / 60.0
+        self._windows: "OrderedDict[str, RollingWindow]" = OrderedDict()
+
+    def update(self, vitals: VitalsPayload) -> RollingWindow:
+        window = self._windows.get(vitals.patient_id)
+        if window is None:
+            window = self._windows[vitals.patient_id] = RollingWindow(
+                self.window_seconds, self.max_readings
+            )
+            if len(self._windows) > self.max_patients:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(vitals.patient_id)
+        window.push(
+            vitals.recorded_at.timestamp(),
+            np.fromiter(
+                (getattr(vitals, name) for name in TREND_VITALS),
+                dtype=np.float64,
+                count=len(TREND_VITALS),
+            ),
+        )
+        return window
+
+    def signals(self, window: RollingWindow) -> List[str]:
+        return window.signals(self.min_samples, self.min_span_minutes)
 
-artifact = Path(__file__).resolve().parents[1] / "models" / "mock_artifacts" / "sepsis_mock_model.json"
-if not artifact.exists():
-    raise RuntimeError(f"Missing model artifact at {artifact}")
-model = MockRiskModel(artifact)
+    def get(self, patient_id: str) -> Optional[RollingWindow]:
+        return self._windows.get(patient_id)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class ModelRegistry:
+    """
+    Watches a models directory and hot-swaps the newest artifact.
+
+    New versions are loaded off the event loop and published with a single
+    reference assignment, so in-flight requests keep scoring against the
+    model they already hold. The last `keep` versions stay resident for
+    shadow comparison.
+    """
+
+    def __init__(self, models_dir: Path, pattern: str, keep: int):
+        self.models_dir = models_dir
+        self.pattern = pattern
+        self.keep = max(1, keep)
+        self.active: MockRiskModel | None = None
+        self.resident: "OrderedDict[str, MockRiskModel]" = OrderedDict()
+        self.reloads = 0
+        self.last_reload_ms: float | None = None
+        self.last_loaded_at: datetime | None = None
+        self.last_error: str | None = None
+        self._source: tuple[Path, float] | None = None
+        self._attempted: tuple[Path, float] | None = None
+
+    def _newest_artifact(self) -> tuple[Path, float] | None:
+        candidates = []
+        for path in self.models_dir.glob(self.pattern):
+            try:
+                candidates.append((path, path.stat().st_mtime))
+            except FileNotFoundError:
+                continue  # removed between glob and stat
+        if not candidates:
+            return None
+        return max(candidates, key=lambda item: item[1])
+
+    def _publish(self, loaded: MockRiskModel, source: tuple[Path, float], ms: float):
+        self.resident.pop(loaded.version, None)
+        self.resident[loaded.version] = loaded
+        while len(self.resident) > self.keep:
+            self.resident.popitem(last=False)
+        self.active = loaded
+        self._source = self._attempted = source
+        self.reloads += 1
+        self.last_reload_ms = ms
+        self.last_loaded_at = datetime.now(timezone.utc)
+        self.last_error = None
+
+    def load_initial(self) -> None:
+        source = self._newest_artifact()
+        if source is None:
+            raise RuntimeError(
+                f"Missing model artifact matching {self.pattern} in {self.models_dir}"
+            )
+        started = time.perf_counter()
+        loaded = MockRiskModel(source[0])
+        self._publish(loaded, source, (time.perf_counter() - started) * 1000)
+
+    async def refresh(self) -> bool:
+        source = None
+        try:
+            source = self._newest_artifact()
+            if source is None or source == self._attempted:
+                return False
+            started = time.perf_counter()
+            loaded = await asyncio.to_thread(MockRiskModel, source[0])
+        except Exception as exc:
+            # Half-written, malformed or vanished file; remember it so we retry
+            # once it changes, and keep serving the current model meanwhile.
+            if source is not None:
+                self._attempted = source
+            self.last_error = f"{source[0].name if source else self.models_dir}: {exc}"
+            logger.warning(f"Model reload failed, keeping current model: {exc}")
+            return False
+        self._publish(loaded, source, (time.perf_counter() - started) * 1000)
+        logger.info(f"Model {loaded.version} active from {source[0].name}")
+        return True
+
+    async def watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                # Hot reload must outlive any single bad poll.
+                logger.exception("Model refresh failed")
+
+    def status(self) -> dict:
+        return {
+            "active_version": self.active.version if self.active else None,
+            "resident_versions": list(self.resident),
+            "source": self._source[0].name if self._source else None,
+            "reloads": self.reloads,
+            "last_reload_ms": self.last_reload_ms,
+            "last_loaded_at": self.last_loaded_at,
+            "last_error": self.last_error,
+        }
+
+    def current(self) -> MockRiskModel:
+        if self.active is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+        return self.active
+
+
+registry = ModelRegistry(settings.models_dir, settings.model_glob, settings.model_keep_versions)
+# Loaded at import: under `gunicorn --preload` this runs once in the master
+# before the listening socket is bound, and forked workers share the loaded
+# model copy-on-write. Each worker then watches for new artifacts on its own.
+registry.load_initial()
+
+trends = TrendStore(
+    settings.trend_window_seconds,
+    settings.trend_max_readings,
+    settings.trend_max_patients,
+    settings.trend_min_samples,
+    settings.trend_min_span_seconds,
+)
 
 app = FastAPI(title="Scoring Service", version="0.1.0")
+instrument(app, "scoring")
+
+
+@app.on_event("startup")
+async def warn_per_worker_trends():
+    if settings.web_concurrency > 1:
+        logger.warning(
+            f"{settings.web_concurrency} workers: trend windows are per worker, so "
+            "each sees only the readings routed to it"
+        )
+
+
+@app.on_event("startup")
+async def start_model_watcher():
+    app.state.model_watcher = asyncio.create_task(
+        registry.watch(settings.model_poll_seconds)
+    )
+
+
+@app.on_event("shutdown")
+async def stop_model_watcher():
+    app.state.model_watcher.cancel()
+
+
+UPDATE_TRENDS = Query(
+    False,
+    description="Add the readings to the patients' trend windows; only ingest should",
+)
+
+
+def _trend_window(vitals: VitalsPayload, update: bool) -> Optional[RollingWindow]:
+    # What-if and ad-hoc scoring reads the window without adding to it.
+    return trends.update(vitals) if update else trends.get(vitals.patient_id)
 
 
 @app.post("/score", response_model=RiskScoreResult)
-async def score(vitals: VitalsPayload) -> RiskScoreResult:
-    score, label = model.score(vitals.dict())
+async def score(vitals: VitalsPayload, update_trends: bool = UPDATE_TRENDS) -> RiskScoreResult:
+    model = registry.current()
+    window = _trend_window(vitals, update_trends)
+    features = window.features() if window is not None and model.trend_features else None
+    score, label = model.score_row(model.row(vitals, features))
     return RiskScoreResult(
         patient_id=vitals.patient_id,
         risk_score=score,
         risk_label=label,
         model_version=model.version,
+        trend_signals=trends.signals(window) if window is not None else [],
+    )
+
+
+@app.post("/score/batch", response_model=BatchScoreResult)
+async def score_batch(
+    rows: List[VitalsPayload],
+    format: Literal["columnar", "ndjson"] = "columnar",
+    update_trends: bool = UPDATE_TRENDS,
+):
+    model = registry.current()
+    # Each row sees its patient's window as of that reading, as with /score.
+    features: Optional[List[Dict[str, float]]] = [] if model.trend_features else None
+    signals: List[List[str]] = []
+    for row in rows:
+        window = _trend_window(row, update_trends)
+        if features is not None:
+            features.append(window.features() if window is not None else {})
+        signals.append(trends.signals(window) if window is not None else [])
+    probs, labels = model.score_matrix(model.feature_matrix(rows, features))
+    patient_ids = [row.patient_id for row in rows]
+    generated_at = datetime.now(timezone.utc)
+    if format == "ndjson":
+        stamp = generated_at.isoformat()
+        lines = [
+            json.dumps(
+                {
+                    "patient_id": pid,
+                    "risk_score": score,
+                    "risk_label": label,
+                    "model_version": model.version,
+                    "trend_signals": trend,
+                    "generated_at": stamp,
+                }
+            )
+            for pid, score, label, trend in zip(
+                patient_ids, probs.tolist(), labels.tolist(), signals
+            )
+        ]
+        body = "\n".join(lines) + "\n" if lines else ""
+        return Response(content=body, media_type="application/x-ndjson")
+    return BatchScoreResult(
+        model_version=model.version,
+        count=len(rows),
+        patient_id=patient_ids,
+        risk_score=probs.tolist(),
+        risk_label=labels.tolist(),
+        trend_signals=signals,
+        generated_at=generated_at,
     )
 
 
+@app.post("/score/shadow", response_model=List[RiskScoreResult])
+async def score_shadow(vitals: VitalsPayload) -> List[RiskScoreResult]:
+    """Score one payload against every resident model version, newest first."""
+    results = []
+    # Shadow scoring reads the trend window without adding the reading to it.
+    window = trends.get(vitals.patient_id)
+    features = window.features() if window is not None else None
+    for model in reversed(list(registry.resident.values())):
+        score, label = model.score_row(model.row(vitals, features))
+        results.append(
+            RiskScoreResult(
+                patient_id=vitals.patient_id,
+                risk_score=score,
+                risk_label=label,
+                model_version=model.version,
+            )
+        )
+    return results
+
+
+@app.get("/trends/{patient_id}")
+async def patient_trends(patient_id: str):
+    window = trends.get(patient_id)
+    if window is None:
+        raise HTTPException(status_code=404, detail="No readings scored for patient")
+    return {
+        "patient_id": patient_id,
+        "features": window.features(),
+        "signals": trends.signals(window),
+    }
+
+
+@app.get("/models")
+async def list_models():
+    return registry.status()
+
+
+@app.post("/models/reload")
+async def reload_models():
+    reloaded = await registry.refresh()
+    return {"reloaded": reloaded, **registry.status()}
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: only route traffic to a worker that holds a model."""
+    if registry.active is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return {"status": "ready", "model_version": registry.active.version, "pid": os.getpid()}
@@ -1,10 +1,15 @@
 import asyncio
 import os
 import random
-from typing import Any, Dict, List
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 import httpx
 from fastapi import FastAPI, BackgroundTasks
+from loguru import logger
+
+from app.core.metrics import InstrumentedTransport, instrument
 
 
 APP_PORT = int(os.getenv("PORT", "8110"))
@@ -13,15 +18,28 @@ VITALS_URL = os.getenv("VITALS_SERVICE_URL", "http://vitals:8102")
 SCORING_URL = os.getenv("SCORING_SERVICE_URL", "http://scoring:8104")
 ALERTS_URL = os.getenv("ALERTS_SERVICE_URL", "http://alerts:8103")
 INTERVAL = int(os.getenv("SIM_INTERVAL_SECONDS", "30"))
+PAGE_SIZE = int(os.getenv("SIM_PAGE_SIZE", "500"))
+CONCURRENCY = int(os.getenv("SIM_CONCURRENCY", "50"))
 
 
 app = FastAPI(title="Simulator Service", version="0.1.0")
+instrument(app, "simulator")
+
+cycle_lock = asyncio.Lock()
+stats: Dict[str, Any] = {"cycles": 0, "overruns": 0, "skipped": 0, "last_cycle": None}
 
 
 async def fetch_patients(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    resp = await client.get(f"{PATIENTS_URL}/patients")
-    resp.raise_for_status()
-    return resp.json()
+    patients: List[Dict[str, Any]] = []
+    params: Dict[str, Any] = {"limit": PAGE_SIZE}
+    while True:
+        resp = await client.get(f"{PATIENTS_URL}/patients", params=params)
+        resp.raise_for_status()
+        patients.extend(resp.json())
+        next_cursor = resp.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            return patients
+        params = {"limit": PAGE_SIZE, "cursor": next_cursor}
 
 
 async def generate_for_patient(client: httpx.AsyncClient, patient: Dict[str, Any]) -> None:
@@ -34,7 +52,9 @@ async def generate_for_patient(client: httpx.AsyncClient, patient: Dict[str, Any
     vitals_resp.raise_for_status()
     vitals = vitals_resp.json()
 
-    score_resp = await client.post(f"{SCORING_URL}/score", json=vitals)
+    score_resp = await client.post(
+        f"{SCORING_URL}/score", params={"update_trends": "true"}, json=vitals
+    )
     score_resp.raise_for_status()
     score = score_resp.json()
 
@@ -49,22 +69,79 @@ async def generate_for_patient(client: httpx.AsyncClient, patient: Dict[str, Any
         )
 
 
-async def run_cycle() -> None:
-    timeout = httpx.Timeout(10.0, connect=5.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        patients = await fetch_patients(client)
-        for p in patients:
-            try:
-                await generate_for_patient(client, p)
-            except Exception:
-                continue
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+async def run_cycle() -> Optional[Dict[str, Any]]:
+    if cycle_lock.locked():
+        # Never let a trigger or a late timer overlap a cycle that is still running.
+        stats["skipped"] += 1
+        logger.warning("Simulation cycle still running; skipping overlapping start")
+        return None
+    async with cycle_lock:
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        timeout = httpx.Timeout(10.0, connect=5.0)
+        limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        transport = InstrumentedTransport(httpx.AsyncHTTPTransport(limits=limits), "simulator")
+        async with httpx.AsyncClient(timeout=timeout, transport=transport) as client:
+            patients = await fetch_patients(client)
+
+            async def simulate(patient: Dict[str, Any]) -> tuple[bool, float]:
+                async with semaphore:
+                    t0 = time.perf_counter()
+                    try:
+                        await generate_for_patient(client, patient)
+                        return True, time.perf_counter() - t0
+                    except Exception:
+                        return False, time.perf_counter() - t0
+
+            results = await asyncio.gather(*(simulate(p) for p in patients))
+
+        duration = time.perf_counter() - started
+        latencies = [elapsed for _, elapsed in results]
+        succeeded = sum(1 for ok, _ in results if ok)
+        cycle = {
+            "started_at": started_at.isoformat(),
+            "patients": len(patients),
+            "succeeded": succeeded,
+            "failed": len(patients) - succeeded,
+            "concurrency": CONCURRENCY,
+            "duration_s": round(duration, 3),
+            "patient_p50_s": round(_percentile(latencies, 0.50), 3),
+            "patient_p95_s": round(_percentile(latencies, 0.95), 3),
+            "patient_max_s": round(max(latencies, default=0.0), 3),
+            "overrun": duration > INTERVAL,
+        }
+        stats["cycles"] += 1
+        stats["last_cycle"] = cycle
+        if cycle["overrun"]:
+            stats["overruns"] += 1
+            logger.warning(
+                f"Simulation cycle took {duration:.1f}s for {len(patients)} patients, "
+                f"longer than SIM_INTERVAL_SECONDS={INTERVAL}"
+            )
+        return cycle
 
 
 async def loop_runner() -> None:
     await asyncio.sleep(5)
     while True:
-        await run_cycle()
-        await asyncio.sleep(INTERVAL + random.randint(-5, 5))
+        started = time.perf_counter()
+        try:
+            await run_cycle()
+        except Exception as exc:
+            logger.error(f"Simulation cycle failed: {exc}")
+        # Keep the cadence: an overrunning cycle starts the next one immediately
+        # rather than overlapping it.
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(max(0.0, INTERVAL + random.randint(-5, 5) - elapsed))
 
 
 @app.on_event("startup")
@@ -78,6 +155,11 @@ async def trigger(background_tasks: BackgroundTasks):
     return {"status": "queued"}
 
 
+@app.get("/stats")
+async def cycle_stats():
+    return {**stats, "running": cycle_lock.locked()}
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
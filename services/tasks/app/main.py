@@ -1,19 +1,31 @@
+import base64
+import json
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Query, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, BaseSettings, Field
 
+from app.core.metrics import MongoCommandMetrics, instrument
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
     mongo_db: str = "sentinelcare"
+    default_page_size: int = 100
+    max_page_size: int = 1000
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("tasks")]
+)
 db = client[settings.mongo_db]
 tasks_col = db["tasks"]
 
@@ -48,11 +60,13 @@ class TaskUpdate(BaseModel):
 
 
 app = FastAPI(title="Tasks Service", version="0.1.0")
+instrument(app, "tasks")
 
 
 @app.on_event("startup")
 async def init_db():
     await tasks_col.create_index("id", unique=True)
+    await tasks_col.create_index([("created_at", -1), ("id", -1)])
     if await tasks_col.estimated_document_count() == 0:
         seed = [
             Task(
@@ -83,18 +97,66 @@ def _doc_to_task(doc: dict) -> Task:
     return Task(**doc)
 
 
+def _encode_cursor(created_at: datetime, task_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), task_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(task_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _projection(fields: Optional[str]) -> Optional[dict]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(Task.__fields__)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    # Sort keys are always projected so the next cursor can be built.
+    return {f: 1 for f in requested | {"created_at", "id"}}
+
+
 @app.get("/tasks", response_model=List[Task])
 async def list_tasks(
+    response: Response,
     patient_id: Optional[str] = Query(default=None),
     status_filter: Optional[str] = Query(default=None),
-) -> List[Task]:
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
     query: dict = {}
     if patient_id:
         query["patient_id"] = patient_id
     if status_filter:
         query["status"] = status_filter
-    cursor = tasks_col.find(query).sort("created_at", -1)
-    return [_doc_to_task(doc) async for doc in cursor]
+    if cursor:
+        created_at, task_id = _decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": task_id}},
+        ]
+    projection = _projection(fields)
+    docs = (
+        await tasks_col.find(query, projection)
+        .sort([("created_at", -1), ("id", -1)])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    headers = {}
+    if len(docs) == limit:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+    if projection is not None:
+        for doc in docs:
+            doc.pop("_id", None)
+        return JSONResponse(jsonable_encoder(docs), headers=headers)
+    response.headers.update(headers)
+    return [_doc_to_task(doc) for doc in docs]
 
 
 @app.post("/tasks", response_model=Task, status_code=status.HTTP_201_CREATED)
@@ -1,21 +1,54 @@
+import asyncio
+import base64
+import json
 import random
-from datetime import datetime, timezone
-from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Query, status
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel, BaseSettings, Field
+from pydantic import BaseModel, BaseSettings, Field, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.core.metrics import MongoCommandMetrics, instrument
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DUPLICATE_KEY = 11000
+# Batch ids each bucket keeps so a retried bucket push is not applied twice.
+RECENT_BATCHES = 16
 
 
 class Settings(BaseSettings):
     mongo_url: str = "mongodb://mongo:27017"
     mongo_db: str = "sentinelcare"
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    stream_batch_size: int = 500
+    bulk_max_rows: int = 10000
+    write_behind_enabled: bool = True
+    write_behind_max_queue: int = 10000
+    write_behind_batch_size: int = 500
+    write_behind_flush_ms: int = 50
+    write_behind_enqueue_timeout_ms: int = 250
+    write_behind_retries: int = 3
+    storage_mode: Literal["document", "bucket"] = "document"
+    bucket_seconds: int = 3600
 
 
 settings = Settings()
-client = AsyncIOMotorClient(settings.mongo_url)
+client = AsyncIOMotorClient(
+    settings.mongo_url, event_listeners=[MongoCommandMetrics("vitals")]
+)
 db = client[settings.mongo_db]
 vitals_col = db["vitals"]
+# Bucket mode: one document per patient per `bucket_seconds` with a column per vital.
+buckets_col = db["vitals_buckets"]
 
 
 class VitalsPayload(BaseModel):
@@ -31,11 +64,19 @@ class VitalsPayload(BaseModel):
 
 
 app = FastAPI(title="Vitals Service", version="0.1.0")
+instrument(app, "vitals")
+
+
+# Reading fields stored as bucket columns; patient_id lives once per bucket.
+BUCKET_COLUMNS = [f for f in VitalsPayload.__fields__ if f != "patient_id"]
 
 
 @app.on_event("startup")
 async def init_db():
-    await vitals_col.create_index([("patient_id", 1), ("recorded_at", -1)])
+    if settings.storage_mode == "bucket":
+        await buckets_col.create_index([("patient_id", 1), ("start", -1)])
+    else:
+        await vitals_col.create_index([("patient_id", 1), ("recorded_at", -1), ("_id", -1)])
 
 
 def _base_vitals_for_risk(risk: str) -> Dict[str, float]:
@@ -73,14 +114,297 @@ def _doc_to_vitals(doc: dict) -> VitalsPayload:
     return VitalsPayload(**doc)
 
 
+def _encode_cursor(recorded_at: datetime, doc_id: ObjectId) -> str:
+    raw = json.dumps([recorded_at.isoformat(), str(doc_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        recorded_at, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(recorded_at), ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _projection(fields: Optional[str]) -> Optional[dict]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(VitalsPayload.__fields__)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    # _id is projected by default and is the cursor tie-breaker.
+    return {f: 1 for f in requested | {"recorded_at"}}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _stream_docs(cursor, array: bool) -> AsyncIterator[bytes]:
+    """Serialise a Motor cursor batch by batch instead of materialising it."""
+    if array:
+        yield b"["
+    chunk: List[str] = []
+    first = True
+    async for doc in cursor:
+        doc.pop("_id", None)
+        line = json.dumps(doc, default=_json_default)
+        if array:
+            chunk.append(line if first else "," + line)
+        else:
+            chunk.append(line + "\n")
+        first = False
+        if len(chunk) >= settings.stream_batch_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+    if array:
+        yield b"]"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive UTC, matching what Mongo hands back for stored datetimes."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _bucket_start(recorded_at: datetime) -> datetime:
+    recorded_at = _as_utc(recorded_at)
+    seconds = int((recorded_at - datetime(1970, 1, 1)).total_seconds())
+    return datetime(1970, 1, 1) + timedelta(seconds=seconds - seconds % settings.bucket_seconds)
+
+
+def _decode_bucket_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        recorded_at, position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return _as_utc(datetime.fromisoformat(recorded_at)), int(position)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+async def _push_to_buckets(
+    docs: List[dict], batch_id: Optional[ObjectId] = None
+) -> List[tuple[int, str]]:
+    """
+    Append readings to their buckets with one upsert per bucket.
+
+    Each upsert pushes the rows of a bucket onto every column in a single
+    update, so the column arrays always stay aligned. Returns (position,
+    message) for rows whose bucket update Mongo rejected.
+
+    Each update also records `batch_id` in the bucket's short `batches`
+    list and only matches a bucket that does not hold it yet, so retrying a
+    batch (same `batch_id`) after a partly applied attempt cannot append its
+    readings twice. That costs one 12-byte id per batch in the last
+    RECENT_BATCHES, not one per reading, and the guard scans only that list.
+    """
+    batch_id = batch_id or ObjectId()
+    groups: Dict[tuple[str, datetime], List[int]] = {}
+    for position, doc in enumerate(docs):
+        key = (doc["patient_id"], _bucket_start(doc["recorded_at"]))
+        groups.setdefault(key, []).append(position)
+    ops = []
+    for (patient_id, start), positions in groups.items():
+        times = [_as_utc(docs[i]["recorded_at"]) for i in positions]
+        ops.append(
+            UpdateOne(
+                {"_id": f"{patient_id}:{start.isoformat()}", "batches": {"$ne": batch_id}},
+                {
+                    "$setOnInsert": {"patient_id": patient_id, "start": start},
+                    "$inc": {"count": len(positions)},
+                    "$min": {"first": min(times)},
+                    "$max": {"last": max(times)},
+                    "$push": {
+                        column: {"$each": [docs[i][column] for i in positions]}
+                        for column in BUCKET_COLUMNS
+                    }
+                    | {"batches": {"$each": [batch_id], "$slice": -RECENT_BATCHES}},
+                },
+                upsert=True,
+            )
+        )
+    rows = list(groups.values())
+    failed: Dict[int, str] = {}
+    pending = list(range(len(ops)))
+    for attempt in range(2):
+        try:
+            await buckets_col.bulk_write([ops[i] for i in pending], ordered=False)
+            break
+        except BulkWriteError as exc:
+            errors = {pending[err["index"]]: err for err in exc.details.get("writeErrors", [])}
+        # A duplicate key means the batch guard filtered out an existing bucket.
+        # On the first attempt another writer may just have created it, so send
+        # the same op again: it matches that bucket unless it already holds this
+        # batch. A second duplicate key means the readings are already stored.
+        pending = []
+        for op, err in errors.items():
+            if err.get("code") != DUPLICATE_KEY:
+                failed[op] = err.get("errmsg", "write failed")
+            elif attempt == 0:
+                pending.append(op)
+        if not pending:
+            break
+    return [(position, message) for op, message in failed.items() for position in rows[op]]
+
+
+async def _bucket_readings(
+    patient_id: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    before: Optional[tuple[datetime, int]],
+    columns: List[str],
+) -> AsyncIterator[dict]:
+    """
+    Unpack a patient's buckets into readings, newest first.
+
+    Readings are ordered by (recorded_at, position in bucket); `position` is
+    exposed as `_id` so the pagination cursor and stream encoder can treat
+    them like per-reading documents. Buckets cover disjoint time ranges, so
+    sorting within each bucket is enough for a global order.
+    """
+    since = _as_utc(since) if since else None
+    until = _as_utc(until) if until else None
+    query: dict = {"patient_id": patient_id}
+    start: dict = {}
+    if since:
+        start["$gte"] = _bucket_start(since)
+    if until:
+        start["$lt"] = until
+    if before:
+        start["$lte"] = before[0]
+    if start:
+        query["start"] = start
+    projection = {column: 1 for column in columns if column != "patient_id"}
+    # Buckets are large; fetch a couple at a time rather than Mongo's default 101.
+    find = buckets_col.find(query, projection).sort("start", -1).batch_size(2)
+    async for bucket in find:
+        times = bucket["recorded_at"]
+        order = sorted(range(len(times)), key=lambda i: (times[i], i), reverse=True)
+        for i in order:
+            recorded_at = times[i]
+            if (since and recorded_at < since) or (until and recorded_at >= until):
+                continue
+            if before and (recorded_at, i) >= before:
+                continue
+            reading: dict = {"_id": i}
+            for column in columns:
+                reading[column] = patient_id if column == "patient_id" else bucket[column][i]
+            yield reading
+
+
+async def _take(docs: AsyncIterator[dict], limit: int) -> AsyncIterator[dict]:
+    if limit <= 0:
+        return
+    count = 0
+    async for doc in docs:
+        yield doc
+        count += 1
+        if count >= limit:
+            break
+
+
+async def _list_bucket_vitals(
+    patient_id: str,
+    response: Response,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    format: str,
+):
+    """`list_vitals` over bucketed storage, with the same paging and formats."""
+    projection = _projection(fields)
+    columns = list(projection or VitalsPayload.__fields__)
+    before = _decode_bucket_cursor(cursor) if cursor else None
+    readings = _bucket_readings(patient_id, since, until, before, columns)
+
+    if format != "json":
+        return StreamingResponse(
+            _stream_docs(_take(readings, limit) if limit else readings, format == "json-stream"),
+            media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+        )
+
+    page_size = min(limit or settings.default_page_size, settings.max_page_size)
+    docs = [doc async for doc in _take(readings, page_size)]
+    headers = {}
+    if len(docs) == page_size:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(docs[-1]["recorded_at"], docs[-1]["_id"])
+    for doc in docs:
+        doc.pop("_id")
+    if projection is not None:
+        return JSONResponse(jsonable_encoder(docs), headers=headers)
+    response.headers.update(headers)
+    return [VitalsPayload(**doc) for doc in docs]
+
+
 @app.get("/vitals/{patient_id}", response_model=List[VitalsPayload])
-async def list_vitals(patient_id: str) -> List[VitalsPayload]:
-    cursor = vitals_col.find({"patient_id": patient_id}).sort("recorded_at", -1)
-    return [_doc_to_vitals(doc) async for doc in cursor]
+async def list_vitals(
+    patient_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Literal["json", "ndjson", "json-stream"] = "json",
+):
+    if settings.storage_mode == "bucket":
+        return await _list_bucket_vitals(
+            patient_id, response, limit, cursor, fields, since, until, format
+        )
+    query: dict = {"patient_id": patient_id}
+    if since or until:
+        query["recorded_at"] = {}
+        if since:
+            query["recorded_at"]["$gte"] = since
+        if until:
+            query["recorded_at"]["$lt"] = until
+    if cursor:
+        recorded_at, doc_id = _decode_cursor(cursor)
+        query["$or"] = [
+            {"recorded_at": {"$lt": recorded_at}},
+            {"recorded_at": recorded_at, "_id": {"$lt": doc_id}},
+        ]
+    projection = _projection(fields)
+    find = vitals_col.find(query, projection).sort([("recorded_at", -1), ("_id", -1)])
+
+    if format != "json":
+        # Streams are exports: unbounded unless the caller asks for a limit.
+        if limit:
+            find = find.limit(limit)
+        return StreamingResponse(
+            _stream_docs(find.batch_size(settings.stream_batch_size), format == "json-stream"),
+            media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+        )
+
+    page_size = min(limit or settings.default_page_size, settings.max_page_size)
+    docs = await find.limit(page_size).to_list(length=page_size)
+    headers = {}
+    if len(docs) == page_size:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(docs[-1]["recorded_at"], docs[-1]["_id"])
+    if projection is not None:
+        for doc in docs:
+            doc.pop("_id", None)
+        return JSONResponse(jsonable_encoder(docs), headers=headers)
+    response.headers.update(headers)
+    return [_doc_to_vitals(doc) for doc in docs]
 
 
 @app.get("/vitals/{patient_id}/latest", response_model=VitalsPayload)
 async def latest_vitals(patient_id: str) -> VitalsPayload:
+    if settings.storage_mode == "bucket":
+        readings = _bucket_readings(patient_id, None, None, None, list(VitalsPayload.__fields__))
+        async for doc in readings:
+            doc.pop("_id")
+            return VitalsPayload(**doc)
+        raise HTTPException(status_code=404, detail="No vitals for patient")
     doc = await vitals_col.find_one({"patient_id": patient_id}, sort=[("recorded_at", -1)])
     if not doc:
         raise HTTPException(status_code=404, detail="No vitals for patient")
@@ -88,11 +412,285 @@ async def latest_vitals(patient_id: str) -> VitalsPayload:
 
 
 @app.post("/vitals", response_model=VitalsPayload, status_code=status.HTTP_201_CREATED)
-async def ingest_vitals(payload: VitalsPayload) -> VitalsPayload:
-    await vitals_col.insert_one(payload.dict())
+async def ingest_vitals(payload: VitalsPayload, response: Response) -> VitalsPayload:
+    if settings.write_behind_enabled:
+        if not await write_buffer.put(payload.dict()):
+            raise HTTPException(
+                status_code=503,
+                detail="Vitals write buffer is full; retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return payload
+    await _store_one(payload.dict())
     return payload
 
 
+@app.get("/vitals-buffer/stats")
+async def write_buffer_stats():
+    return {"enabled": settings.write_behind_enabled, **write_buffer.stats()}
+
+
+@app.get("/vitals-storage/stats")
+async def storage_stats():
+    """Document and index footprint of the active storage mode's collection."""
+    col = buckets_col if settings.storage_mode == "bucket" else vitals_col
+    stats = await db.command("collStats", col.name)
+    return {
+        "mode": settings.storage_mode,
+        "collection": col.name,
+        "documents": stats.get("count", 0),
+        "data_bytes": stats.get("size", 0),
+        "storage_bytes": stats.get("storageSize", 0),
+        "index_bytes": stats.get("totalIndexSize", 0),
+    }
+
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[dict]
+
+
+class BulkIngestResult(BaseModel):
+    received: int
+    inserted: int
+    rejected: int
+    errors: List[BulkRowError] = []
+
+
+def _parse_bulk_body(body: bytes, content_type: str) -> tuple[List[Any], List[BulkRowError]]:
+    """
+    Split a JSON array or NDJSON body into rows. An unreadable NDJSON line
+    keeps its row index and comes back as a row error carrying its line
+    number, so one torn line does not cost the rest of the upload.
+    """
+    if "ndjson" in content_type:
+        rows: List[Any] = []
+        errors: List[BulkRowError] = []
+        for number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as exc:
+                error = {
+                    "loc": ["line", number],
+                    "msg": f"Malformed JSON: {exc}",
+                    "type": "value_error.json",
+                }
+                errors.append(BulkRowError(index=len(rows), errors=[error]))
+                rows.append(None)
+        return rows, errors
+    try:
+        rows = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed body: {exc}") from exc
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of vitals")
+    return rows, []
+
+
+async def _insert_vitals(
+    docs: List[dict], batch_id: Optional[ObjectId] = None, replay: bool = False
+) -> List[tuple[int, str]]:
+    """
+    Unordered insert_many; returns (position, message) for rows Mongo rejected.
+
+    insert_many stamps each doc with its `_id`, so resending the same docs
+    after a failed attempt (`replay`) hits duplicate keys for rows that
+    attempt already stored; those count as stored, not rejected. Bucket
+    pushes dedupe retries by `batch_id` instead.
+    """
+    if not docs:
+        return []
+    if settings.storage_mode == "bucket":
+        return await _push_to_buckets(docs, batch_id)
+    try:
+        await vitals_col.insert_many(docs, ordered=False)
+    except BulkWriteError as exc:
+        return [
+            (err["index"], err.get("errmsg", "write failed"))
+            for err in exc.details.get("writeErrors", [])
+            if not (replay and err.get("code") == DUPLICATE_KEY)
+        ]
+    return []
+
+
+async def _store_one(doc: dict) -> None:
+    if settings.storage_mode == "bucket":
+        failures = await _push_to_buckets([doc])
+        if failures:
+            raise HTTPException(status_code=500, detail=failures[0][1])
+    else:
+        await vitals_col.insert_one(doc)
+
+
+class VitalsWriteBuffer:
+    """
+    Write-behind buffer for single readings.
+
+    Readings are acknowledged once queued; a background task coalesces them
+    into unordered insert_many batches of up to `batch_size` rows, flushing
+    at the latest `flush_ms` after the first buffered row. A full queue
+    pushes back on callers instead of growing without bound.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_ms: int, enqueue_timeout_ms: int):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+        self.failed_rows = 0
+        self.rejected_rows = 0
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything still queued, then stop the flusher."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def put(self, doc: dict) -> bool:
+        try:
+            self.queue.put_nowait(doc)
+            return True
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self.queue.put(doc), self.enqueue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.rejected_rows += 1
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "flushed_rows": self.flushed_rows,
+            "flushed_batches": self.flushed_batches,
+            "failed_rows": self.failed_rows,
+            "rejected_rows": self.rejected_rows,
+        }
+
+    async def _run(self) -> None:
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = await self._collect()
+            if not batch:
+                continue
+            try:
+                await self._flush(batch)
+            except Exception:
+                # e.g. bson's InvalidDocument: drop the batch, keep draining the queue.
+                logger.exception(f"Dropping {len(batch)} buffered vitals after an unexpected error")
+                self.failed_rows += len(batch)
+
+    async def _collect(self) -> List[dict]:
+        loop = asyncio.get_running_loop()
+        batch: List[dict] = []
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._stopping.is_set():
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                break
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                if batch:
+                    break
+                # Idle: keep polling so a shutdown request is noticed promptly.
+                deadline = loop.time() + self.flush_interval
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                continue
+            if len(batch) == 1:
+                deadline = loop.time() + self.flush_interval
+        return batch
+
+    async def _flush(self, batch: List[dict]) -> None:
+        batch_id = ObjectId()
+        for attempt in range(settings.write_behind_retries + 1):
+            try:
+                failures = await _insert_vitals(batch, batch_id, replay=attempt > 0)
+                break
+            except PyMongoError as exc:
+                logger.warning(f"Vitals flush of {len(batch)} rows failed (attempt {attempt + 1}): {exc}")
+                await asyncio.sleep(min(2**attempt * 0.1, 2.0))
+        else:
+            logger.error(f"Dropping {len(batch)} buffered vitals after repeated flush failures")
+            self.failed_rows += len(batch)
+            return
+        for _, message in failures:
+            logger.warning(f"Buffered vitals row rejected: {message}")
+        self.failed_rows += len(failures)
+        self.flushed_rows += len(batch) - len(failures)
+        self.flushed_batches += 1
+
+
+write_buffer = VitalsWriteBuffer(
+    max_queue=settings.write_behind_max_queue,
+    batch_size=settings.write_behind_batch_size,
+    flush_ms=settings.write_behind_flush_ms,
+    enqueue_timeout_ms=settings.write_behind_enqueue_timeout_ms,
+)
+
+
+@app.on_event("startup")
+async def start_write_buffer():
+    if settings.write_behind_enabled:
+        write_buffer.start()
+
+
+@app.on_event("shutdown")
+async def stop_write_buffer():
+    await write_buffer.stop()
+
+
+@app.post("/vitals/bulk", response_model=BulkIngestResult)
+async def ingest_vitals_bulk(request: Request) -> BulkIngestResult:
+    """Accept a JSON array or NDJSON body of readings buffered by a bedside gateway."""
+    rows, errors = _parse_bulk_body(
+        await request.body(), request.headers.get("content-type", "")
+    )
+    if len(rows) > settings.bulk_max_rows:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.bulk_max_rows} rows per request"
+        )
+
+    unreadable = {err.index for err in errors}
+    docs: List[dict] = []
+    positions: List[int] = []
+    for index, row in enumerate(rows):
+        if index in unreadable:
+            continue
+        try:
+            docs.append(VitalsPayload.parse_obj(row).dict())
+            positions.append(index)
+        except ValidationError as exc:
+            errors.append(BulkRowError(index=index, errors=exc.errors()))
+
+    for position, message in await _insert_vitals(docs):
+        errors.append(BulkRowError(index=positions[position], errors=[{"msg": message}]))
+    errors.sort(key=lambda err: err.index)
+
+    return BulkIngestResult(
+        received=len(rows),
+        inserted=len(rows) - len(errors),
+        rejected=len(errors),
+        errors=errors,
+    )
+
+
 @app.post("/vitals/generate", response_model=VitalsPayload)
 async def generate_vitals(
     patient_id: str = Query(...),
@@ -101,7 +699,7 @@ async def generate_vitals(
 ) -> VitalsPayload:
     base = _base_vitals_for_risk(risk)
     payload = VitalsPayload(patient_id=patient_id, device_id=device_id, **base)
-    await vitals_col.insert_one(payload.dict())
+    await _store_one(payload.dict())
     return payload
 
 